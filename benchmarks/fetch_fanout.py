@@ -0,0 +1,82 @@
+"""
+Benchmark: sequential vs. concurrent fetching of the Fetcher node's sources.
+
+Every source is mocked with a fixed sleep, so no network access or API keys
+are needed. Run from the repository root:
+
+    python -m benchmarks.fetch_fanout
+"""
+
+import argparse
+import time
+
+from trader_desk.core.types import NewsItem
+from trader_desk.utils.data_fetcher import FinancialDataFetcher
+
+# Simulated upstream latency per source, in seconds
+SOURCE_LATENCY = {
+    "fundamentals": 0.30,
+    "price": 0.10,
+    "price_targets": 0.20,
+    "news": 0.45,
+}
+
+
+class MockedFetcher(FinancialDataFetcher):
+    """Fetcher whose upstream sources sleep instead of hitting the network."""
+
+    def get_info(self, ticker):
+        time.sleep(SOURCE_LATENCY["fundamentals"])
+        return {"currentPrice": 100.0, "marketCap": 1_000_000_000, "forwardPE": 20.0}
+
+    def get_price(self, ticker):
+        time.sleep(SOURCE_LATENCY["price"])
+        return 100.5
+
+    def get_price_targets(self, ticker):
+        time.sleep(SOURCE_LATENCY["price_targets"])
+        return {"mean": 120.0}
+
+    def get_financial_news(self, ticker, results=3):
+        time.sleep(SOURCE_LATENCY["news"])
+        return (NewsItem("Mocked headline", "Nothing happened."),)
+
+
+def fetch_sequential(fetcher, ticker):
+    """Baseline: fetch every source one after another, as the fetcher used to."""
+    results = {name: source(ticker) for name, source in fetcher._sources().items()}
+    return fetcher._build_financial_data(ticker, results, {})
+
+
+def bench(label, fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<12} best {best * 1000:8.1f} ms   mean {sum(timings) / len(timings) * 1000:8.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    fetcher = MockedFetcher()
+    state = {"ticker": "MOCK"}
+
+    print(f"Source latencies (s): {SOURCE_LATENCY}")
+    print(f"Expected: sequential ~{sum(SOURCE_LATENCY.values()):.2f}s, "
+          f"concurrent ~{max(SOURCE_LATENCY.values()):.2f}s\n")
+
+    sequential = bench("sequential", lambda: fetch_sequential(fetcher, "MOCK"), args.repeats)
+    concurrent = bench("concurrent", lambda: fetcher.fetch_financial_data(state), args.repeats)
+    print(f"\nSpeedup: {sequential / concurrent:.2f}x")
+
+    fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Offline replay harness: recorded upstream payloads and a deterministic stub chat model.
+
+Nothing in here touches the network, so benchmarks built on it run on any
+machine without API keys.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from trader_desk.core.config import (
+    AppConfig, CacheConfig, LLMConfig, MetricsConfig, SchedulerConfig, WorkflowConfig
+)
+from trader_desk.core.types import NewsItem
+from trader_desk.core.workflow import TradingWorkflow
+from trader_desk.nodes.prompting import estimate_tokens
+from trader_desk.utils.data_fetcher import FinancialDataFetcher
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 52-week change of the sector ETFs served as market context
+REPLAY_SECTOR_CHANGES = {
+    "XLC": 0.281, "XLY": 0.192, "XLP": 0.064, "XLE": -0.031, "XLF": 0.237, "XLV": 0.048,
+    "XLI": 0.172, "XLB": 0.055, "XLRE": 0.039, "XLK": 0.312, "XLU": 0.143,
+}
+
+
+def load_fixtures(directory: str = FIXTURES_DIR) -> Dict[str, Dict[str, Any]]:
+    """Load every recorded ``<TICKER>.json`` payload in a directory."""
+    fixtures = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name), encoding="utf-8") as fh:
+                payload = json.load(fh)
+            fixtures[payload["ticker"]] = payload
+    return fixtures
+
+
+class ReplayTavilyClient:
+    """Stand-in for TavilyClient that returns recorded search results."""
+
+    def __init__(self, fixtures: Dict[str, Dict[str, Any]], latency: float):
+        self.fixtures = fixtures
+        self.latency = latency
+
+    def search(self, query: str, max_results: int = 3) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        ticker = query.split(" for ")[-1].split(" ")[0]
+        results = self.fixtures[base_ticker(ticker)]["news"]["results"]
+        return {"results": results[:max_results]}
+
+
+def base_ticker(ticker: str) -> str:
+    """Map synthetic batch symbols such as ``AAPL.17`` back to their fixture."""
+    return ticker.split(".")[0]
+
+
+class ReplayFetcher(FinancialDataFetcher):
+    """
+    Fetcher that serves recorded yfinance/Tavily payloads with simulated latency.
+    """
+
+    def __init__(self, fixtures: Dict[str, Dict[str, Any]], latency: float = 0.02, **kwargs: Any):
+        kwargs.setdefault("news_client", ReplayTavilyClient(fixtures, latency))
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        self.latency = latency
+
+    def _payload(self, ticker: str, kind: str) -> Any:
+        time.sleep(self.latency)
+        return self.fixtures[base_ticker(ticker)][kind]
+
+    def get_info(self, ticker: str) -> Dict[str, Any]:
+        return self._payload(ticker, "fundamentals")
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        return self._payload(ticker, "price")
+
+    def get_price_targets(self, ticker: str) -> Dict[str, Any]:
+        return self._payload(ticker, "price_targets")
+
+    def get_market_performance(self) -> Dict[str, float]:
+        time.sleep(self.latency)
+        fixture = next(iter(self.fixtures.values()))
+        return {self.MARKET_INDEX: fixture["fundamentals"]["SandP52WeekChange"], **REPLAY_SECTOR_CHANGES}
+
+    def get_market_news(self, results: int = 5) -> Tuple[NewsItem, ...]:
+        time.sleep(self.latency)
+        headlines = [fixture["news"]["results"][0] for fixture in self.fixtures.values()]
+        return tuple(NewsItem(title=h["title"], snippet=h["content"], url=h.get("url", "")) for h in headlines[:results])
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic chat model with configurable latency.
+
+    As the analyst it writes a numbered draft that quotes the data block it
+    was given, so drafts pass the critic's precheck; as the critic it asks
+    for ``refine_rounds`` revisions before approving. Token usage is estimated from the prompt and reply so token
+    metrics stay meaningful.
+    """
+
+    role: str = "analyst"
+    latency: float = 0.05
+    refine_rounds: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        revisions = [int(n) for n in re.findall(r"Revision (\d+)", prompt)]
+
+        if self.role == "critic":
+            revision = max(revisions, default=1)
+            if revision > self.refine_rounds:
+                return "APPROVE"
+            return "FEEDBACK: 1. Mention the P/E ratio explicitly 2. Compare the 52-week change with the S&P 500"
+
+        revision = max(revisions, default=0) + 1
+        data_block = prompt[prompt.find("Stock:"):prompt.find("Latest news:")]
+        data_lines = [line.strip() for line in data_block.splitlines() if ":" in line]
+        return f"Revision {revision}\n" + "\n".join(f"- {line}" for line in data_lines)
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        content = self._reply(messages)
+        prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        completion_tokens = estimate_tokens(content)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+
+def offline_config(
+    max_iterations: int = 3,
+    max_concurrency: int = 8,
+    metrics_sinks: Optional[List[str]] = None,
+    process_workers: int = 0
+) -> AppConfig:
+    """
+    Configuration for offline runs.
+
+    Caches are disabled so every run exercises the full pipeline, and
+    provider rate limits are lifted so results reflect the workflow itself.
+    """
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+    return AppConfig(
+        llm=LLMConfig(bypass_response_cache=True),
+        workflow=WorkflowConfig(
+            max_iterations=max_iterations,
+            enable_verbose_logging=False,
+            max_concurrency=max_concurrency,
+            process_workers=process_workers
+        ),
+        openai_api_key="offline-benchmark",
+        cache=CacheConfig(backend="none"),
+        metrics=MetricsConfig(sinks=metrics_sinks if metrics_sinks is not None else ["memory"]),
+        scheduler=SchedulerConfig(limits={})
+    )
+
+
+@dataclass
+class OfflineWorkflowFactory:
+    """
+    Builds a TradingWorkflow from a configuration and wires it to replayed
+    data and stub chat models. Picklable, so it can build the workflows of
+    batch worker processes.
+    """
+
+    fixtures: Dict[str, Dict[str, Any]]
+    fetch_latency: float = 0.02
+    llm_latency: float = 0.05
+    refine_rounds: int = 0
+
+    def __call__(self, config: AppConfig) -> TradingWorkflow:
+        workflow = TradingWorkflow(config)
+        workflow.data_fetcher = ReplayFetcher(
+            self.fixtures,
+            latency=self.fetch_latency,
+            max_workers=config.workflow.io_workers,
+            metrics=workflow.metrics,
+            scheduler=workflow.scheduler
+        )
+        workflow.analyst.llm = StubChatModel(role="analyst", latency=self.llm_latency)
+        workflow.critic.llm = StubChatModel(
+            role="critic", latency=self.llm_latency, refine_rounds=self.refine_rounds
+        )
+        return workflow
+
+
+def build_offline_workflow(
+    fixtures: Dict[str, Dict[str, Any]],
+    fetch_latency: float = 0.02,
+    llm_latency: float = 0.05,
+    refine_rounds: int = 0,
+    max_iterations: int = 3,
+    max_concurrency: int = 8,
+    metrics_sinks: Optional[List[str]] = None
+) -> TradingWorkflow:
+    """Build a TradingWorkflow wired to replayed data and stub chat models."""
+    factory = OfflineWorkflowFactory(fixtures, fetch_latency, llm_latency, refine_rounds)
+    return factory(offline_config(max_iterations, max_concurrency, metrics_sinks))
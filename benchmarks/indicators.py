@@ -0,0 +1,58 @@
+"""
+Benchmark: technical-indicator summaries over a synthetic daily OHLC panel.
+
+Prices are simulated random walks, so no network access is needed. Run
+from the repository root:
+
+    python -m benchmarks.indicators --tickers 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from trader_desk.utils.indicators import LOOKBACK, summarize
+
+
+def synthetic_panel(n_tickers: int, n_days: int = LOOKBACK, seed: int = 7):
+    """Random-walk high/low/close panels, with some recently listed tickers."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, size=(n_days, n_tickers)), axis=0))
+    spread = 1 + np.abs(rng.normal(0, 0.01, size=(n_days, n_tickers)))
+    high, low = close * spread, close / spread
+
+    listed_late = rng.random(n_tickers) < 0.05
+    for values in (high, low, close):
+        values[: n_days // 2, listed_late] = np.nan
+
+    index = pd.bdate_range(end="2024-12-31", periods=n_days)
+    columns = [f"T{i:05d}" for i in range(n_tickers)]
+    return tuple(pd.DataFrame(values, index=index, columns=columns) for values in (high, low, close))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=LOOKBACK)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    high, low, close = synthetic_panel(args.tickers, args.days)
+
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        summary = summarize(high, low, close)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"Panel: {args.days} days x {args.tickers} tickers, {summary.shape[1]} indicators")
+    print(f"Summary time: best {best * 1000:.1f} ms, mean {np.mean(timings) * 1000:.1f} ms "
+          f"({best / args.tickers * 1e6:.2f} us per ticker)")
+    print(f"Oversold (RSI < 30): {int((summary['rsi_14'] < 30).sum())} tickers")
+
+
+if __name__ == "__main__":
+    main()
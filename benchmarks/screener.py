@@ -0,0 +1,73 @@
+"""
+Benchmark: vectorized screening metrics over a synthetic price panel.
+
+Prices are simulated geometric random walks, so no network access is
+needed. Run from the repository root:
+
+    python -m benchmarks.screener --tickers 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from trader_desk.utils.screener import BENCHMARK, ScreenCriteria, compute_metrics, screen
+
+
+def synthetic_prices(n_tickers: int, n_days: int = 252, seed: int = 7) -> pd.DataFrame:
+    """Random-walk closing prices for n_tickers plus the benchmark, with some gaps."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, size=(n_days, 1))
+    betas = rng.uniform(0.5, 1.8, size=(1, n_tickers))
+    idio = rng.normal(0.0, 0.015, size=(n_days, n_tickers))
+    returns = np.hstack([betas * market + idio, market])
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+
+    # Recently listed tickers: no history for the first part of the year
+    listed_late = rng.random(n_tickers) < 0.05
+    prices[: n_days // 2, :n_tickers][:, listed_late] = np.nan
+
+    columns = [f"T{i:05d}" for i in range(n_tickers)] + [BENCHMARK]
+    index = pd.bdate_range(end="2024-12-31", periods=n_days)
+    return pd.DataFrame(prices, index=index, columns=columns)
+
+
+def synthetic_fundamentals(columns, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tickers = [c for c in columns if c != BENCHMARK]
+    return pd.DataFrame(
+        {
+            "pe_ratio": rng.uniform(5, 60, size=len(tickers)),
+            "debt_to_equity": rng.uniform(0, 300, size=len(tickers)),
+        },
+        index=tickers
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    prices = synthetic_prices(args.tickers)
+    fundamentals = synthetic_fundamentals(prices.columns)
+    criteria = ScreenCriteria(min_relative_performance=0.0, max_beta=1.5, max_pe_ratio=40, top_n=25)
+
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        top = screen(compute_metrics(prices, fundamentals=fundamentals), criteria)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"Panel: {prices.shape[0]} days x {args.tickers} tickers")
+    print(f"Screen time: best {best * 1000:.1f} ms, mean {np.mean(timings) * 1000:.1f} ms "
+          f"({best / args.tickers * 1e6:.2f} us per ticker)")
+    print(f"Top candidates: {', '.join(top.index[:10])}")
+
+
+if __name__ == "__main__":
+    main()
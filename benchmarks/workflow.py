@@ -0,0 +1,201 @@
+"""
+Benchmark: end-to-end TradingWorkflow latency and throughput, fully offline.
+
+Upstream data is replayed from ``benchmarks/fixtures`` and both LLM nodes
+use a deterministic stub chat model, so no network access or API keys are
+needed. Run from the repository root:
+
+    python -m benchmarks.workflow --output results.json
+    python -m benchmarks.workflow --baseline results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from trader_desk.utils.metrics import InMemorySink
+
+from trader_desk.core.parallel import ProcessBatchRunner
+from trader_desk.core.workflow import TradingWorkflow
+
+from .harness import OfflineWorkflowFactory, build_offline_workflow, load_fixtures, offline_config
+
+SCENARIOS = ("single", "batch", "refinement")
+# Opt-in scenarios, not part of the default run
+EXTRA_SCENARIOS = ("processes",)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_stats(timings: List[float]) -> Dict[str, float]:
+    """Summary statistics of per-run latencies, in milliseconds."""
+    return {
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p90_ms": percentile(timings, 90) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+    }
+
+
+def node_stats(sink: InMemorySink) -> Dict[str, float]:
+    """Mean duration per workflow node, in milliseconds."""
+    durations: Dict[str, List[float]] = {}
+    for event in sink.events:
+        if event.name == "node_duration_seconds":
+            durations.setdefault(event.labels["node"], []).append(event.value)
+    return {node: statistics.fmean(values) * 1000 for node, values in sorted(durations.items())}
+
+
+def run_scenario(name: str, fixtures: Dict[str, Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run one scenario and collect its measurements.
+
+    Args:
+        name: Scenario name, one of SCENARIOS
+        fixtures: Recorded upstream payloads
+        args: Parsed command line arguments
+
+    Returns:
+        Scenario results
+    """
+    refinement = name == "refinement"
+    workflow = build_offline_workflow(
+        fixtures,
+        fetch_latency=args.fetch_latency,
+        llm_latency=args.llm_latency,
+        refine_rounds=2 if refinement else 0,
+        max_iterations=3,
+        max_concurrency=args.concurrency
+    )
+    symbols = sorted(fixtures)
+    tickers = [f"{symbols[i % len(symbols)]}.{i}" for i in range(args.runs)]
+    timings: List[float] = []
+
+    start = time.perf_counter()
+    if name == "processes":
+        # Same batch, sharded across worker processes; their metrics arrive in this workflow's sink
+        workflow.close()
+        config = offline_config(max_concurrency=args.concurrency, process_workers=args.workers)
+        workflow = TradingWorkflow(config)
+        factory = OfflineWorkflowFactory(fixtures, args.fetch_latency, args.llm_latency)
+        start = time.perf_counter()
+        with ProcessBatchRunner.from_config(config, workflow.metrics, factory) as runner:
+            for result in runner.run(tickers):
+                if not result.ok:
+                    raise RuntimeError(f"{result.ticker} failed: {result.error}")
+        elapsed = time.perf_counter() - start
+        timings = workflow.metrics.sink(InMemorySink).values("run_duration_seconds")
+    elif name == "batch":
+        # Per-run latency as observed inside the batch, from the workflow's own metrics
+        for result in workflow.run_batch(tickers, max_concurrency=args.concurrency):
+            if not result.ok:
+                raise RuntimeError(f"{result.ticker} failed: {result.error}")
+        elapsed = time.perf_counter() - start
+        timings = workflow.metrics.sink(InMemorySink).values("run_duration_seconds")
+    else:
+        for ticker in tickers:
+            run_start = time.perf_counter()
+            workflow.run(ticker, verbose=False)
+            timings.append(time.perf_counter() - run_start)
+        elapsed = time.perf_counter() - start
+
+    sink = workflow.metrics.sink(InMemorySink)
+    result = {
+        "runs": len(tickers),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(tickers) / elapsed,
+        **latency_stats(timings),
+        # One prompt-token event per LLM call, so worker processes' calls are counted too
+        "llm_calls": len(sink.values("llm_tokens", kind="prompt")),
+        "mean_refinement_loops": statistics.fmean(sink.values("refinement_loops")),
+        "llm_tokens": sum(sink.values("llm_tokens")),
+        "node_mean_ms": node_stats(sink),
+    }
+    workflow.close()
+    return result
+
+
+def git_commit() -> Optional[str]:
+    """Current commit hash, if the benchmark runs inside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], out: Callable[[str], None] = print) -> None:
+    """Print current/baseline ratios for the headline numbers of each scenario."""
+    out(f"\nvs. baseline {baseline.get('commit') or 'unknown'} (ratio current/baseline)")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        ratios = "  ".join(
+            f"{key} {current[key] / previous[key]:.2f}x"
+            for key in ("p50_ms", "p99_ms", "throughput_per_s")
+            if previous.get(key)
+        )
+        out(f"{name:<11} {ratios}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", choices=SCENARIOS + EXTRA_SCENARIOS, action="append",
+                        help="Scenario to run (repeatable, default: all but processes)")
+    parser.add_argument("--runs", type=int, default=24, help="Workflow runs per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent runs in the batch scenario")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes in the processes scenario")
+    parser.add_argument("--fetch-latency", type=float, default=0.02, help="Simulated seconds per data source")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previously written results file")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "params": {
+            "runs": args.runs,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "fetch_latency": args.fetch_latency,
+            "llm_latency": args.llm_latency,
+        },
+        "scenarios": {},
+    }
+
+    for name in args.scenario or SCENARIOS:
+        stats = run_scenario(name, fixtures, args)
+        results["scenarios"][name] = stats
+        print(
+            f"{name:<11} p50 {stats['p50_ms']:8.1f} ms   p90 {stats['p90_ms']:8.1f} ms   "
+            f"p99 {stats['p99_ms']:8.1f} ms   {stats['throughput_per_s']:7.1f} runs/s   "
+            f"{stats['llm_calls']} LLM calls"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            compare(results, json.load(fh))
+
+
+if __name__ == "__main__":
+    main()
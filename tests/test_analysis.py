@@ -0,0 +1,199 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from trader_desk.core.types import FinancialData
+from trader_desk.nodes.analysis import FinancialAnalyst, ReportCritic
+from trader_desk.utils.cache import SQLiteBackend, TTLCache
+from trader_desk.utils.llm_cache import LLMResponseCache
+
+
+class CountingChatModel(FakeListChatModel):
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "llm_cache.sqlite"), max_entries=10)
+    return LLMResponseCache(TTLCache(backend=backend))
+
+
+def make_analyst(monkeypatch, response_cache):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    analyst = FinancialAnalyst(response_cache=response_cache)
+    analyst.llm = CountingChatModel(responses=["first analysis", "second analysis"])
+    return analyst
+
+
+def test_identical_inputs_are_served_from_cache(monkeypatch, response_cache):
+    analyst = make_analyst(monkeypatch, response_cache)
+    state = {"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0}
+
+    first = analyst.analyze(state)
+    second = analyst.analyze({**state, "iterations": 1})
+
+    assert first["sentiment_analysis"] == second["sentiment_analysis"] == "first analysis"
+    assert analyst.llm.calls == 1
+    assert response_cache.stats.hits == 1
+
+
+def test_changed_inputs_miss_the_cache(monkeypatch, response_cache):
+    analyst = make_analyst(monkeypatch, response_cache)
+
+    analyst.analyze({"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0})
+    update = analyst.analyze({"ticker": "AAPL", "financial_data": "Current Price: $101", "iterations": 0})
+
+    assert update["sentiment_analysis"] == "second analysis"
+    assert analyst.llm.calls == 2
+
+
+def test_refinement_pass_receives_critic_feedback(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    analyst = FinancialAnalyst()
+    state = {
+        "ticker": "AAPL",
+        "financial_data": "Current Price: $100",
+        "sentiment_analysis": "first draft",
+        "critic_feedback": "FEEDBACK: 1. Mention the P/E ratio 2. Compare with the S&P 500",
+        "iterations": 1,
+    }
+
+    prompt = analyst._prompt_for(state)
+    messages = prompt.format_messages(**analyst._chain_inputs(state, 2))
+
+    assert prompt is analyst.refine_prompt
+    assert messages[1].content == "Here is the data for AAPL: Current Price: $100"
+    assert "first draft" in messages[2].content
+    assert "- Mention the P/E ratio\n- Compare with the S&P 500" in messages[2].content
+
+
+def test_chat_client_is_created_lazily_and_shared(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    analyst = FinancialAnalyst(model="gpt-4o-mini")
+    critic = ReportCritic(model="gpt-4o-mini")
+    assert analyst._llm is None and critic._llm is None
+
+    assert analyst.llm is critic.llm
+
+
+def test_critic_precheck_skips_the_llm_for_missing_data(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    critic = ReportCritic()
+    critic.llm = CountingChatModel(responses=["APPROVE"])
+    data = FinancialData(ticker="AAPL", current_price=100.0, pe_ratio=25.0)
+    state = {"ticker": "AAPL", "financial_data": data, "sentiment_analysis": "The price is $100."}
+
+    rejected = critic.review(state)
+    approved = critic.review({**state, "sentiment_analysis": "The price is $100 at a P/E of 25."})
+
+    assert rejected["critic_feedback"] == "FEEDBACK:\n1. Mention the forward P/E ratio (25.00)"
+    assert approved["critic_feedback"] == "APPROVE"
+    assert critic.llm.calls == 1
+
+
+def test_streamed_generation_reaches_listener_and_can_be_cancelled(monkeypatch):
+    from trader_desk.nodes.streaming import GenerationCancelled, TokenStream, streaming_tokens
+
+    analyst = make_analyst(monkeypatch, None)
+    state = {"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0}
+    tokens = []
+
+    with streaming_tokens(TokenStream(on_token=lambda node, text: tokens.append((node, text)))):
+        update = analyst.analyze(state)
+
+    assert update["sentiment_analysis"] == "first analysis"
+    assert {node for node, _ in tokens} == {"Analyst"} and len(tokens) > 1
+    assert "".join(text for _, text in tokens) == "first analysis"
+
+    stream = TokenStream(on_token=lambda node, text: stream.cancel() if text == "d" else None)
+    with streaming_tokens(stream), pytest.raises(GenerationCancelled) as cancelled:
+        analyst.analyze(state)
+    assert cancelled.value.partial == "second"
+
+
+def test_retried_generation_restarts_the_stream(monkeypatch):
+    from trader_desk.nodes.streaming import TokenStream, streaming_tokens
+    from trader_desk.utils.scheduler import RetryPolicy, UpstreamScheduler
+
+    class DroppingChatModel(FakeListChatModel):
+        dropped: bool = False
+
+        def _stream(self, *args, **kwargs):
+            for i, chunk in enumerate(super()._stream(*args, **kwargs)):
+                if i == 3 and not self.dropped:
+                    self.dropped = True
+                    raise ConnectionError("connection reset mid-stream")
+                yield chunk
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    analyst = FinancialAnalyst(scheduler=UpstreamScheduler(retry=RetryPolicy(max_attempts=2, base_delay=0.01)))
+    analyst.llm = DroppingChatModel(responses=["first analysis"])
+    events = []
+    stream = TokenStream(
+        on_token=lambda node, text: events.append(text),
+        on_restart=lambda node: events.clear()
+    )
+
+    with streaming_tokens(stream):
+        update = analyst.analyze({"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0})
+
+    assert update["sentiment_analysis"] == "first analysis"
+    assert "".join(events) == "first analysis"
+
+
+def test_run_budget_is_charged_and_refuses_calls_it_cannot_afford(monkeypatch):
+    from trader_desk.core.budget import BudgetExceeded, RunBudget, spending
+
+    analyst = make_analyst(monkeypatch, None)
+    state = {"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0}
+
+    budget = RunBudget(max_tokens=10_000, prompt_cost_per_1k=0.01, completion_cost_per_1k=0.03)
+    with spending(budget):
+        assert analyst.analyze(state)["sentiment_analysis"] == "first analysis"
+    assert budget.tokens > 0 and budget.cost > 0
+
+    with spending(RunBudget(max_tokens=10)), pytest.raises(BudgetExceeded) as exceeded:
+        analyst.analyze(state)
+    # Refused before reaching the model: its next response is still unused
+    assert exceeded.value.reason == "tokens" and analyst.llm.i == 1
+
+
+def test_market_context_is_a_shared_prefix_of_analyst_prompts(monkeypatch):
+    from trader_desk.core.types import MarketContext
+
+    analyst = make_analyst(monkeypatch, None)
+    context = MarketContext(index_change_52_weeks=0.1, sector_changes={"Energy": -0.05})
+    prompts = [
+        analyst.prompt.format_messages(**analyst._chain_inputs(
+            {"ticker": ticker, "financial_data": f"Current Price: ${price}", "iterations": 0,
+             "market_context": context}, 1
+        ))
+        for ticker, price in (("AAPL", 100), ("XOM", 50))
+    ]
+
+    assert [m.content for m in prompts[0][:2]] == [m.content for m in prompts[1][:2]]
+    assert "S&P 500 52 weeks change: 10.00%" in prompts[0][1].content
+    assert "Energy -5.0%" in prompts[0][1].content
+    assert "AAPL" in prompts[0][2].content and "XOM" in prompts[1][2].content
+
+    # Without a market context the prompt is unchanged
+    plain = analyst.prompt.format_messages(**analyst._chain_inputs(
+        {"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0}, 1
+    ))
+    assert len(plain) == 2
+
+
+def test_sampled_responses_are_not_cached(monkeypatch, response_cache):
+    analyst = make_analyst(monkeypatch, response_cache)
+    analyst.temperature = 0.7
+    state = {"ticker": "AAPL", "financial_data": "Current Price: $100", "iterations": 0}
+
+    first = analyst.analyze(state)
+    second = analyst.analyze({**state, "iterations": 1})
+
+    assert (first["sentiment_analysis"], second["sentiment_analysis"]) == ("first analysis", "second analysis")
+    assert analyst.llm.calls == 2
+    assert response_cache.stats.hits == response_cache.stats.misses == 0
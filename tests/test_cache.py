@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from trader_desk.utils.cache import MemoryBackend, SQLiteBackend, TTLCache
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_entries=2)
+    return SQLiteBackend(str(tmp_path / "cache.sqlite"), max_entries=2)
+
+
+def test_entries_expire_per_kind(backend):
+    cache = TTLCache(backend=backend, ttls={"price": 0.05, "fundamentals": 60})
+    cache.set("price", "AAPL", 101.0)
+    cache.set("fundamentals", "AAPL", {"forwardPE": 30})
+
+    time.sleep(0.1)
+
+    assert cache.get("price", "AAPL") is None
+    assert cache.get("fundamentals", "AAPL") == {"forwardPE": 30}
+    assert cache.stats.expirations == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_least_recently_used_entry_is_evicted(backend):
+    cache = TTLCache(backend=backend)
+    cache.set("news", "AAPL", "a")
+    cache.set("news", "MSFT", "b")
+    time.sleep(0.01)
+    cache.get("news", "AAPL")
+    cache.set("news", "NVDA", "c")
+
+    assert cache.stats.evictions == 1
+    assert cache.get("news", "MSFT") is None
+    assert cache.get("news", "AAPL") == "a"
+    assert cache.get("news", "NVDA") == "c"
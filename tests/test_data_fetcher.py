@@ -0,0 +1,184 @@
+import asyncio
+import time
+
+import pytest
+
+from trader_desk.core.types import FinancialData, NewsItem
+from trader_desk.utils.data_fetcher import FinancialDataFetcher
+
+
+class SlowNewsFetcher(FinancialDataFetcher):
+    def get_info(self, ticker):
+        return {"currentPrice": 120.0, "marketCap": 2_000_000, "forwardPE": 18.2}
+
+    def get_price(self, ticker):
+        return 123.45
+
+    def get_price_targets(self, ticker):
+        return {"mean": 150.0}
+
+    def get_financial_news(self, ticker, results=3):
+        time.sleep(0.5)
+        return (NewsItem("Late headline"),)
+
+
+def test_slow_source_times_out_without_blocking_others():
+    fetcher = SlowNewsFetcher(source_timeouts={"news": 0.05})
+
+    start = time.monotonic()
+    update = fetcher.fetch_financial_data({"ticker": "AAPL"})
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.4
+    assert "Current Price: $123.45" in str(update["financial_data"])
+    assert update["financial_data"].news == ()
+    assert "missing sources: news" in update["messages"][0]
+    fetcher.close()
+
+
+def test_async_fetch_assembles_partial_results():
+    fetcher = SlowNewsFetcher(source_timeouts={"news": 0.05})
+
+    update = asyncio.run(fetcher.afetch_financial_data({"ticker": "AAPL"}))
+
+    assert "Current Price: $123.45" in str(update["financial_data"])
+    assert "missing sources: news" in update["messages"][0]
+    fetcher.close()
+
+
+def test_cached_sources_are_fetched_once(tmp_path):
+    from trader_desk.utils.cache import SQLiteBackend, TTLCache
+
+    class CountingFetcher(SlowNewsFetcher):
+        calls = 0
+
+        def get_financial_news(self, ticker, results=3):
+            CountingFetcher.calls += 1
+            return (NewsItem("Cached headline"),)
+
+    cache = TTLCache(backend=SQLiteBackend(str(tmp_path / "cache.sqlite")))
+    fetcher = CountingFetcher(cache=cache)
+
+    first = fetcher.fetch_financial_data({"ticker": "AAPL"})
+    second = fetcher.fetch_financial_data({"ticker": "AAPL"})
+
+    assert first["financial_data"] == second["financial_data"]
+    assert CountingFetcher.calls == 1
+    assert cache.stats.hits == 4 and cache.stats.misses == 4
+    fetcher.close()
+
+
+def test_missing_values_produce_structured_record():
+    class SparseFetcher(SlowNewsFetcher):
+        def get_info(self, ticker):
+            return {"marketCap": None, "forwardPE": float("nan"), "52WeekChange": 0.25,
+                    "SandP52WeekChange": 0.1, "overallRisk": 4}
+
+        def get_financial_news(self, ticker, results=3):
+            return ()
+
+    fetcher = SparseFetcher()
+    data = fetcher.fetch_financial_data({"ticker": "AAPL"})["financial_data"]
+
+    assert isinstance(data, FinancialData)
+    assert data.market_cap is None and data.pe_ratio is None
+    assert data.risk_score == 4
+    assert abs(data.relative_performance - 0.15) < 1e-9
+    assert "Market Cap: No data" in str(data)
+    assert "Relative performance: 15.00%" in data.prompt_text
+    assert data.prompt_text is data.prompt_text
+    fetcher.close()
+
+
+def test_fetch_fails_when_no_core_source_is_available():
+    from trader_desk.utils.data_fetcher import DataUnavailableError
+
+    class DownFetcher(SlowNewsFetcher):
+        def get_info(self, ticker):
+            raise ConnectionError("yahoo down")
+
+        def get_price(self, ticker):
+            raise ConnectionError("yahoo down")
+
+    fetcher = DownFetcher(source_timeouts={"news": 0.05})
+    with pytest.raises(DataUnavailableError, match="yahoo down"):
+        fetcher.fetch_financial_data({"ticker": "AAPL"})
+    fetcher.close()
+
+
+def test_shared_market_context_saves_upstream_calls_and_prompt_tokens(monkeypatch):
+    from collections import Counter
+
+    from trader_desk.core.types import MarketContext
+    from trader_desk.nodes.analysis import FinancialAnalyst
+    from trader_desk.nodes.prompting import estimate_tokens
+
+    snippet = "Shares moved as investors weighed guidance, rates and the broader market outlook. " * 6
+    calls = Counter()
+
+    class CountingFetcher(SlowNewsFetcher):
+        def get_info(self, ticker):
+            calls["fundamentals"] += 1
+            return {"52WeekChange": 0.3, "SandP52WeekChange": 0.12, "marketCap": 2_000_000}
+
+        def get_financial_news(self, ticker, results=3):
+            calls["news"] += 1
+            return tuple(NewsItem(f"{ticker} headline {i}", snippet) for i in range(results))
+
+        def get_market_performance(self):
+            calls["market_performance"] += 1
+            return {"^GSPC": 0.1, **{etf: 0.05 for etf in self.SECTOR_ETFS.values()}}
+
+        def get_market_news(self, results=3):
+            calls["market_news"] += 1
+            return tuple(NewsItem(f"Macro headline {i}", snippet) for i in range(results))
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    analyst = FinancialAnalyst()
+    tickers = ["AAPL", "MSFT", "NVDA", "XOM"]
+
+    def run_batch(market_context):
+        prompt_tokens = 0
+        for ticker in tickers:
+            state = {"ticker": ticker, "iterations": 0, "market_context": market_context}
+            state.update(fetcher.fetch_financial_data(state))
+            messages = analyst.prompt.format_messages(**analyst._chain_inputs(state, 1))
+            prompt_tokens += sum(estimate_tokens(message.content) for message in messages)
+        return prompt_tokens
+
+    fetcher = CountingFetcher()
+    plain_tokens = run_batch(None)
+    plain_calls, calls = sum(calls.values()), Counter()
+
+    context = fetcher.fetch_market_context()
+    shared_tokens = run_batch(context)
+    shared_calls = sum(calls.values())
+
+    assert isinstance(context, MarketContext) and calls["news"] == 0
+    assert shared_calls < plain_calls
+    assert shared_tokens < plain_tokens
+    fetcher.close()
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_source_timeouts_start_when_a_worker_picks_the_source_up(use_async):
+    from concurrent.futures import ThreadPoolExecutor
+
+    class QuickFetcher(SlowNewsFetcher):
+        def get_financial_news(self, ticker, results=3):
+            return (NewsItem("Quick headline"),)
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    fetcher = QuickFetcher(executor=executor, source_timeouts=dict.fromkeys(QuickFetcher.DEFAULT_SOURCE_TIMEOUTS, 0.1))
+    # Other runs keep the shared workers busy for longer than any source timeout
+    for _ in range(2):
+        executor.submit(time.sleep, 0.3)
+
+    start = time.monotonic()
+    state = {"ticker": "AAPL"}
+    update = asyncio.run(fetcher.afetch_financial_data(state)) if use_async else fetcher.fetch_financial_data(state)
+
+    assert time.monotonic() - start > 0.25
+    assert update["financial_data"].missing_sources == ()
+    assert update["financial_data"].news == (NewsItem("Quick headline"),)
+    executor.shutdown()
@@ -0,0 +1,36 @@
+from trader_desk.core.incremental import MaterialityThresholds, material_changes
+from trader_desk.core.types import FinancialData, NewsItem
+
+
+def make_data(price=100.0, pe=20.0, headlines=("Earnings beat",)):
+    return FinancialData(
+        ticker="AAPL",
+        current_price=price,
+        pe_ratio=pe,
+        news=tuple(NewsItem(title) for title in headlines)
+    )
+
+
+def test_small_moves_are_not_material():
+    changes = material_changes(make_data(), make_data(price=100.5, pe=20.5), MaterialityThresholds())
+
+    assert changes == []
+
+
+def test_price_pe_and_news_changes_are_reported():
+    changes = material_changes(
+        make_data(),
+        make_data(price=103.0, pe=25.0, headlines=("Earnings beat", "CEO resigns")),
+        MaterialityThresholds()
+    )
+
+    assert len(changes) == 3
+    assert changes[0].startswith("Current Price: 100.00 -> 103.00")
+    assert changes[1].startswith("Forward P/E Ratio")
+    assert changes[2] == "New headline: CEO resigns"
+
+
+def test_missing_value_counts_as_material():
+    changes = material_changes(make_data(pe=None), make_data(), MaterialityThresholds())
+
+    assert changes == ["Forward P/E Ratio: None -> 20.0"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from trader_desk.utils.indicators import (
+    atr, drawdown, macd, realized_volatility, rsi, sma, summarize
+)
+
+
+def panel(n_days=300, n_tickers=4, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(n_days, n_tickers)), axis=0))
+    index = pd.bdate_range(end="2024-12-31", periods=n_days)
+    columns = [f"T{i}" for i in range(n_tickers)]
+    close = pd.DataFrame(close, index=index, columns=columns)
+    return close * 1.01, close * 0.99, close
+
+
+def reference_rsi(values, period=14):
+    deltas = np.diff(values)
+    avg_gain = avg_loss = None
+    for i, delta in enumerate(deltas, start=1):
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if avg_gain is None:
+            avg_gain, avg_loss = gain, loss
+        else:
+            avg_gain += (gain - avg_gain) / period
+            avg_loss += (loss - avg_loss) / period
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def test_indicators_match_per_ticker_reference():
+    high, low, close = panel()
+
+    assert np.allclose(rsi(close).iloc[-1], [reference_rsi(close[c].to_numpy()) for c in close])
+    line, signal, histogram = macd(close)
+    assert np.allclose(histogram, line - signal, equal_nan=True)
+    assert np.allclose(atr(high, low, close).iloc[-1], (high - low).iloc[-1], rtol=0.5)
+    peaks = close.cummax()
+    assert np.allclose(drawdown(close), close / peaks - 1)
+
+
+def test_summary_matches_full_series_helpers():
+    high, low, close = panel()
+    close.iloc[:120, 2] = high.iloc[:120, 2] = low.iloc[:120, 2] = np.nan
+
+    summary = summarize(high, low, close)
+    line, signal, _ = macd(close)
+    year = close.iloc[-252:]
+    expected = {
+        "sma_50": sma(close, 50), "sma_200": sma(close, 200), "rsi_14": rsi(close),
+        "macd": line, "macd_signal": signal, "atr_14": atr(high, low, close),
+        "volatility_20d": realized_volatility(close, 20),
+        "volatility_1y": realized_volatility(year, 251), "drawdown": drawdown(year),
+    }
+    for name, frame in expected.items():
+        assert np.allclose(summary[name], frame.iloc[-1], equal_nan=True), name
+
+
+def test_summary_handles_short_and_missing_history():
+    high, low, close = panel()
+    close.iloc[:250, 1] = np.nan  # listed recently
+    high.iloc[:250, 1] = low.iloc[:250, 1] = np.nan
+
+    summary = summarize(high, low, close)
+
+    assert list(summary.index) == list(close.columns)
+    assert summary.loc["T0"].notna().all()
+    assert np.isnan(summary.loc["T1", "sma_200"]) and not np.isnan(summary.loc["T1", "rsi_14"])
+    assert (summary["max_drawdown_1y"] <= summary["drawdown"]).all()
+    assert summary["rsi_14"].between(0, 100).all()
@@ -0,0 +1,49 @@
+import json
+
+from trader_desk.utils.cache import TTLCache
+from trader_desk.utils.metrics import InMemorySink, JSONLSink, MetricsRecorder, PrometheusSink
+
+
+def test_timer_records_duration_and_status():
+    sink = InMemorySink()
+    recorder = MetricsRecorder([sink])
+
+    with recorder.timer("upstream_latency_seconds", provider="yfinance"):
+        pass
+    try:
+        with recorder.timer("upstream_latency_seconds", provider="tavily"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert len(sink.values("upstream_latency_seconds", provider="yfinance", status="ok")) == 1
+    assert len(sink.values("upstream_latency_seconds", provider="tavily", status="error")) == 1
+
+
+def test_cache_lookups_are_recorded():
+    sink = InMemorySink()
+    cache = TTLCache(metrics=MetricsRecorder([sink]))
+
+    cache.get("news", "AAPL")
+    cache.set("news", "AAPL", "headline")
+    cache.get("news", "AAPL")
+
+    assert [e.labels["result"] for e in sink.events] == ["miss", "hit"]
+
+
+def test_prometheus_and_jsonl_sinks(tmp_path):
+    prometheus = PrometheusSink()
+    jsonl = JSONLSink(str(tmp_path / "metrics.jsonl"))
+    recorder = MetricsRecorder([prometheus, jsonl])
+
+    recorder.record("node_duration_seconds", 0.5, node="Analyst", ticker="AAPL")
+    recorder.record("node_duration_seconds", 1.5, node="Analyst", ticker="MSFT")
+    recorder.close()
+
+    text = prometheus.render()
+    assert "# TYPE trader_desk_node_duration_seconds summary" in text
+    assert 'trader_desk_node_duration_seconds_count{node="Analyst"} 2' in text
+    assert 'trader_desk_node_duration_seconds_sum{node="Analyst"} 2.000000' in text
+
+    lines = (tmp_path / "metrics.jsonl").read_text().splitlines()
+    assert json.loads(lines[1])["labels"] == {"node": "Analyst", "ticker": "MSFT"}
@@ -0,0 +1,57 @@
+from trader_desk.core.types import FinancialData
+from trader_desk.nodes.precheck import check_report, extract_numbers
+
+DATA = FinancialData(
+    ticker="AAPL",
+    current_price=229.87,
+    market_cap=3_493_420_105_728,
+    pe_ratio=27.64,
+    analyst_price_target={"low": 184.0, "mean": 244.51, "high": 300.0},
+    change_52_weeks=0.2213,
+    market_change_52_weeks=0.2387,
+    risk_score=1,
+    debt_to_equity=209.06,
+)
+
+REPORT = """
+AAPL trades at a current price of $229.87 with a market cap of $3.49 trillion and a forward P/E of 27.6.
+Over 52 weeks the stock gained 22.1%, trailing the S&P 500's 23.9%.
+The mean price target of $244.51 offers upside, while the risk score of 1/10 is low
+but a debt-to-equity ratio of 209.06 is high.
+"""
+
+
+def test_extract_numbers_applies_magnitudes():
+    plain, percents = extract_numbers("Cap $3.49 trillion, 12 bn, 1,250.5 shares, down -4.2% and 7 percent")
+
+    assert plain == [3.49e12, 12e9, 1250.5]
+    assert percents == [4.2, 7.0]
+
+
+def test_complete_report_passes():
+    assert check_report(REPORT, DATA) == []
+
+
+def test_missing_and_misquoted_items_are_reported():
+    report = REPORT.replace("27.6", "31.0").replace("the risk score of 1/10 is low\nbut ", "")
+
+    assert check_report(report, DATA) == [
+        "The forward P/E ratio does not match the data: it should be 27.64",
+        "Mention the risk score (1/10)",
+    ]
+
+
+def test_missing_data_is_not_required():
+    assert check_report("The current price is $229.87.", FinancialData(ticker="AAPL", current_price=229.87)) == []
+
+
+def test_price_target_is_not_a_current_price_mention():
+    data = FinancialData(ticker="AAPL", current_price=229.87, analyst_price_target={"mean": 244.51})
+
+    assert check_report("The mean price target is $244.51.", data) == [
+        "Mention the current price ($229.87)"
+    ]
+    assert check_report("The mean price target is $244.51; the stock is trading at $240.", data) == [
+        "The current price does not match the data: it should be $229.87"
+    ]
+    assert check_report("Shares ($229.87) sit below the $244.51 price target.", data) == []
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from trader_desk.utils.prices import BAR_DTYPE, PriceStore, price_features
+
+
+class FakeMarket:
+    """Serves daily bars for a fixed date range, like a bulk yfinance download."""
+
+    def __init__(self, end):
+        self.end = end
+        self.requests = []
+
+    def __call__(self, tickers, interval, start, period):
+        self.requests.append((tuple(tickers), start, period))
+        dates = pd.bdate_range(start or "2024-01-01", self.end, tz="America/New_York")
+        frames = {}
+        for i, ticker in enumerate(tickers):
+            close = 100.0 + i + np.arange(len(dates))
+            frames[ticker] = pd.DataFrame(
+                {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+                index=dates
+            )
+        return pd.concat(frames, axis=1)
+
+
+def test_sync_is_incremental_and_reads_are_memory_mapped(tmp_path):
+    market = FakeMarket(end="2024-03-29")
+    store = PriceStore(str(tmp_path), chunk_size=2, downloader=market)
+
+    assert store.sync(["AAPL", "MSFT", "NVDA"]) == {"AAPL": 65, "MSFT": 65, "NVDA": 65}
+    assert [r[2] for r in market.requests] == ["10y", "10y"]
+    assert isinstance(store.bars("AAPL"), np.memmap)
+
+    # The next sync starts at the last stored day, which is rewritten, not duplicated
+    before = store.bars("AAPL")
+    market.end = "2024-04-05"
+    market.requests.clear()
+    assert store.sync(["AAPL", "MSFT", "NVDA"]) == {"AAPL": 5, "MSFT": 5, "NVDA": 5}
+    assert {r[1] for r in market.requests} == {"2024-03-29"}
+
+    # A reader's existing mapping stays intact through the sync
+    assert len(before) == 65 and before["close"][-1] == 164.0
+
+    bars = store.bars("AAPL")
+    assert len(bars) == 70 and np.all(np.diff(bars["ts"]) > 0)
+    march = store.bars("AAPL", start="2024-03-01", end="2024-04-01")
+    assert len(march) == 21 and march["close"][0] == 144.0
+    assert len(store.tail("MSFT", 3)) == 3
+    assert store.bars("NONE").dtype == BAR_DTYPE and len(store.bars("NONE")) == 0
+
+
+def test_price_features_summarize_daily_bars():
+    bars = np.zeros(300, dtype=BAR_DTYPE)
+    bars["ts"] = np.arange(300) * 86400
+    bars["close"] = np.linspace(100, 200, 300)
+    bars["high"] = bars["close"] + 5
+    bars["low"] = bars["close"] - 5
+    bars["volume"] = 10.0
+
+    features = price_features(bars)
+
+    assert abs(features["return_1m"] - (200 / bars["close"][-22] - 1)) < 1e-12
+    assert features["high_52w"] == 205.0
+    assert abs(features["off_high_52w"] - (200 / 205 - 1)) < 1e-12
+    assert features["avg_volume_3m"] == 10.0
+    assert price_features(bars[-10:]).keys() == {"high_52w", "low_52w", "off_high_52w", "avg_volume_3m"}
+
+
+def test_fetcher_adds_price_history_features(tmp_path):
+    from trader_desk.utils.data_fetcher import FinancialDataFetcher
+
+    class OfflineFetcher(FinancialDataFetcher):
+        def get_info(self, ticker):
+            return {"currentPrice": 120.0}
+
+        def get_price(self, ticker):
+            return 123.45
+
+        def get_price_targets(self, ticker):
+            return {}
+
+        def get_financial_news(self, ticker, results=3):
+            return ()
+
+    fetcher = OfflineFetcher(price_store=PriceStore(str(tmp_path), downloader=FakeMarket(end="2024-03-29")))
+    fetcher.sync_price_history(["AAPL"])
+    data = fetcher.fetch_financial_data({"ticker": "AAPL"})["financial_data"]
+
+    assert data.price_history["return_1m"] > 0
+    assert "1 month return:" in data.prompt_text
+    assert data.technicals["rsi_14"] == 100.0 and "sma_200" not in data.technicals
+    assert "RSI (14): 100.00" in data.prompt_text
+    fetcher.close()
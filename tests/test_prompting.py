@@ -0,0 +1,57 @@
+from langchain_core.prompts import ChatPromptTemplate
+
+from trader_desk.core.types import FinancialData, NewsItem
+from trader_desk.nodes.prompting import (
+    PromptAssembler,
+    dedupe_news,
+    estimate_tokens,
+    extract_feedback_items,
+    is_approved,
+)
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "You are an analyst."), ("user", "{financial_data}")])
+
+
+def make_data():
+    news = tuple(NewsItem(f"Headline {i % 4}", "word " * 200) for i in range(12))
+    return FinancialData(ticker="AAPL", current_price=100.0, business_summary="x" * 2000, news=news)
+
+
+def test_dedupe_news_drops_repeats_and_trims():
+    news = dedupe_news(make_data().news, max_items=10, snippet_chars=50)
+
+    assert [item.title for item in news] == ["Headline 0", "Headline 1", "Headline 2", "Headline 3"]
+    assert all(len(item.snippet) == 50 for item in news)
+
+
+def test_data_is_compacted_to_fit_budget():
+    assembler = PromptAssembler(token_budget=200)
+
+    text = assembler.fit_financial_data(make_data(), PROMPT, "other input " * 20)
+
+    assert estimate_tokens(text) + assembler.static_tokens(PROMPT) + estimate_tokens("other input " * 20) <= 200
+    assert "Current Price: $100.00" in text
+
+
+def test_unbounded_assembler_still_dedupes_news():
+    text = PromptAssembler().fit_financial_data(make_data(), PROMPT)
+
+    assert text.count("Headline 0") == 1
+
+
+def test_extract_feedback_items():
+    assert extract_feedback_items("APPROVE") == []
+    assert extract_feedback_items(
+        "**FEEDBACK:**\n1. Missing the P/E ratio\n2. No comparison to the S&P 500"
+    ) == ["Missing the P/E ratio", "No comparison to the S&P 500"]
+    assert extract_feedback_items("FEEDBACK: [Market Cap missing; debt to equity not discussed]") == [
+        "Market Cap missing", "debt to equity not discussed"
+    ]
+
+
+def test_is_approved():
+    assert is_approved("APPROVE")
+    assert is_approved("**APPROVE**")
+    assert not is_approved("FEEDBACK: approve once the P/E ratio is mentioned")
+    assert not is_approved("I cannot approve this report")
+    assert not is_approved("")
@@ -0,0 +1,65 @@
+import time
+
+from trader_desk.core.results import ResultStore, RunRecord
+from trader_desk.core.types import FinancialData
+
+
+def make_state(ticker, feedback, price=100.0):
+    return {
+        "ticker": ticker,
+        "financial_data": FinancialData(ticker=ticker, current_price=price, pe_ratio=20.0),
+        "sentiment_analysis": f"report for {ticker}",
+        "critic_feedback": feedback,
+        "iterations": 1,
+        "run_id": "",
+    }
+
+
+def test_writes_are_batched_and_queryable(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"), flush_size=3, flush_interval=60)
+    other = ResultStore(str(tmp_path / "results.sqlite"))
+
+    store.add(RunRecord.from_state(make_state("AAPL", "APPROVE", 100.0), 1.5, {"Fetcher": 0.5}))
+    store.add(RunRecord.from_state(make_state("MSFT", "FEEDBACK: more data"), 2.0))
+    assert other.query() == []
+
+    store.add(RunRecord.from_state(make_state("AAPL", "**APPROVE**", 105.0), 1.0))
+    assert len(other.query()) == 3
+
+    latest = other.latest("AAPL")
+    assert latest.metrics["current_price"] == 105.0
+    assert latest.financial_data["pe_ratio"] == 20.0
+    assert [r.ticker for r in other.query(verdict="approve")] == ["AAPL", "AAPL"]
+    assert [r.ticker for r in other.query(verdict="REVISE")] == ["MSFT"]
+    assert other.query(since=time.time() + 60) == []
+    assert other.latest("NVDA") is None
+    assert other.query(ticker="AAPL", limit=None)[-1].timings == {"Fetcher": 0.5}
+
+    store.close()
+    other.close()
+
+
+def test_close_flushes_pending_records(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path, flush_size=100, flush_interval=60)
+    store.add(RunRecord.from_state(make_state("AAPL", "APPROVE"), 1.0))
+    store.close()
+
+    reopened = ResultStore(path)
+    assert reopened.latest("AAPL").verdict == "APPROVE"
+    reopened.close()
+
+
+def test_pending_records_are_flushed_after_the_interval(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path, flush_size=100, flush_interval=0.05)
+    other = ResultStore(path)
+
+    store.add(RunRecord.from_state(make_state("AAPL", "APPROVE"), 1.0))
+    deadline = time.monotonic() + 5
+    while not other.query() and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert [r.ticker for r in other.query()] == ["AAPL"]
+    store.close()
+    other.close()
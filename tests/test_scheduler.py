@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from trader_desk.core.budget import BudgetExceeded, RunBudget, spending
+from trader_desk.core.config import ProviderLimit
+from trader_desk.utils.scheduler import (
+    CircuitOpenError,
+    Priority,
+    ProviderLimiter,
+    RetryPolicy,
+    UpstreamScheduler,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def flaky(failures, exc_type=ConnectionError):
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise exc_type("upstream hiccup")
+        return "ok"
+    return call, calls
+
+
+def test_transient_failures_are_retried_with_backoff():
+    scheduler = UpstreamScheduler(retry=RetryPolicy(max_attempts=4, base_delay=0.01))
+    call, calls = flaky(2, RateLimitError)
+
+    assert scheduler.call("tavily", call) == "ok"
+    assert len(calls) == 3
+
+
+def test_non_retryable_errors_surface_immediately():
+    scheduler = UpstreamScheduler(retry=RetryPolicy(max_attempts=4, base_delay=0.01))
+    call, calls = flaky(1, KeyError)
+
+    with pytest.raises(KeyError):
+        scheduler.call("yfinance", call)
+    assert len(calls) == 1
+
+
+def test_circuit_opens_after_repeated_failures():
+    scheduler = UpstreamScheduler(
+        retry=RetryPolicy(max_attempts=1), failure_threshold=2, reset_timeout=60
+    )
+    call, calls = flaky(10)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            scheduler.call("openai", call)
+    with pytest.raises(CircuitOpenError):
+        scheduler.call("openai", call)
+    assert len(calls) == 2
+
+
+def half_open(scheduler, provider):
+    call, _ = flaky(10)
+    with pytest.raises(ConnectionError):
+        scheduler.call(provider, call)
+    time.sleep(0.03)
+
+
+def test_aborted_half_open_trial_is_released():
+    scheduler = UpstreamScheduler(
+        retry=RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=0.02
+    )
+    half_open(scheduler, "openai")
+    call, calls = flaky(0)
+
+    with spending(RunBudget(deadline_seconds=0)):
+        with pytest.raises(BudgetExceeded):
+            scheduler.call("openai", call)
+
+    assert calls == []
+    assert scheduler.call("openai", call) == "ok"
+
+
+def test_cancelled_half_open_trial_is_released():
+    scheduler = UpstreamScheduler(
+        retry=RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=0.02
+    )
+    half_open(scheduler, "openai")
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "ok"
+
+    async def main():
+        trial = asyncio.ensure_future(scheduler.acall("openai", hang))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return await scheduler.acall("openai", ok)
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_interactive_callers_overtake_queued_batch_work():
+    limiter = ProviderLimiter(ProviderLimit(requests_per_second=5, burst=1))
+    limiter.acquire()  # drain the bucket
+    order = []
+
+    def acquire(priority):
+        limiter.acquire(priority=priority)
+        order.append(priority)
+
+    batch = threading.Thread(target=acquire, args=(Priority.BATCH,))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=acquire, args=(Priority.INTERACTIVE,))
+    interactive.start()
+    batch.join(2)
+    interactive.join(2)
+
+    assert order == [Priority.INTERACTIVE, Priority.BATCH]
+
+
+def test_only_provider_responses_close_a_half_open_circuit():
+    class BadRequest(Exception):
+        status_code = 400
+
+    scheduler = UpstreamScheduler(
+        retry=RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=0.02
+    )
+    half_open(scheduler, "openai")
+
+    # A local abort inside the trial says nothing about the provider
+    with pytest.raises(KeyError):
+        scheduler.call("openai", flaky(1, KeyError)[0])
+    assert scheduler.breaker("openai").state == "half_open"
+
+    with pytest.raises(BadRequest):
+        scheduler.call("openai", flaky(1, BadRequest)[0])
+    assert scheduler.breaker("openai").state == "closed"
+
+
+def test_rate_limit_wait_gives_up_at_the_deadline():
+    scheduler = UpstreamScheduler(limits={"tavily": ProviderLimit(requests_per_second=0.1, burst=1)})
+    call, calls = flaky(0)
+    assert scheduler.call("tavily", call) == "ok"  # drains the bucket
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        scheduler.call("tavily", call, deadline=time.monotonic() + 0.05)
+    with spending(RunBudget(deadline_seconds=0.05)), pytest.raises(BudgetExceeded):
+        asyncio.run(scheduler.acall("tavily", asyncio.sleep, 0))
+
+    assert time.monotonic() - start < 1
+    assert len(calls) == 1 and scheduler.limiters["tavily"]._waiters == []
@@ -0,0 +1,70 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trader_desk.utils.screener import BENCHMARK, ScreenCriteria, WatchlistScreener, compute_metrics, screen
+
+
+def make_prices():
+    market_returns = np.array([0.01, -0.02, 0.015, 0.005, -0.01])
+    market = 100 * np.cumprod(np.r_[1.0, 1 + market_returns])
+    double = 50 * np.cumprod(np.r_[1.0, 1 + 2 * market_returns])
+    late = np.r_[np.nan, np.nan, 10.0, 11.0, 12.0, 12.5]
+    return pd.DataFrame({"DBL": double, "LATE": late, BENCHMARK: market})
+
+
+def test_metrics_are_computed_per_column():
+    metrics = compute_metrics(make_prices())
+
+    assert list(metrics.index) == ["DBL", "LATE"]
+    assert abs(metrics.loc["DBL", "beta"] - 2.0) < 1e-9
+    assert abs(metrics.loc["LATE", "change_52_weeks"] - 0.25) < 1e-9
+    market_change = make_prices()[BENCHMARK].iloc[-1] / 100 - 1
+    assert abs(metrics.loc["LATE", "relative_performance"] - (0.25 - market_change)) < 1e-9
+
+
+def test_screen_filters_and_ranks():
+    fundamentals = pd.DataFrame({"pe_ratio": [80.0], "debt_to_equity": [10.0]}, index=["DBL"])
+    metrics = compute_metrics(make_prices(), fundamentals=fundamentals)
+
+    top = screen(metrics, ScreenCriteria(max_pe_ratio=40, top_n=5))
+
+    # DBL is filtered out by P/E; LATE has no fundamentals and is kept
+    assert list(top.index) == ["LATE"]
+
+
+def test_missing_benchmark_is_reported():
+    with pytest.raises(ValueError, match="no \\^GSPC column"):
+        compute_metrics(make_prices().drop(columns=BENCHMARK))
+
+
+def test_fundamentals_filter_without_cache_warns(caplog):
+    screener = WatchlistScreener(ScreenCriteria(max_pe_ratio=40))
+
+    with caplog.at_level(logging.WARNING, logger="trader_desk.utils.screener"):
+        top = screener.top_candidates(["DBL", "LATE"], prices=make_prices())
+
+    assert sorted(top) == ["DBL", "LATE"]
+    assert [r.filter for r in caplog.records] == ["max_pe_ratio"]
+
+
+def test_fundamentals_missing_from_cache_are_fetched_for_candidates():
+    class Fetcher:
+        requested = []
+
+        def fetch_fundamentals(self, tickers):
+            self.requested.extend(tickers)
+            return {ticker: {"forwardPE": 80.0 if ticker == "DBL" else 15.0} for ticker in tickers}
+
+    screener = WatchlistScreener(ScreenCriteria(max_pe_ratio=40), fetcher=Fetcher())
+    top = screener.run(["DBL", "LATE"], prices=make_prices())
+
+    assert sorted(Fetcher.requested) == ["DBL", "LATE"]
+    assert list(top.index) == ["LATE"] and top.loc["LATE", "pe_ratio"] == 15.0
+
+    # Without fundamentals filters only the top candidates are fetched
+    Fetcher.requested.clear()
+    WatchlistScreener(ScreenCriteria(top_n=1), fetcher=Fetcher()).run(["DBL", "LATE"], prices=make_prices())
+    assert len(Fetcher.requested) == 1
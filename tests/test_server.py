@@ -0,0 +1,99 @@
+import json
+import threading
+import urllib.request
+
+import pytest
+
+from trader_desk.core.config import AppConfig, LLMConfig, ServerConfig, WorkflowConfig
+from trader_desk.server import DeskServer, QueueFullError, RunCoordinator
+from trader_desk.utils.metrics import MetricsRecorder
+
+
+class BlockingWorkflow:
+    """Workflow stand-in whose runs wait until released."""
+
+    def __init__(self):
+        self.config = AppConfig(llm=LLMConfig(), workflow=WorkflowConfig(max_concurrency=1), openai_api_key="x")
+        self.metrics = MetricsRecorder()
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.runs = []
+        self.app = object()
+
+    def run(self, ticker, verbose=False, on_event=None, token_stream=None):
+        self.runs.append(ticker)
+        on_event("Fetcher", {"ticker": ticker})
+        self.started.set()
+        self.release.wait(5)
+        if token_stream is not None:
+            token_stream.emit("Analyst", f"{ticker} looks")
+            token_stream.emit("Analyst", " fine")
+        on_event("Analyst", {"sentiment_analysis": f"{ticker} looks fine"})
+        return {"ticker": ticker, "sentiment_analysis": f"{ticker} looks fine",
+                "critic_feedback": "APPROVE", "iterations": 1}
+
+    def close(self):
+        pass
+
+
+def test_concurrent_requests_for_a_ticker_share_one_run():
+    workflow = BlockingWorkflow()
+    coordinator = RunCoordinator(workflow, workers=1, max_queue=1)
+
+    first, joined_first = coordinator.submit("AAPL")
+    workflow.started.wait(5)
+    second, joined_second = coordinator.submit("AAPL")
+    assert second is first and (joined_first, joined_second) == (False, True)
+
+    # The worker is busy and one run is queued: a third ticker is rejected
+    coordinator.submit("MSFT")
+    with pytest.raises(QueueFullError):
+        coordinator.submit("NVDA")
+
+    workflow.release.set()
+    assert first.wait(5)
+    coordinator.close()
+    assert workflow.runs == ["AAPL", "MSFT"]
+    assert [node for node, update in first.follow(1) if isinstance(update, dict)] == ["Fetcher", "Analyst"]
+
+
+def test_stream_endpoint_emits_node_events_then_result():
+    workflow = BlockingWorkflow()
+    workflow.release.set()
+    server = DeskServer(workflow, ServerConfig(port=0, max_queue=4))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.address
+        with urllib.request.urlopen(f"http://{host}:{port}/analyze/aapl?stream=1", timeout=5) as response:
+            lines = [json.loads(line) for line in response.read().decode().splitlines()]
+    finally:
+        server.shutdown()
+
+    assert [(line["event"], line["node"]) for line in lines[:-1]] == [
+        ("node", "Fetcher"), ("token", "Analyst"), ("token", "Analyst"), ("node", "Analyst")
+    ]
+    assert "".join(line["text"] for line in lines if line["event"] == "token") == "AAPL looks fine"
+    assert lines[-1]["event"] == "result"
+    assert lines[-1]["sentiment_analysis"] == "AAPL looks fine"
+
+
+def test_cancel_detaches_one_subscriber_and_skips_abandoned_queued_runs():
+    workflow = BlockingWorkflow()
+    coordinator = RunCoordinator(workflow, workers=1, max_queue=2)
+
+    shared, _ = coordinator.submit("AAPL", "a")
+    workflow.started.wait(5)
+    coordinator.submit("AAPL", "b")
+    queued, _ = coordinator.submit("MSFT", "c")
+
+    assert coordinator.cancel("AAPL", "a")
+    assert not shared.cancelled and not shared.attached("a") and shared.attached("b")
+    assert coordinator.cancel("MSFT", "c") and queued.cancelled
+    assert not coordinator.cancel("MSFT", "c")
+
+    workflow.release.set()
+    assert shared.wait(5) and queued.wait(5)
+    coordinator.close()
+    assert shared.error is None and "cancelled" in queued.error
+    assert workflow.runs == ["AAPL"]
@@ -0,0 +1,351 @@
+import asyncio
+
+import pytest
+
+from trader_desk.core.config import AppConfig, CacheConfig, LLMConfig, MetricsConfig, WorkflowConfig
+from trader_desk.core.types import MarketContext
+from trader_desk.core.workflow import TradingWorkflow
+
+
+class StubFetcher:
+    def __init__(self):
+        self.calls = 0
+        self.market_calls = 0
+        self.synced = []
+
+    def sync_price_history(self, tickers):
+        self.synced.append(list(tickers))
+
+    async def async_price_history(self, tickers):
+        self.sync_price_history(tickers)
+
+    def fetch_market_context(self):
+        self.market_calls += 1
+        return MarketContext(index_change_52_weeks=0.1, sector_changes={"Technology": 0.2})
+
+    def fetch_financial_data(self, state):
+        self.calls += 1
+        if state['ticker'] == "BAD":
+            raise RuntimeError("no data for BAD")
+        return {
+            "financial_data": f"data for {state['ticker']}",
+            "messages": [f"Fetched live data for {state['ticker']}"]
+        }
+
+    async def afetch_financial_data(self, state):
+        await asyncio.sleep(0)
+        return self.fetch_financial_data(state)
+
+    def close(self):
+        pass
+
+
+class StubAnalyst:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, state):
+        self.calls += 1
+        current_iter = state.get('iterations', 0) + 1
+        return {
+            "sentiment_analysis": f"draft {current_iter}",
+            "messages": [f"Analysis completed for {state['ticker']}."],
+            "iterations": current_iter
+        }
+
+    async def aanalyze(self, state):
+        await asyncio.sleep(0)
+        return self.analyze(state)
+
+
+class StubCritic:
+    def __init__(self, approve_on: int):
+        self.approve_on = approve_on
+        self.calls = 0
+
+    def review(self, state):
+        self.calls += 1
+        verdict = "APPROVE" if self.calls >= self.approve_on else "FEEDBACK: more data"
+        return {"critic_feedback": verdict, "messages": ["Reviewing Done"]}
+
+    async def areview(self, state):
+        await asyncio.sleep(0)
+        return self.review(state)
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = AppConfig(
+        llm=LLMConfig(bypass_response_cache=True),
+        workflow=WorkflowConfig(max_iterations=3),
+        openai_api_key="test-key"
+    )
+    wf = TradingWorkflow(config)
+    wf.data_fetcher = StubFetcher()
+    wf.analyst = StubAnalyst()
+    wf.critic = StubCritic(approve_on=2)
+    return wf
+
+
+def test_run_executes_graph_once(workflow):
+    events = []
+    final_state = workflow.run("AAPL", verbose=True, on_event=lambda name, _: events.append(name))
+
+    assert workflow.data_fetcher.calls == 1
+    assert workflow.analyst.calls == 2
+    assert workflow.critic.calls == 2
+    assert events == ["Fetcher", "Analyst", "Critic", "Analyst", "Critic"]
+
+    assert final_state["ticker"] == "AAPL"
+    assert final_state["financial_data"] == "data for AAPL"
+    assert final_state["sentiment_analysis"] == "draft 2"
+    assert final_state["critic_feedback"] == "APPROVE"
+    assert final_state["iterations"] == 2
+    assert final_state["messages"] == [
+        "Fetched live data for AAPL",
+        "Analysis completed for AAPL.",
+        "Reviewing Done",
+        "Analysis completed for AAPL.",
+        "Reviewing Done",
+    ]
+
+
+def test_stream_yields_node_updates(workflow):
+    updates = list(workflow.stream("MSFT"))
+
+    assert [name for name, _ in updates] == ["Fetcher", "Analyst", "Critic", "Analyst", "Critic"]
+    assert updates[0][1]["financial_data"] == "data for MSFT"
+    assert workflow.data_fetcher.calls == 1
+
+
+def test_run_batch_continues_after_failure(workflow):
+    results = {r.ticker: r for r in workflow.run_batch(["AAPL", "BAD", "MSFT"], max_concurrency=2)}
+
+    assert set(results) == {"AAPL", "BAD", "MSFT"}
+    assert results["AAPL"].ok and results["MSFT"].ok
+    assert results["MSFT"].state["financial_data"] == "data for MSFT"
+    assert not results["BAD"].ok
+    assert "no data for BAD" in results["BAD"].error
+
+
+def test_batch_fetches_market_context_once_and_shares_it(workflow):
+    results = list(workflow.run_batch(["AAPL", "MSFT", "NVDA"], max_concurrency=2))
+
+    assert workflow.data_fetcher.market_calls == 1
+    contexts = {id(r.state["market_context"]) for r in results}
+    assert len(contexts) == 1 and results[0].state["market_context"].index_change_52_weeks == 0.1
+
+    # Single runs don't fetch it
+    assert workflow.run("AAPL", verbose=False)["market_context"] is None
+    assert workflow.data_fetcher.market_calls == 1
+
+
+def test_batch_syncs_price_history_once_before_the_runs(workflow):
+    list(workflow.run_batch(["AAPL", "MSFT", "NVDA"], max_concurrency=2))
+    assert workflow.data_fetcher.synced == [["AAPL", "MSFT", "NVDA"]]
+
+    # Single runs sync their own ticker
+    workflow.run("AAPL", verbose=False)
+    asyncio.run(workflow.arun("MSFT"))
+    assert workflow.data_fetcher.synced[1:] == [["AAPL"], ["MSFT"]]
+
+
+def test_arun_runs_many_tickers_on_one_loop(workflow):
+    async def run_all():
+        return await asyncio.gather(*(workflow.arun(t) for t in ["AAPL", "MSFT", "NVDA"]))
+
+    states = asyncio.run(run_all())
+
+    assert [s["ticker"] for s in states] == ["AAPL", "MSFT", "NVDA"]
+    assert all(s["critic_feedback"] in ("APPROVE", "FEEDBACK: more data") for s in states)
+    assert workflow.data_fetcher.calls == 3
+
+
+class StructuredFetcher(StubFetcher):
+    price = 100.0
+
+    def fetch_financial_data(self, state):
+        from trader_desk.core.types import FinancialData
+
+        self.calls += 1
+        data = FinancialData(ticker=state['ticker'], current_price=self.price, pe_ratio=20.0)
+        return {"financial_data": data, "messages": ["Fetched"]}
+
+
+def incremental_workflow(monkeypatch, tmp_path, approve_on):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = AppConfig(
+        llm=LLMConfig(bypass_response_cache=True),
+        workflow=WorkflowConfig(
+            max_iterations=2, incremental=True, snapshot_path=str(tmp_path / "snapshots.sqlite")
+        ),
+        openai_api_key="test-key"
+    )
+    wf = TradingWorkflow(config)
+    wf.data_fetcher = StructuredFetcher()
+    wf.analyst = StubAnalyst()
+    wf.critic = StubCritic(approve_on=approve_on)
+    return wf
+
+
+def test_incremental_run_reuses_report_when_nothing_changed(monkeypatch, tmp_path):
+    wf = incremental_workflow(monkeypatch, tmp_path, approve_on=1)
+
+    first = wf.run("AAPL", verbose=False)
+    wf.data_fetcher.price = 100.2
+    second = wf.run("AAPL", verbose=False)
+
+    assert wf.analyst.calls == 1 and wf.critic.calls == 1
+    assert second["sentiment_analysis"] == first["sentiment_analysis"]
+    assert second["critic_feedback"] == "APPROVE"
+    assert second["material_changes"] == []
+
+    wf.data_fetcher.price = 110.0
+    third = wf.run("AAPL", verbose=False)
+
+    assert wf.analyst.calls == 2
+    assert third["previous_analysis"] == first["sentiment_analysis"]
+    assert third["material_changes"][0].startswith("Current Price")
+
+
+def test_unapproved_report_is_not_reused(monkeypatch, tmp_path):
+    wf = incremental_workflow(monkeypatch, tmp_path, approve_on=99)
+
+    wf.run("AAPL", verbose=False)
+    second = wf.run("AAPL", verbose=False)
+
+    assert wf.analyst.calls == 4
+    assert second["material_changes"] is None
+
+
+def test_node_and_run_metrics_are_recorded(workflow):
+    from trader_desk.utils.metrics import InMemorySink, MetricsRecorder
+
+    sink = InMemorySink()
+    workflow.metrics = MetricsRecorder([sink])
+
+    workflow.run("AAPL", verbose=False)
+
+    assert len(sink.values("node_duration_seconds", node="Analyst", ticker="AAPL")) == 2
+    assert [int(i) for i in (e.labels["iteration"] for e in sink.events if e.labels.get("node") == "Critic")] == [1, 2]
+    assert sink.values("refinement_loops", ticker="AAPL") == [2.0]
+
+
+def test_finished_runs_are_stored_with_node_timings(workflow, tmp_path):
+    from trader_desk.core.results import ResultStore
+
+    workflow.results = ResultStore(str(tmp_path / "results.sqlite"), flush_size=10)
+    workflow.run("AAPL", verbose=False)
+    workflow.run("MSFT", verbose=False)
+
+    record = workflow.results.latest("AAPL")
+    assert record.verdict == "APPROVE" and record.iterations == 2
+    assert set(record.timings) == {"Fetcher", "Analyst", "Critic"}
+    assert record.duration_seconds >= sum(record.timings.values()) * 0.99
+    assert len(workflow.results.query(verdict="APPROVE")) == 2
+    workflow.results.close()
+
+
+def stub_workflow(config):
+    """Worker-process factory: a workflow from config with the stub nodes."""
+    wf = TradingWorkflow(config)
+    wf.data_fetcher = StubFetcher()
+    wf.analyst = StubAnalyst()
+    wf.critic = StubCritic(approve_on=1)
+    return wf
+
+
+def test_process_batch_shards_tickers_and_collects_metrics(monkeypatch, tmp_path):
+    from trader_desk.core.parallel import ProcessBatchRunner
+    from trader_desk.utils.metrics import InMemorySink, MetricsRecorder
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = AppConfig(
+        llm=LLMConfig(bypass_response_cache=True),
+        workflow=WorkflowConfig(process_workers=2, shard_size=2),
+        openai_api_key="test-key",
+        cache=CacheConfig(path=str(tmp_path / "cache.sqlite")),
+        metrics=MetricsConfig(sinks=["memory"])
+    )
+    sink = InMemorySink()
+    with ProcessBatchRunner.from_config(config, metrics=MetricsRecorder([sink]), factory=stub_workflow) as runner:
+        results = {r.ticker: r for r in runner.run(["AAPL", "BAD", "MSFT", "NVDA", "AMZN"])}
+        pool = runner._executor
+        # The warm pool is reused by the next batch
+        assert [r.ticker for r in runner.run(["TSLA"])] == ["TSLA"] and runner._executor is pool
+    assert runner._executor is None
+
+    assert runner.shards(["AAPL", "BAD", "MSFT", "NVDA", "AMZN"]) == [["AAPL", "BAD"], ["MSFT", "NVDA"], ["AMZN"]]
+    assert set(results) == {"AAPL", "BAD", "MSFT", "NVDA", "AMZN"}
+    assert not results["BAD"].ok and "no data for BAD" in results["BAD"].error
+    assert results["AMZN"].state["financial_data"] == "data for AMZN"
+    assert len(sink.values("run_duration_seconds")) == 5
+
+
+def test_checkpointed_run_resumes_after_crash_and_replays(monkeypatch, tmp_path):
+    class CrashingCritic(StubCritic):
+        crash = True
+
+        def review(self, state):
+            if self.crash:
+                raise RuntimeError("process died")
+            return super().review(state)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = AppConfig(
+        llm=LLMConfig(bypass_response_cache=True),
+        workflow=WorkflowConfig(checkpointing=True, checkpoint_path=str(tmp_path / "checkpoints.sqlite")),
+        openai_api_key="test-key"
+    )
+    wf = TradingWorkflow(config)
+    wf.data_fetcher = StubFetcher()
+    wf.analyst = StubAnalyst()
+    wf.critic = CrashingCritic(approve_on=1)
+
+    with pytest.raises(RuntimeError):
+        wf.run("AAPL", verbose=False, run_id="run-1")
+
+    wf.critic.crash = False
+    state = wf.resume("run-1")
+
+    assert wf.data_fetcher.calls == 1 and wf.analyst.calls == 1
+    assert state["critic_feedback"] == "APPROVE" and state["run_id"] == "run-1"
+    assert [node for node, _ in wf.replay("run-1")] == ["Fetcher", "Analyst", "Critic"]
+
+    # Finished runs are served from their checkpoints
+    results = list(wf.run_batch(["AAPL", "MSFT"], batch_id="b1"))
+    again = list(wf.run_batch(["AAPL", "MSFT"], batch_id="b1"))
+    assert all(r.ok for r in results + again)
+    assert wf.data_fetcher.calls == 3
+
+    # The async API checkpoints as well
+    assert asyncio.run(wf.arun("NVDA", run_id="run-2"))["critic_feedback"] == "APPROVE"
+    assert [node for node, _ in wf.replay("run-2")] == ["Fetcher", "Analyst", "Critic"]
+    wf.checkpointer.close()
+
+
+def test_run_budget_ends_the_loop_with_the_best_draft(workflow):
+    from trader_desk.core.budget import BudgetExceeded, RunBudget
+
+    workflow.critic = StubCritic(approve_on=3)
+    final_state = workflow.run("AAPL", verbose=False, budget=RunBudget(deadline_seconds=0))
+    assert (final_state["iterations"], final_state["sentiment_analysis"]) == (1, "draft 1")
+    assert final_state["budget_truncated"] == "deadline"
+
+    # A refinement cut short mid-generation keeps the last complete draft
+    analyze = workflow.analyst.analyze
+
+    def analyze_within_budget(state):
+        if state.get("iterations", 0) >= 1:
+            raise BudgetExceeded("tokens", partial="draft 2 (cut")
+        return analyze(state)
+
+    workflow.analyst.analyze = analyze_within_budget
+    workflow.critic = StubCritic(approve_on=3)
+    final_state = workflow.run("AAPL", verbose=False, budget=RunBudget(max_tokens=1000))
+    assert (final_state["sentiment_analysis"], final_state["budget_truncated"]) == ("draft 1", "tokens")
+
+    workflow.analyst.analyze = analyze
+    workflow.critic = StubCritic(approve_on=2)
+    assert workflow.run("AAPL", verbose=False, budget=RunBudget(max_tokens=1000))["budget_truncated"] == ""
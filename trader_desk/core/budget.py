@@ -0,0 +1,160 @@
+"""
+Per-run budgets: a wall-clock deadline, a token limit and a cost limit.
+
+A run activates its :class:`RunBudget` around its execution
+(:func:`spending`); the LLM nodes, the data fetcher and the upstream
+scheduler find it through :func:`current_budget`, charge what they spend
+against it and stop work in flight once it is exceeded. Like the request
+priority and the token stream, the budget travels in a context variable,
+so node signatures do not change.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .config import AppConfig
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a node when the run's budget is used up."""
+
+    def __init__(self, reason: str, partial: str = ""):
+        """
+        Args:
+            reason: Limit that was hit: ``deadline``, ``tokens`` or ``cost``
+            partial: Text generated by the LLM call that was cut short, if any
+        """
+        super().__init__(f"Run budget exceeded: {reason}")
+        self.reason = reason
+        self.partial = partial
+
+
+class RunBudget:
+    """
+    Deadline, token and cost limits of a single run, and what it has spent so far.
+
+    Every limit is optional. Tokens are charged from the usage the provider
+    reports (estimated when it reports none); cost is derived from the token
+    counts and per-1k-token prices. Charges may come from several threads.
+    """
+
+    def __init__(
+        self,
+        deadline_seconds: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        prompt_cost_per_1k: float = 0.0,
+        completion_cost_per_1k: float = 0.0
+    ):
+        """
+        Start the budget; the deadline counts from now.
+
+        Args:
+            deadline_seconds: Wall-clock seconds the run may take
+            max_tokens: Prompt plus completion tokens the run may use
+            max_cost: Cost the run may incur, in the currency of the prices
+            prompt_cost_per_1k: Price of 1000 prompt tokens
+            completion_cost_per_1k: Price of 1000 completion tokens
+        """
+        self.deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.prompt_cost_per_1k = prompt_cost_per_1k
+        self.completion_cost_per_1k = completion_cost_per_1k
+        self.tokens = 0
+        self.cost = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> Optional["RunBudget"]:
+        """
+        Build a fresh budget for one run from configuration.
+
+        Args:
+            config: Application configuration
+
+        Returns:
+            Budget with the configured limits, or None when no limit is set
+        """
+        workflow = config.workflow
+        if workflow.run_deadline is None and workflow.run_max_tokens is None and workflow.run_max_cost is None:
+            return None
+        return cls(
+            deadline_seconds=workflow.run_deadline,
+            max_tokens=workflow.run_max_tokens,
+            max_cost=workflow.run_max_cost,
+            prompt_cost_per_1k=config.llm.prompt_cost_per_1k,
+            completion_cost_per_1k=config.llm.completion_cost_per_1k
+        )
+
+    def cost_of(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Cost of a call with the given token counts."""
+        return (prompt_tokens * self.prompt_cost_per_1k + completion_tokens * self.completion_cost_per_1k) / 1000
+
+    def charge(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """Account for the tokens of a finished (or aborted) LLM call."""
+        with self._lock:
+            self.tokens += prompt_tokens + completion_tokens
+            self.cost += self.cost_of(prompt_tokens, completion_tokens)
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left before the deadline (never negative), or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def exceeded(self, prompt_tokens: int = 0, completion_tokens: int = 0) -> Optional[str]:
+        """
+        Limit that is exceeded, counting a call in progress that is not charged yet.
+
+        Args:
+            prompt_tokens: Prompt tokens of the pending call
+            completion_tokens: Completion tokens generated so far by the pending call
+
+        Returns:
+            ``deadline``, ``tokens`` or ``cost``, or None while within budget
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        if self.max_tokens is not None and self.tokens + prompt_tokens + completion_tokens > self.max_tokens:
+            return "tokens"
+        if self.max_cost is not None and self.cost + self.cost_of(prompt_tokens, completion_tokens) > self.max_cost:
+            return "cost"
+        return None
+
+    def check(self, prompt_tokens: int = 0, completion_tokens: int = 0, partial: str = "") -> None:
+        """
+        Raise BudgetExceeded if a limit is exceeded (see :meth:`exceeded`).
+
+        Args:
+            prompt_tokens: Prompt tokens of the pending call
+            completion_tokens: Completion tokens generated so far by the pending call
+            partial: Text generated so far, carried by the exception
+
+        Raises:
+            BudgetExceeded: If a limit is exceeded
+        """
+        reason = self.exceeded(prompt_tokens, completion_tokens)
+        if reason is not None:
+            raise BudgetExceeded(reason, partial)
+
+
+_budget: "ContextVar[Optional[RunBudget]]" = ContextVar("trader_desk_run_budget", default=None)
+
+
+@contextmanager
+def spending(budget: Optional[RunBudget]) -> Iterator[None]:
+    """Charge the upstream calls made in the enclosed block to ``budget`` (None: unlimited)."""
+    token = _budget.set(budget)
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+def current_budget() -> Optional[RunBudget]:
+    """Budget of the run the current context belongs to, if any."""
+    return _budget.get()
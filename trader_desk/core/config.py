@@ -3,8 +3,8 @@ Configuration management for The Lonely Trader Desk.
 """
 
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -13,6 +13,13 @@ class LLMConfig:
     model: str = "gpt-4-turbo"
     temperature: float = 0.0
     max_tokens: Optional[int] = None
+    prompt_token_budget: Optional[int] = 3000
+    bypass_response_cache: bool = False
+    response_cache_path: str = os.path.join(".trader_desk", "llm_cache.sqlite")
+    response_cache_max_entries: int = 5_000
+    response_cache_ttl: float = 7 * 24 * 60 * 60
+    prompt_cost_per_1k: float = 0.01  # USD, charged against WorkflowConfig.run_max_cost
+    completion_cost_per_1k: float = 0.03
 
 
 @dataclass
@@ -21,6 +28,89 @@ class WorkflowConfig:
     max_iterations: int = 3
     enable_verbose_logging: bool = True
     enable_result_saving: bool = False
+    results_path: str = os.path.join(".trader_desk", "results.sqlite")
+    results_flush_size: int = 32
+    results_flush_interval: float = 5.0
+    max_concurrency: int = 8
+    io_workers: int = 32
+    process_workers: int = 0  # batch worker processes; 0 or 1 runs batches in this process
+    shard_size: int = 8  # tickers handed to a worker process at a time
+    incremental: bool = False
+    snapshot_path: str = os.path.join(".trader_desk", "snapshots.sqlite")
+    snapshot_ttl: float = 24 * 60 * 60
+    price_change_threshold: float = 0.01
+    pe_change_threshold: float = 0.05
+    new_headlines_threshold: int = 1
+    checkpointing: bool = False
+    checkpoint_path: str = os.path.join(".trader_desk", "checkpoints.sqlite")
+    critic_precheck: bool = True
+    shared_market_context: bool = True  # fetch market-wide context once per batch
+    run_deadline: Optional[float] = None  # seconds per run
+    run_max_tokens: Optional[int] = None  # LLM tokens per run
+    run_max_cost: Optional[float] = None  # USD per run
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for the upstream market data cache."""
+    backend: str = "memory"  # "memory", "sqlite" or "none"
+    path: str = os.path.join(".trader_desk", "cache.sqlite")
+    max_entries: int = 10_000
+    ttls: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class PriceHistoryConfig:
+    """Configuration for the local OHLCV history store."""
+    enabled: bool = False
+    path: str = os.path.join(".trader_desk", "prices")
+    backfill: Dict[str, str] = field(default_factory=dict)  # interval -> yfinance period
+    chunk_size: int = 200
+
+
+@dataclass
+class MetricsConfig:
+    """Configuration for metrics export."""
+    sinks: List[str] = field(default_factory=list)  # any of "memory", "jsonl", "prometheus"
+    jsonl_path: str = os.path.join(".trader_desk", "metrics.jsonl")
+    prometheus_port: Optional[int] = None
+
+
+@dataclass
+class ProviderLimit:
+    """Rate limit of one upstream provider."""
+    requests_per_second: float
+    burst: Optional[float] = None  # defaults to one second's worth of requests
+    tokens_per_minute: Optional[float] = None  # LLM providers only
+
+
+def _default_provider_limits() -> Dict[str, ProviderLimit]:
+    return {
+        "yfinance": ProviderLimit(requests_per_second=5.0, burst=10.0),
+        "tavily": ProviderLimit(requests_per_second=2.0, burst=4.0),
+        "openai": ProviderLimit(requests_per_second=5.0, burst=5.0, tokens_per_minute=90_000),
+    }
+
+
+@dataclass
+class SchedulerConfig:
+    """Configuration for upstream rate limiting, retries and circuit breaking."""
+    limits: Dict[str, ProviderLimit] = field(default_factory=_default_provider_limits)
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+@dataclass
+class ServerConfig:
+    """Configuration for the long-running ``trader-desk serve`` mode."""
+    host: str = "127.0.0.1"
+    port: int = 8765
+    workers: Optional[int] = None  # concurrent runs, defaults to workflow.max_concurrency
+    max_queue: int = 64
+    request_timeout: float = 300.0
 
 
 @dataclass
@@ -29,6 +119,11 @@ class AppConfig:
     llm: LLMConfig
     workflow: WorkflowConfig
     openai_api_key: str
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    prices: PriceHistoryConfig = field(default_factory=PriceHistoryConfig)
     
     @classmethod
     def from_environment(cls) -> "AppConfig":
@@ -49,12 +144,112 @@ class AppConfig:
             llm=LLMConfig(
                 model=os.getenv("LLM_MODEL", "gpt-4-turbo"),
                 temperature=float(os.getenv("LLM_TEMPERATURE", "0.0")),
-                max_tokens=int(os.getenv("LLM_MAX_TOKENS")) if os.getenv("LLM_MAX_TOKENS") else None
+                max_tokens=int(os.getenv("LLM_MAX_TOKENS")) if os.getenv("LLM_MAX_TOKENS") else None,
+                prompt_token_budget=int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "3000")) or None,
+                bypass_response_cache=os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true",
+                response_cache_path=os.getenv(
+                    "LLM_CACHE_PATH", os.path.join(".trader_desk", "llm_cache.sqlite")
+                ),
+                response_cache_max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+                response_cache_ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 60 * 60))),
+                prompt_cost_per_1k=float(os.getenv("LLM_PROMPT_COST_PER_1K", "0.01")),
+                completion_cost_per_1k=float(os.getenv("LLM_COMPLETION_COST_PER_1K", "0.03"))
             ),
             workflow=WorkflowConfig(
                 max_iterations=int(os.getenv("MAX_ITERATIONS", "3")),
                 enable_verbose_logging=os.getenv("VERBOSE_LOGGING", "true").lower() == "true",
-                enable_result_saving=os.getenv("SAVE_RESULTS", "false").lower() == "true"
+                enable_result_saving=os.getenv("SAVE_RESULTS", "false").lower() == "true",
+                results_path=os.getenv(
+                    "RESULTS_PATH", os.path.join(".trader_desk", "results.sqlite")
+                ),
+                results_flush_size=int(os.getenv("RESULTS_FLUSH_SIZE", "32")),
+                results_flush_interval=float(os.getenv("RESULTS_FLUSH_INTERVAL", "5")),
+                max_concurrency=int(os.getenv("MAX_CONCURRENCY", "8")),
+                io_workers=int(os.getenv("IO_WORKERS", "32")),
+                process_workers=int(os.getenv("BATCH_PROCESSES", "0")),
+                shard_size=int(os.getenv("BATCH_SHARD_SIZE", "8")),
+                incremental=os.getenv("INCREMENTAL", "false").lower() == "true",
+                snapshot_path=os.getenv(
+                    "SNAPSHOT_PATH", os.path.join(".trader_desk", "snapshots.sqlite")
+                ),
+                snapshot_ttl=float(os.getenv("SNAPSHOT_TTL", str(24 * 60 * 60))),
+                price_change_threshold=float(os.getenv("PRICE_CHANGE_THRESHOLD", "0.01")),
+                pe_change_threshold=float(os.getenv("PE_CHANGE_THRESHOLD", "0.05")),
+                new_headlines_threshold=int(os.getenv("NEW_HEADLINES_THRESHOLD", "1")),
+                checkpointing=os.getenv("CHECKPOINTING", "false").lower() == "true",
+                checkpoint_path=os.getenv(
+                    "CHECKPOINT_PATH", os.path.join(".trader_desk", "checkpoints.sqlite")
+                ),
+                critic_precheck=os.getenv("CRITIC_PRECHECK", "true").lower() == "true",
+                shared_market_context=os.getenv("SHARED_MARKET_CONTEXT", "true").lower() == "true",
+                run_deadline=float(os.getenv("RUN_DEADLINE")) if os.getenv("RUN_DEADLINE") else None,
+                run_max_tokens=int(os.getenv("RUN_MAX_TOKENS")) if os.getenv("RUN_MAX_TOKENS") else None,
+                run_max_cost=float(os.getenv("RUN_MAX_COST")) if os.getenv("RUN_MAX_COST") else None
             ),
-            openai_api_key=openai_api_key
-        )
\ No newline at end of file
+            openai_api_key=openai_api_key,
+            cache=CacheConfig(
+                backend=os.getenv("CACHE_BACKEND", "memory").lower(),
+                path=os.getenv("CACHE_PATH", os.path.join(".trader_desk", "cache.sqlite")),
+                max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+                ttls={
+                    kind: float(os.environ[f"CACHE_TTL_{kind.upper()}"])
+                    for kind in (
+                        "fundamentals", "price_targets", "price", "news", "history",
+                        "market_performance", "market_news"
+                    )
+                    if os.getenv(f"CACHE_TTL_{kind.upper()}")
+                }
+            ),
+            metrics=MetricsConfig(
+                sinks=[s.strip() for s in os.getenv("METRICS_SINKS", "").split(",") if s.strip()],
+                jsonl_path=os.getenv("METRICS_JSONL_PATH", os.path.join(".trader_desk", "metrics.jsonl")),
+                prometheus_port=int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+            ),
+            server=ServerConfig(
+                host=os.getenv("SERVER_HOST", "127.0.0.1"),
+                port=int(os.getenv("SERVER_PORT", "8765")),
+                workers=int(os.getenv("SERVER_WORKERS")) if os.getenv("SERVER_WORKERS") else None,
+                max_queue=int(os.getenv("SERVER_MAX_QUEUE", "64")),
+                request_timeout=float(os.getenv("SERVER_REQUEST_TIMEOUT", "300"))
+            ),
+            scheduler=SchedulerConfig(
+                limits=_provider_limits_from_environment(),
+                max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "4")),
+                base_delay=float(os.getenv("RETRY_BASE_DELAY", "0.5")),
+                max_delay=float(os.getenv("RETRY_MAX_DELAY", "20")),
+                failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+            ),
+            prices=PriceHistoryConfig(
+                enabled=os.getenv("PRICE_HISTORY", "false").lower() == "true",
+                path=os.getenv("PRICE_HISTORY_PATH", os.path.join(".trader_desk", "prices")),
+                backfill={
+                    interval.strip(): period.strip()
+                    for interval, _, period in (
+                        item.partition("=") for item in os.getenv("PRICE_HISTORY_BACKFILL", "").split(",")
+                    )
+                    if period.strip()
+                },
+                chunk_size=int(os.getenv("PRICE_HISTORY_CHUNK_SIZE", "200"))
+            )
+        )
+
+
+def _provider_limits_from_environment() -> Dict[str, ProviderLimit]:
+    """
+    Default provider limits, overridden by ``RATE_LIMIT_<PROVIDER>`` (requests/s)
+    and ``OPENAI_TOKENS_PER_MINUTE``. A rate of 0 disables throttling for a provider.
+    """
+    limits = _default_provider_limits()
+    for provider in list(limits):
+        rate = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+        if rate is None:
+            continue
+        if float(rate) <= 0:
+            del limits[provider]
+        else:
+            limits[provider].requests_per_second = float(rate)
+            limits[provider].burst = max(1.0, float(rate))
+    if os.getenv("OPENAI_TOKENS_PER_MINUTE") and "openai" in limits:
+        limits["openai"].tokens_per_minute = float(os.environ["OPENAI_TOKENS_PER_MINUTE"]) or None
+    return limits
\ No newline at end of file
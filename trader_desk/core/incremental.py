@@ -0,0 +1,149 @@
+"""
+Incremental re-analysis: reuse or update a ticker's previous report when its inputs barely moved.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .config import WorkflowConfig
+from .types import FinancialData
+from ..utils.cache import CacheBackend, SQLiteBackend, TTLCache
+
+
+@dataclass
+class MaterialityThresholds:
+    """
+    Minimum input changes that warrant a new analysis.
+
+    Attributes:
+        price_change: Relative price move, as a fraction (0.01 == 1%)
+        pe_change: Relative forward P/E move, as a fraction
+        new_headlines: Number of previously unseen headlines
+    """
+    price_change: float = 0.01
+    pe_change: float = 0.05
+    new_headlines: int = 1
+
+
+@dataclass
+class AnalysisSnapshot:
+    """
+    Inputs and outcome of the last completed analysis of a ticker.
+
+    Attributes:
+        ticker: Stock symbol
+        financial_data: Structured inputs the analysis was based on
+        sentiment_analysis: Final analyst report
+        critic_feedback: Final critic verdict
+        created_at: ``time.time()`` timestamp of the analysis
+    """
+    ticker: str
+    financial_data: FinancialData
+    sentiment_analysis: str
+    critic_feedback: str
+    created_at: float
+
+
+def _relative_change(previous: Optional[float], current: Optional[float]) -> Optional[float]:
+    """Relative change between two optional values; None when it cannot be computed."""
+    if previous is None or current is None or previous == 0:
+        return None
+    return abs(current - previous) / abs(previous)
+
+
+def material_changes(
+    previous: FinancialData,
+    current: FinancialData,
+    thresholds: MaterialityThresholds
+) -> List[str]:
+    """
+    Describe the material differences between two sets of inputs.
+
+    A value that appears or disappears counts as a material change.
+
+    Args:
+        previous: Inputs of the last analysis
+        current: Freshly fetched inputs
+        thresholds: Materiality thresholds
+
+    Returns:
+        Human-readable change descriptions, empty when nothing material changed
+    """
+    changes = []
+
+    for label, attr, threshold in (
+        ("Current Price", "current_price", thresholds.price_change),
+        ("Forward P/E Ratio", "pe_ratio", thresholds.pe_change),
+    ):
+        before, after = getattr(previous, attr), getattr(current, attr)
+        if (before is None) != (after is None):
+            changes.append(f"{label}: {before} -> {after}")
+            continue
+        delta = _relative_change(before, after)
+        if delta is not None and delta >= threshold:
+            changes.append(f"{label}: {before:,.2f} -> {after:,.2f} ({(after - before) / before:+.2%})")
+
+    seen = {item.title for item in previous.news}
+    fresh = [item.title for item in current.news if item.title not in seen]
+    if fresh and len(fresh) >= thresholds.new_headlines:
+        changes.extend(f"New headline: {title}" for title in fresh)
+
+    return changes
+
+
+class SnapshotStore:
+    """
+    Per-ticker store of the last completed analysis.
+    """
+
+    KIND = "snapshot"
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = 24 * 60 * 60):
+        """
+        Initialize the store.
+
+        Args:
+            backend: Storage backend, defaults to an in-memory LRU
+            ttl: How long a snapshot may be reused, in seconds
+        """
+        self.cache = TTLCache(backend=backend, ttls={self.KIND: ttl}, name=self.KIND)
+
+    @classmethod
+    def from_config(cls, config: WorkflowConfig) -> Optional["SnapshotStore"]:
+        """
+        Build a snapshot store from configuration.
+
+        Args:
+            config: Workflow configuration
+
+        Returns:
+            Configured store, or None when incremental mode is disabled
+        """
+        if not config.incremental:
+            return None
+        return cls(SQLiteBackend(config.snapshot_path), ttl=config.snapshot_ttl)
+
+    def get(self, ticker: str) -> Optional[AnalysisSnapshot]:
+        """Return the last snapshot for a ticker, if still fresh."""
+        return self.cache.get(self.KIND, ticker)
+
+    def save(
+        self,
+        ticker: str,
+        financial_data: FinancialData,
+        sentiment_analysis: str,
+        critic_feedback: str
+    ) -> None:
+        """Record the outcome of a completed analysis."""
+        self.cache.set(
+            self.KIND,
+            ticker,
+            AnalysisSnapshot(
+                ticker=ticker,
+                financial_data=financial_data,
+                sentiment_analysis=sentiment_analysis,
+                critic_feedback=critic_feedback,
+                created_at=time.time()
+            )
+        )
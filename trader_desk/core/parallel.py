@@ -0,0 +1,268 @@
+"""
+Multi-process batch execution: shards a ticker list across worker processes.
+
+Each worker process builds one warm TradingWorkflow when it starts and runs
+its shards through the usual thread-pooled batch path, so LLM and upstream
+I/O still overlap inside every process while CPU-bound work (parsing, data
+shaping, indicators, report checks) runs on as many cores as there are
+workers. Results and metrics come back to the parent after every shard.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from multiprocessing.util import Finalize
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import AppConfig, ProviderLimit
+from .types import BatchResult, MarketContext
+from ..utils.metrics import InMemorySink, MetricEvent, MetricsRecorder
+
+if TYPE_CHECKING:
+    from .workflow import TradingWorkflow
+
+logger = logging.getLogger(__name__)
+
+WorkflowFactory = Callable[[AppConfig], "TradingWorkflow"]
+
+# Workflow of the current worker process, built by _init_worker
+_worker: Optional["TradingWorkflow"] = None
+
+
+def _default_factory(config: AppConfig) -> "TradingWorkflow":
+    from .workflow import TradingWorkflow
+    return TradingWorkflow(config)
+
+
+def worker_config(config: AppConfig, workers: int) -> AppConfig:
+    """
+    Configuration of one worker process out of ``workers``.
+
+    Workers run their shards in-process, share an on-disk market data cache
+    (the LLM response cache is on disk already), record metrics in memory
+    for the parent to collect, and each get an equal share of every
+    provider's rate limit so the pool as a whole stays within it. The market
+    context is fetched once by the parent and handed to every shard.
+
+    Args:
+        config: Configuration of the parent process
+        workers: Number of worker processes
+
+    Returns:
+        Configuration for each worker
+    """
+    limits = {
+        name: ProviderLimit(
+            requests_per_second=limit.requests_per_second / workers,
+            burst=max(1.0, (limit.burst or max(1.0, limit.requests_per_second)) / workers),
+            tokens_per_minute=None if limit.tokens_per_minute is None else limit.tokens_per_minute / workers
+        )
+        for name, limit in config.scheduler.limits.items()
+    }
+    cache = config.cache
+    if cache.backend == "memory":
+        cache = replace(cache, backend="sqlite")
+    return replace(
+        config,
+        workflow=replace(config.workflow, process_workers=0, shared_market_context=False),
+        cache=cache,
+        metrics=replace(config.metrics, sinks=["memory"] if config.metrics.sinks else [], prometheus_port=None),
+        scheduler=replace(config.scheduler, limits=limits)
+    )
+
+
+def _init_worker(config: AppConfig, factory: WorkflowFactory) -> None:
+    """Build the worker's workflow once; it is closed when the process exits."""
+    global _worker
+    _worker = factory(config)
+    Finalize(_worker, _worker.close, exitpriority=10)
+
+
+def _run_shard(
+    tickers: Sequence[str],
+    max_concurrency: Optional[int],
+    batch_id: Optional[str],
+    market_context: Optional[MarketContext] = None
+) -> Tuple[List[BatchResult], List[MetricEvent]]:
+    """Analyze one shard in a worker process and hand back its results and metrics."""
+    # The parent synced the batch's price history before sharding it
+    results = list(_worker.run_batch(
+        tickers, max_concurrency=max_concurrency, batch_id=batch_id, market_context=market_context,
+        sync_prices=False
+    ))
+    if _worker.results is not None:
+        _worker.results.flush()
+    sink = _worker.metrics.sink(InMemorySink)
+    return results, sink.drain() if sink is not None else []
+
+
+class ProcessBatchRunner:
+    """
+    Runs batches on a pool of worker processes, one warm workflow per process.
+
+    The pool is started by the first batch and kept for later ones, so worker
+    start-up (spawning, imports, building the workflow) is paid once; release
+    it with :meth:`close`, or use the runner as a context manager.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        workers: int,
+        shard_size: int = 8,
+        metrics: Optional[MetricsRecorder] = None,
+        factory: Optional[WorkflowFactory] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            config: Application configuration of the parent process
+            workers: Number of worker processes
+            shard_size: Tickers handed to a worker at a time; small shards balance
+                load and stream results sooner, large ones cost less IPC
+            metrics: Recorder that receives the workers' metric events
+            factory: Builds a worker's workflow from its configuration; must be
+                picklable (a module-level function), defaults to TradingWorkflow
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.config = config
+        self.workers = workers
+        self.shard_size = max(1, shard_size)
+        self.metrics = metrics or MetricsRecorder()
+        self.factory = factory or _default_factory
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: AppConfig,
+        metrics: Optional[MetricsRecorder] = None,
+        factory: Optional[WorkflowFactory] = None
+    ) -> "ProcessBatchRunner":
+        """
+        Build a runner from configuration.
+
+        Args:
+            config: Application configuration
+            metrics: Recorder that receives the workers' metric events
+            factory: Builds a worker's workflow from its configuration
+
+        Returns:
+            Runner with ``workflow.process_workers`` workers and ``workflow.shard_size`` shards
+        """
+        return cls(
+            config,
+            workers=config.workflow.process_workers,
+            shard_size=config.workflow.shard_size,
+            metrics=metrics,
+            factory=factory
+        )
+
+    def shards(self, tickers: Iterable[str]) -> List[List[str]]:
+        """Split tickers into consecutive shards of at most ``shard_size``."""
+        tickers = list(tickers)
+        return [tickers[i:i + self.shard_size] for i in range(0, len(tickers), self.shard_size)]
+
+    def run(
+        self,
+        tickers: Iterable[str],
+        max_concurrency: Optional[int] = None,
+        batch_id: Optional[str] = None,
+        market_context: Optional[MarketContext] = None
+    ) -> Iterator[BatchResult]:
+        """
+        Analyze tickers on the worker pool, yielding results as each shard finishes.
+
+        A failing ticker is reported through its BatchResult. A worker that
+        dies fails the shards in flight at that moment; the pool is restarted
+        for the remaining shards. Shards not yet started when the caller stops
+        iterating are cancelled; the pool stays up for the next batch.
+
+        Args:
+            tickers: Stock symbols to analyze
+            max_concurrency: Concurrent runs inside each worker, defaults to config
+            batch_id: Checkpoint prefix of the batch
+            market_context: Market context shared by every shard
+
+        Yields:
+            BatchResult for every ticker, in shard completion order
+        """
+        remaining = deque(self.shards(tickers))
+        pending: Dict[Future, List[str]] = {}
+        try:
+            while remaining or pending:
+                pool = self._pool()
+                # One shard in flight per worker, so a dead worker only fails the shards it was running
+                while remaining and len(pending) < self.workers:
+                    shard = remaining.popleft()
+                    pending[pool.submit(_run_shard, shard, max_concurrency, batch_id, market_context)] = shard
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    shard = pending.pop(future)
+                    try:
+                        results, events = future.result()
+                    except BrokenProcessPool as e:
+                        broken = True
+                        results, events = self._failed(shard, f"worker process died: {e}"), []
+                    except Exception as e:
+                        results, events = self._failed(shard, str(e)), []
+                    for event in events:
+                        self.metrics.emit(event)
+                    yield from results
+
+                if broken:
+                    logger.error("Worker process died, restarting the pool")
+                    for shard in pending.values():
+                        yield from self._failed(shard, "worker process died")
+                    pending = {}
+                    self._discard(pool)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """The worker pool, started on first use; each process builds its workflow once, on startup."""
+        with self._lock:
+            if self._executor is None:
+                # Spawned rather than forked: the parent holds thread pools, sockets and SQLite connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(worker_config(self.config, self.workers), self.factory)
+                )
+            return self._executor
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """Shut down a broken pool; the next batch (or shard) starts a fresh one."""
+        with self._lock:
+            if self._executor is pool:
+                self._executor = None
+        # A broken pool fails its pending shards itself, nothing is left to cancel
+        pool.shutdown(wait=True)
+
+    def close(self) -> None:
+        """Shut down the worker pool; batches cancel their own unstarted shards when they stop."""
+        with self._lock:
+            pool, self._executor = self._executor, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ProcessBatchRunner":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @staticmethod
+    def _failed(shard: Sequence[str], error: str) -> List[BatchResult]:
+        return [BatchResult(ticker=ticker, error=error) for ticker in shard]
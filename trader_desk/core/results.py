@@ -0,0 +1,341 @@
+"""
+Queryable store of completed analyses, replacing one JSON file per run.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import WorkflowConfig
+from .types import AgentState
+from ..nodes.prompting import is_approved
+
+# Numeric inputs copied out of FinancialData into their own indexed-table columns
+METRIC_COLUMNS = (
+    "current_price",
+    "market_cap",
+    "pe_ratio",
+    "change_52_weeks",
+    "market_change_52_weeks",
+    "risk_score",
+    "volatility_score",
+    "debt_to_equity",
+)
+
+
+def verdict_of(critic_feedback: str) -> str:
+    """Normalized critic verdict of a finished run: ``APPROVE`` or ``REVISE``."""
+    return "APPROVE" if is_approved(critic_feedback) else "REVISE"
+
+
+@dataclass
+class RunRecord:
+    """
+    A completed analysis as stored in the results database.
+
+    Attributes:
+        ticker: Stock symbol
+        created_at: ``time.time()`` timestamp of the end of the run
+        verdict: ``APPROVE``, ``REVISE`` (critic never approved) or ``TRUNCATED``
+            (run budget ran out before the critic approved)
+        iterations: Analyst/critic rounds
+        duration_seconds: Wall time of the run
+        sentiment_analysis: Final analyst report
+        critic_feedback: Final critic feedback
+        run_id: Checkpoint id of the run, empty when checkpointing was off
+        metrics: Structured input metrics (see METRIC_COLUMNS); None when unavailable
+        timings: Seconds spent per workflow node
+        financial_data: Full structured inputs as a plain dictionary
+    """
+    ticker: str
+    created_at: float
+    verdict: str
+    iterations: int
+    duration_seconds: float
+    sentiment_analysis: str
+    critic_feedback: str
+    run_id: str = ""
+    metrics: Dict[str, Optional[float]] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    financial_data: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_state(
+        cls,
+        state: AgentState,
+        duration_seconds: float,
+        timings: Optional[Dict[str, float]] = None
+    ) -> "RunRecord":
+        """
+        Build a record from a finished workflow state.
+
+        Args:
+            state: Final workflow state
+            duration_seconds: Wall time of the run
+            timings: Seconds spent per workflow node
+
+        Returns:
+            Record ready to be written
+        """
+        data = state.get("financial_data")
+        as_dict = data.as_dict() if hasattr(data, "as_dict") else None
+        return cls(
+            ticker=state["ticker"],
+            created_at=time.time(),
+            verdict="TRUNCATED" if state.get("budget_truncated") else verdict_of(state.get("critic_feedback", "")),
+            iterations=state.get("iterations", 0),
+            duration_seconds=duration_seconds,
+            sentiment_analysis=state.get("sentiment_analysis", ""),
+            critic_feedback=state.get("critic_feedback", ""),
+            run_id=state.get("run_id", ""),
+            metrics={name: as_dict.get(name) for name in METRIC_COLUMNS} if as_dict else {},
+            timings=dict(timings or {}),
+            financial_data=as_dict
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain-dictionary view, suitable for JSON serialization."""
+        return {
+            "ticker": self.ticker,
+            "created_at": self.created_at,
+            "verdict": self.verdict,
+            "iterations": self.iterations,
+            "duration_seconds": self.duration_seconds,
+            "analysis": self.sentiment_analysis,
+            "critic_feedback": self.critic_feedback,
+            "run_id": self.run_id,
+            "metrics": self.metrics,
+            "timings": self.timings,
+            "financial_data": self.financial_data,
+        }
+
+
+_COLUMNS = (
+    "ticker", "created_at", "verdict", "iterations", "duration_seconds",
+    "sentiment_analysis", "critic_feedback", "run_id",
+) + METRIC_COLUMNS + ("timings", "financial_data")
+
+
+class ResultStore:
+    """
+    SQLite table of completed runs, indexed by ticker, verdict and time.
+
+    Writes are buffered and committed in batches, either when ``flush_size``
+    records are pending or when the oldest pending record is ``flush_interval``
+    seconds old; a background timer enforces the interval even when no more
+    records arrive. Queries flush first, so they always see every record
+    added through this store. Several processes may share the file.
+    """
+
+    def __init__(self, path: str, flush_size: int = 32, flush_interval: float = 5.0):
+        """
+        Open (and create if needed) the results database.
+
+        Args:
+            path: SQLite database file
+            flush_size: Number of pending records that triggers a write
+            flush_interval: Maximum age of a pending record, in seconds
+        """
+        self.path = path
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._pending: List[RunRecord] = []
+        self._oldest_pending = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        metric_columns = ",\n".join(f"{name} REAL" for name in METRIC_COLUMNS)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS runs (
+                       id INTEGER PRIMARY KEY,
+                       ticker TEXT NOT NULL,
+                       created_at REAL NOT NULL,
+                       verdict TEXT NOT NULL,
+                       iterations INTEGER NOT NULL,
+                       duration_seconds REAL NOT NULL,
+                       sentiment_analysis TEXT NOT NULL,
+                       critic_feedback TEXT NOT NULL,
+                       run_id TEXT NOT NULL,
+                       {metric_columns},
+                       timings TEXT NOT NULL,
+                       financial_data TEXT
+                   )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS runs_ticker_created_at ON runs (ticker, created_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS runs_verdict_created_at ON runs (verdict, created_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at)"
+            )
+
+    @classmethod
+    def from_config(cls, config: WorkflowConfig) -> Optional["ResultStore"]:
+        """
+        Build a result store from configuration.
+
+        Args:
+            config: Workflow configuration
+
+        Returns:
+            Configured store, or None when result saving is disabled
+        """
+        if not config.enable_result_saving:
+            return None
+        return cls(
+            config.results_path,
+            flush_size=config.results_flush_size,
+            flush_interval=config.results_flush_interval
+        )
+
+    def add(self, record: RunRecord) -> None:
+        """Queue a record, writing the pending batch if it is due."""
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            self._pending.append(record)
+            due = (
+                len(self._pending) >= self.flush_size
+                or time.monotonic() - self._oldest_pending >= self.flush_interval
+            )
+            if due:
+                self._flush_locked()
+            elif self._timer is None:
+                self._start_timer(self.flush_interval)
+
+    def _start_timer(self, delay: float) -> None:
+        # Callers hold self._lock
+        self._timer = threading.Timer(delay, self._flush_expired)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_expired(self) -> None:
+        """Timer callback: write the pending batch once its oldest record reaches flush_interval."""
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                # Cancelled while waiting for the lock: its batch was already written
+                return
+            self._timer = None
+            age = time.monotonic() - self._oldest_pending
+            if age >= self.flush_interval:
+                self._flush_locked()
+            elif self._pending:
+                self._start_timer(self.flush_interval - age)
+
+    def flush(self) -> int:
+        """Write every pending record, returning how many were written."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return 0
+        rows = [self._to_row(record) for record in self._pending]
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({placeholders})", rows
+            )
+        written = len(self._pending)
+        self._pending = []
+        return written
+
+    @staticmethod
+    def _to_row(record: RunRecord) -> Tuple[Any, ...]:
+        return (
+            record.ticker,
+            record.created_at,
+            record.verdict,
+            record.iterations,
+            record.duration_seconds,
+            record.sentiment_analysis,
+            record.critic_feedback,
+            record.run_id,
+            *(record.metrics.get(name) for name in METRIC_COLUMNS),
+            json.dumps(record.timings),
+            None if record.financial_data is None else json.dumps(record.financial_data, default=str),
+        )
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> RunRecord:
+        return RunRecord(
+            ticker=row["ticker"],
+            created_at=row["created_at"],
+            verdict=row["verdict"],
+            iterations=row["iterations"],
+            duration_seconds=row["duration_seconds"],
+            sentiment_analysis=row["sentiment_analysis"],
+            critic_feedback=row["critic_feedback"],
+            run_id=row["run_id"],
+            metrics={name: row[name] for name in METRIC_COLUMNS},
+            timings=json.loads(row["timings"]),
+            financial_data=None if row["financial_data"] is None else json.loads(row["financial_data"])
+        )
+
+    def query(
+        self,
+        ticker: Optional[str] = None,
+        verdict: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = 100
+    ) -> List[RunRecord]:
+        """
+        Find completed runs, newest first.
+
+        Args:
+            ticker: Only runs for this stock symbol
+            verdict: Only runs with this verdict (``APPROVE``, ``REVISE`` or ``TRUNCATED``)
+            since: Only runs that finished at or after this ``time.time()`` timestamp
+            until: Only runs that finished before this ``time.time()`` timestamp
+            limit: Maximum number of records, None for all
+
+        Returns:
+            Matching records
+        """
+        clauses, params = [], []
+        for clause, value in (
+            ("ticker = ?", ticker),
+            ("verdict = ?", verdict.upper() if verdict else None),
+            ("created_at >= ?", since),
+            ("created_at < ?", until),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def latest(self, ticker: str) -> Optional[RunRecord]:
+        """Most recent completed run for a ticker, if any."""
+        records = self.query(ticker=ticker, limit=1)
+        return records[0] if records else None
+
+    def close(self) -> None:
+        """Write pending records and close the database."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
@@ -1,42 +1,318 @@
-from typing import TypedDict, Annotated, List
+from dataclasses import dataclass, field, asdict
+from functools import cached_property
+from typing import TypedDict, Annotated, List, Dict, Any, Callable, Optional, Tuple
 import operator
 
 
+@dataclass(frozen=True)
+class NewsItem:
+    """
+    A single news headline about a ticker.
+    
+    Attributes:
+        title: Headline
+        snippet: Short excerpt of the article
+        url: Link to the article, if known
+    """
+    title: str
+    snippet: str = ""
+    url: str = ""
+
+
+def _format_number(value: Optional[float], fmt: str = "{:,.2f}", prefix: str = "", suffix: str = "") -> str:
+    """Render an optional number for prompt text."""
+    if value is None:
+        return "No data"
+    return prefix + fmt.format(value) + suffix
+
+
+# Prompt label of each price-history feature, and whether it is a fraction shown as a percentage
+PRICE_FEATURE_LABELS: Dict[str, Tuple[str, bool]] = {
+    "return_1m": ("1 month return", True),
+    "return_3m": ("3 month return", True),
+    "return_6m": ("6 month return", True),
+    "return_1y": ("1 year return", True),
+    "high_52w": ("52 week high", False),
+    "low_52w": ("52 week low", False),
+    "off_high_52w": ("Distance from 52 week high", True),
+    "avg_volume_3m": ("3 month average volume", False),
+}
+
+# Prompt label of each technical indicator, in the same format
+TECHNICAL_LABELS: Dict[str, Tuple[str, bool]] = {
+    "sma_50": ("50 day moving average", False),
+    "sma_200": ("200 day moving average", False),
+    "price_vs_sma_50": ("Price vs 50 day average", True),
+    "price_vs_sma_200": ("Price vs 200 day average", True),
+    "rsi_14": ("RSI (14)", False),
+    "macd": ("MACD (12, 26)", False),
+    "macd_signal": ("MACD signal (9)", False),
+    "macd_histogram": ("MACD histogram", False),
+    "atr_14": ("ATR (14)", False),
+    "atr_pct": ("ATR as share of price", True),
+    "volatility_20d": ("20 day realized volatility (annualized)", True),
+    "volatility_1y": ("1 year realized volatility (annualized)", True),
+    "drawdown": ("Drawdown from 1 year peak", True),
+    "max_drawdown_1y": ("1 year maximum drawdown", True),
+}
+
+
+def _format_feature(name: str, value: float, labels: Dict[str, Tuple[str, bool]] = PRICE_FEATURE_LABELS) -> str:
+    """Render one price-history feature or technical indicator for prompt text."""
+    label, is_fraction = labels.get(name, (name, False))
+    if is_fraction:
+        return f"{label}: {_format_number(value * 100, '{:.2f}', suffix='%')}"
+    return f"{label}: {_format_number(value)}"
+
+
+@dataclass(frozen=True)
+class FinancialData:
+    """
+    Structured financial data extracted from APIs.
+    
+    Numeric fields stay numeric (None when the upstream source had no value);
+    the prompt text is rendered lazily by :attr:`prompt_text` and memoized.
+    
+    Attributes:
+        ticker: Stock symbol the data belongs to
+        current_price: Latest traded price
+        market_cap: Market capitalization
+        pe_ratio: Forward P/E ratio
+        business_summary: Company description
+        analyst_price_target: Analyst price targets (current/low/high/mean/median)
+        change_52_weeks: 52-week price change as a fraction (0.12 == 12%)
+        market_change_52_weeks: 52-week S&P 500 change as a fraction
+        risk_score: Yahoo Finance overall risk score (1-10)
+        volatility_score: Beta
+        debt_to_equity: Debt to equity ratio
+        news: Latest headlines
+        missing_sources: Upstream sources that failed or timed out
+        price_history: Features computed from stored daily bars (see PRICE_FEATURE_LABELS)
+        technicals: Technical indicators from stored daily bars (see TECHNICAL_LABELS)
+        market_in_context: The S&P 500 change and market headlines come from the
+            batch's MarketContext, so the prompt text leaves them out
+    """
+    ticker: str
+    current_price: Optional[float] = None
+    market_cap: Optional[int] = None
+    pe_ratio: Optional[float] = None
+    business_summary: str = ""
+    analyst_price_target: Dict[str, float] = field(default_factory=dict)
+    change_52_weeks: Optional[float] = None
+    market_change_52_weeks: Optional[float] = None
+    risk_score: Optional[int] = None
+    volatility_score: Optional[float] = None
+    debt_to_equity: Optional[float] = None
+    news: Tuple[NewsItem, ...] = ()
+    missing_sources: Tuple[str, ...] = ()
+    price_history: Dict[str, float] = field(default_factory=dict)
+    technicals: Dict[str, float] = field(default_factory=dict)
+    market_in_context: bool = False
+
+    # Maximum number of business summary characters included in prompts
+    SUMMARY_CHARS = 500
+
+    def __post_init__(self):
+        # Serializers (e.g. checkpoint msgpack) may hand sequences back as lists
+        object.__setattr__(self, "news", tuple(self.news))
+        object.__setattr__(self, "missing_sources", tuple(self.missing_sources))
+
+    @property
+    def relative_performance(self) -> Optional[float]:
+        """52-week change relative to the S&P 500, as a fraction."""
+        if self.change_52_weeks is None or self.market_change_52_weeks is None:
+            return None
+        return self.change_52_weeks - self.market_change_52_weeks
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain-dictionary view, suitable for JSON serialization."""
+        data = asdict(self)
+        data["relative_performance"] = self.relative_performance
+        return data
+
+    @cached_property
+    def prompt_text(self) -> str:
+        """Human-readable rendering used in the Analyst and Critic prompts."""
+        def pct(value: Optional[float]) -> str:
+            return _format_number(None if value is None else value * 100, "{:.2f}", suffix="%")
+
+        targets = ", ".join(
+            f"{name}: ${value:,.2f}" for name, value in self.analyst_price_target.items()
+        ) or "No data"
+        news = "\n".join(
+            f"    Title: {item.title}" + (f"\n    Snippet: {item.snippet}" if item.snippet else "")
+            for item in self.news
+        ) or ("" if self.market_in_context else "    No news available")
+        summary = self.business_summary[:self.SUMMARY_CHARS] or "No summary available."
+        risk_score = "No Risk data" if self.risk_score is None else f"{self.risk_score}/10"
+        history = "".join(
+            f"    {_format_feature(name, value)}\n" for name, value in self.price_history.items()
+        )
+        technicals = "".join(
+            f"    {_format_feature(name, value, TECHNICAL_LABELS)}\n" for name, value in self.technicals.items()
+        )
+
+        return (
+            f"Stock: {self.ticker}\n"
+            f"Current Price: {_format_number(self.current_price, prefix='$')}\n"
+            f"Market Cap: {_format_number(self.market_cap, '{:,.0f}', prefix='$')}\n"
+            f"Forward P/E Ratio: {_format_number(self.pe_ratio)}\n"
+            f"Business Summary: {summary}\n"
+            f"Analysts price target: {targets}\n"
+            f"52 Weeks change: {pct(self.change_52_weeks)}\n"
+            + ("" if self.market_in_context else f"52 weeks Market change: {pct(self.market_change_52_weeks)}\n")
+            + f"Relative performance: {pct(self.relative_performance)}\n"
+            f"Risk data:\n"
+            f"    Risk score: {risk_score}\n"
+            f"    Volatility score: {_format_number(self.volatility_score)}\n"
+            f"    Debt to Equity: {_format_number(self.debt_to_equity)}\n"
+            + (f"Price history:\n{history}" if history else "")
+            + (f"Technical indicators:\n{technicals}" if technicals else "")
+            + (f"Latest news:\n{news}\n" if news else "")
+        )
+
+    def __str__(self) -> str:
+        return self.prompt_text
+
+
+@dataclass(frozen=True)
+class MarketContext:
+    """
+    Market-wide data shared by every ticker of a batch, fetched once per batch.
+    
+    Attributes:
+        index_change_52_weeks: 52-week S&P 500 change as a fraction
+        sector_changes: 52-week change of each sector's SPDR ETF, by sector name
+        headlines: Macro and market-wide headlines
+        missing_sources: Upstream sources that failed or timed out
+    """
+    index_change_52_weeks: Optional[float] = None
+    sector_changes: Dict[str, float] = field(default_factory=dict)
+    headlines: Tuple[NewsItem, ...] = ()
+    missing_sources: Tuple[str, ...] = ()
+
+    # Maximum number of snippet characters per headline included in prompts; the
+    # context is repeated in every Analyst prompt, so it is kept terse
+    SNIPPET_CHARS = 120
+
+    def __post_init__(self):
+        object.__setattr__(self, "headlines", tuple(self.headlines))
+        object.__setattr__(self, "missing_sources", tuple(self.missing_sources))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain-dictionary view, suitable for JSON serialization."""
+        return asdict(self)
+
+    @cached_property
+    def prompt_text(self) -> str:
+        """Rendering used as the shared prefix of the Analyst prompts."""
+        sectors = ", ".join(
+            f"{name} {_format_number(value * 100, '{:.1f}', suffix='%')}"
+            for name, value in sorted(self.sector_changes.items(), key=lambda item: -item[1])
+        )
+        headlines = "".join(
+            f"    Title: {item.title}\n"
+            + (f"    Snippet: {item.snippet[:self.SNIPPET_CHARS]}\n" if item.snippet else "")
+            for item in self.headlines
+        )
+        index_change = None if self.index_change_52_weeks is None else self.index_change_52_weeks * 100
+        return (
+            f"S&P 500 52 weeks change: {_format_number(index_change, '{:.2f}', suffix='%')}\n"
+            + (f"Sector 52 weeks change (SPDR sector ETFs): {sectors}\n" if sectors else "")
+            + (f"Macro and market headlines:\n{headlines}" if headlines else "")
+        )
+
+    def __str__(self) -> str:
+        return self.prompt_text
+
+
 class AgentState(TypedDict):
     """
     State definition for the financial analysis workflow.
     
     Attributes:
         ticker: Stock symbol to analyze
-        financial_data: Raw financial data fetched from APIs
+        financial_data: Structured financial data fetched from APIs
         sentiment_analysis: Analysis results from the financial analyst
         critic_feedback: Feedback from the critic node
         report: Final generated report
         messages: Log of workflow messages
         iterations: Number of iterations through the workflow
+        previous_analysis: Last report for the ticker (incremental mode)
+        material_changes: Material input changes since the last report, or
+            None when there is no previous report to compare against
+        run_id: Checkpoint id of the run, empty when checkpointing is off
+        budget_truncated: Run budget limit that ended the run early (``deadline``,
+            ``tokens`` or ``cost``), empty when the run finished normally
+        market_context: Market-wide data shared across a batch, None outside batches
     """
     ticker: str
-    financial_data: str
+    financial_data: Optional[FinancialData]
     sentiment_analysis: str
     critic_feedback: str
     report: str
     messages: Annotated[List[str], operator.add]
     iterations: int
+    previous_analysis: str
+    material_changes: Optional[List[str]]
+    run_id: str
+    budget_truncated: str
+    market_context: Optional[MarketContext]
+
 
+def _state_reducers(state_type: type) -> Dict[str, Callable[[Any, Any], Any]]:
+    """Collect the reducer functions declared via ``Annotated`` on a state type."""
+    reducers = {}
+    # Raw annotations keep the Annotated metadata without get_type_hints(include_extras=...)
+    for key, hint in state_type.__annotations__.items():
+        metadata = getattr(hint, "__metadata__", ())
+        if metadata and callable(metadata[0]):
+            reducers[key] = metadata[0]
+    return reducers
 
-class FinancialData(TypedDict):
+
+_AGENT_STATE_REDUCERS = _state_reducers(AgentState)
+
+
+def apply_update(state: AgentState, update: Dict[str, Any]) -> AgentState:
     """
-    Structured financial data extracted from APIs.
+    Fold a single node update into an agent state, the same way LangGraph does.
+    
+    Keys annotated with a reducer (e.g. ``messages`` with ``operator.add``) are
+    combined with the existing value; every other key is overwritten.
+    
+    Args:
+        state: State accumulated so far
+        update: Partial state returned by a node
+        
+    Returns:
+        New state with the update applied
+    """
+    merged = dict(state)
+    for key, value in (update or {}).items():
+        reducer = _AGENT_STATE_REDUCERS.get(key)
+        if reducer is not None and key in merged:
+            merged[key] = reducer(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a single ticker within a batch run.
+    
+    Attributes:
+        ticker: Stock symbol that was analyzed
+        state: Final workflow state, or None if the run failed
+        error: Error message if the run failed
     """
     ticker: str
-    current_price: float
-    market_cap: int
-    pe_ratio: float
-    business_summary: str
-    analyst_price_target: dict
-    change_52_weeks: float
-    market_change_52_weeks: float
-    relative_performance: float
-    risk_score: int
-    volatility_score: float
-    debt_to_equity: float
\ No newline at end of file
+    state: Optional[AgentState] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the ticker completed without an error."""
+        return self.error is None
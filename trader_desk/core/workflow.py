@@ -1,10 +1,28 @@
-from langgraph.graph import StateGraph, END
-from typing import Dict, Any, Optional
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Any, Optional, Iterator, Tuple, Callable, Iterable, AsyncIterator, Awaitable
 
-from .types import AgentState
+from .types import AgentState, BatchResult, MarketContext, apply_update
+from .budget import BudgetExceeded, RunBudget, current_budget, spending
 from .config import AppConfig
+from .incremental import MaterialityThresholds, SnapshotStore, material_changes
+from .results import ResultStore, RunRecord
+from ..utils.cache import TTLCache
 from ..utils.data_fetcher import FinancialDataFetcher
+from ..utils.llm_cache import LLMResponseCache
+from ..utils.metrics import MetricsRecorder
+from ..utils.scheduler import Priority, UpstreamScheduler, request_priority
 from ..nodes.analysis import FinancialAnalyst, ReportCritic
+from ..nodes.prompting import is_approved
+from ..nodes.streaming import TokenStream, streaming_tokens
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableLambda
+    from .parallel import ProcessBatchRunner
+
+logger = logging.getLogger(__name__)
 
 
 class TradingWorkflow:
@@ -21,36 +39,96 @@ class TradingWorkflow:
         """
         self.config = config or AppConfig.from_environment()
         self.max_iterations = self.config.workflow.max_iterations
-        self.data_fetcher = FinancialDataFetcher()
+        self.metrics = MetricsRecorder.from_config(self.config.metrics)
+        self.cache = TTLCache.from_config(self.config.cache, metrics=self.metrics)
+        self.scheduler = UpstreamScheduler.from_config(self.config.scheduler, metrics=self.metrics)
+        self.price_store = None
+        if self.config.prices.enabled:
+            # Imported only when needed: it pulls in numpy and pandas
+            from ..utils.prices import PriceStore
+            self.price_store = PriceStore.from_config(self.config.prices, scheduler=self.scheduler)
+        self.data_fetcher = FinancialDataFetcher(
+            max_workers=self.config.workflow.io_workers,
+            cache=self.cache,
+            metrics=self.metrics,
+            scheduler=self.scheduler,
+            price_store=self.price_store
+        )
+        self.response_cache = LLMResponseCache.from_config(self.config.llm, metrics=self.metrics)
         self.analyst = FinancialAnalyst(
             model=self.config.llm.model,
-            temperature=self.config.llm.temperature
+            temperature=self.config.llm.temperature,
+            response_cache=self.response_cache,
+            token_budget=self.config.llm.prompt_token_budget,
+            metrics=self.metrics,
+            scheduler=self.scheduler
         )
         self.critic = ReportCritic(
             model=self.config.llm.model,
-            temperature=self.config.llm.temperature
+            temperature=self.config.llm.temperature,
+            response_cache=self.response_cache,
+            token_budget=self.config.llm.prompt_token_budget,
+            metrics=self.metrics,
+            scheduler=self.scheduler,
+            precheck=self.config.workflow.critic_precheck
         )
-        self.app = self._build_workflow()
+        self.snapshots = SnapshotStore.from_config(self.config.workflow)
+        self.results = ResultStore.from_config(self.config.workflow)
+        self.thresholds = MaterialityThresholds(
+            price_change=self.config.workflow.price_change_threshold,
+            pe_change=self.config.workflow.pe_change_threshold,
+            new_headlines=self.config.workflow.new_headlines_threshold
+        )
+        self.checkpointer = None
+        if self.config.workflow.checkpointing:
+            # Imported only when needed: it pulls in langgraph
+            from .checkpoint import SQLiteCheckpointSaver
+            self.checkpointer = SQLiteCheckpointSaver.from_config(self.config.workflow)
+        self._app = None
+        self._app_lock = threading.Lock()
+        self._process_runner: Optional["ProcessBatchRunner"] = None
+    
+    @property
+    def app(self) -> Any:
+        """Compiled workflow graph, built on first use."""
+        if self._app is None:
+            with self._app_lock:
+                if self._app is None:
+                    self._app = self._build_workflow()
+        return self._app
     
-    def _build_workflow(self) -> StateGraph:
+    def _build_workflow(self) -> Any:
         """
         Build and compile the workflow graph.
         
         Returns:
             Compiled workflow application
         """
+        from langgraph.graph import StateGraph, END
+        
         workflow = StateGraph(AgentState)
         
-        # Add nodes
-        workflow.add_node('Fetcher', self._fetch_node)
-        workflow.add_node('Analyst', self._analyst_node)
-        workflow.add_node('Critic', self._critic_node)
+        # Add nodes (each with a native async implementation for arun)
+        workflow.add_node('Fetcher', self._instrumented('Fetcher', self._fetch_node, self._afetch_node))
+        workflow.add_node('Analyst', self._instrumented('Analyst', self._analyst_node, self._aanalyst_node))
+        workflow.add_node('Critic', self._instrumented('Critic', self._critic_node, self._acritic_node))
         
         # Set entry point
         workflow.set_entry_point('Fetcher')
         
         # Add fixed edges
-        workflow.add_edge('Fetcher', 'Analyst')
+        if self.snapshots is None:
+            workflow.add_edge('Fetcher', 'Analyst')
+        else:
+            # Incremental mode: skip the LLMs when nothing material changed
+            workflow.add_conditional_edges(
+                'Fetcher',
+                self._route_after_fetch,
+                {
+                    "reuse": END,
+                    "analyze": "Analyst"
+                }
+            )
         workflow.add_edge('Analyst', 'Critic')
         
         # Add conditional edge for refinement loop
@@ -63,11 +141,46 @@ class TradingWorkflow:
             }
         )
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
+    
+    def _instrumented(
+        self,
+        name: str,
+        func: Callable[[AgentState], Dict[str, Any]],
+        afunc: Callable[[AgentState], Awaitable[Dict[str, Any]]]
+    ) -> "RunnableLambda":
+        """Wrap a node's sync and async implementations so each call records its wall time."""
+        from langchain_core.runnables import RunnableLambda
+        
+        def labels(state: AgentState) -> Dict[str, Any]:
+            return {"node": name, "ticker": state['ticker'], "iteration": state.get('iterations', 0)}
+        
+        def run_node(state: AgentState) -> Dict[str, Any]:
+            with self.metrics.timer("node_duration_seconds", **labels(state)):
+                return func(state)
+        
+        async def arun_node(state: AgentState) -> Dict[str, Any]:
+            with self.metrics.timer("node_duration_seconds", **labels(state)):
+                return await afunc(state)
+        
+        return RunnableLambda(run_node, afunc=arun_node, name=name)
+    
+    def _record_run(self, final_state: AgentState, started: float, timings: Dict[str, float]) -> None:
+        """Record run-level metrics and store the result once a ticker's workflow has finished."""
+        ticker = final_state['ticker']
+        duration = time.perf_counter() - started
+        self.metrics.record("run_duration_seconds", duration, ticker=ticker)
+        self.metrics.record("refinement_loops", final_state.get('iterations', 0), ticker=ticker)
+        if self.results is not None:
+            self.results.add(RunRecord.from_state(final_state, duration, timings))
+        logger.info(
+            "Analysis finished",
+            extra={"ticker": ticker, "iterations": final_state.get('iterations', 0)}
+        )
     
     def _fetch_node(self, state: AgentState) -> Dict[str, Any]:
         """Wrapper for data fetching node."""
-        return self.data_fetcher.fetch_financial_data(state)
+        return self._compare_with_snapshot(state, self.data_fetcher.fetch_financial_data(state))
     
     def _analyst_node(self, state: AgentState) -> Dict[str, Any]:
         """Wrapper for analyst node."""
@@ -75,12 +188,93 @@ class TradingWorkflow:
     
     def _critic_node(self, state: AgentState) -> Dict[str, Any]:
         """Wrapper for critic node."""
-        return self.critic.review(state)
+        return self._save_snapshot(state, self.critic.review(state))
+    
+    async def _afetch_node(self, state: AgentState) -> Dict[str, Any]:
+        """Async wrapper for data fetching node."""
+        return self._compare_with_snapshot(state, await self.data_fetcher.afetch_financial_data(state))
+    
+    async def _aanalyst_node(self, state: AgentState) -> Dict[str, Any]:
+        """Async wrapper for analyst node."""
+        return await self.analyst.aanalyze(state)
+    
+    async def _acritic_node(self, state: AgentState) -> Dict[str, Any]:
+        """Async wrapper for critic node."""
+        return self._save_snapshot(state, await self.critic.areview(state))
+    
+    def _compare_with_snapshot(self, state: AgentState, update: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Diff freshly fetched data against the ticker's last analysis (incremental mode).
+        
+        When nothing material changed, the previous report and verdict are
+        copied into the update so the run can end without any LLM calls.
+        """
+        if self.snapshots is None:
+            return update
+        
+        snapshot = self.snapshots.get(state['ticker'])
+        if snapshot is None:
+            return {**update, "material_changes": None}
+        
+        changes = material_changes(snapshot.financial_data, update["financial_data"], self.thresholds)
+        if changes:
+            return {
+                **update,
+                "previous_analysis": snapshot.sentiment_analysis,
+                "material_changes": changes,
+                "messages": update["messages"] + [
+                    f"{len(changes)} material change(s) since the last analysis of {state['ticker']}"
+                ]
+            }
+        
+        return {
+            **update,
+            "previous_analysis": snapshot.sentiment_analysis,
+            "material_changes": [],
+            "sentiment_analysis": snapshot.sentiment_analysis,
+            "critic_feedback": snapshot.critic_feedback,
+            "messages": update["messages"] + [
+                f"Reused previous analysis for {state['ticker']} (no material change)"
+            ]
+        }
+    
+    def _save_snapshot(self, state: AgentState, update: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record the finished analysis once the critic has approved it.
+        
+        Drafts the loop gave up on (out of iterations or budget) are not
+        saved, so they never become the baseline a later run reuses.
+        """
+        if self.snapshots is not None:
+            final_state = apply_update(state, update)
+            if is_approved(final_state['critic_feedback']) and not final_state.get('budget_truncated'):
+                self.snapshots.save(
+                    final_state['ticker'],
+                    final_state['financial_data'],
+                    final_state['sentiment_analysis'],
+                    final_state['critic_feedback']
+                )
+        return update
+    
+    def _route_after_fetch(self, state: AgentState) -> str:
+        """
+        Decide whether the fetched data needs a new analysis.
+        
+        Args:
+            state: Current agent state
+            
+        Returns:
+            Next step: 'reuse' or 'analyze'
+        """
+        return "reuse" if state.get('material_changes') == [] else "analyze"
     
     def _should_continue(self, state: AgentState) -> str:
         """
         Determine whether to continue refinement or end the workflow.
         
+        The loop also ends once the run budget is used up; the run then
+        keeps the last reviewed draft (see :meth:`_finish_within_budget`).
+        
         Args:
             state: Current agent state
             
@@ -89,48 +283,504 @@ class TradingWorkflow:
         """
         if state.get('iterations', 0) >= self.max_iterations:
             return "end"
+        
+        budget = current_budget()
+        if budget is not None and budget.exceeded() is not None:
+            return "end"
 
-        if "APPROVE" in state["critic_feedback"].upper():
+        if is_approved(state["critic_feedback"]):
             return "end"
         else:
             return "refine"
     
-    def run(self, ticker: str, verbose: bool = True) -> AgentState:
+    def _initial_state(
+        self,
+        ticker: str,
+        run_id: str = "",
+        market_context: Optional[MarketContext] = None
+    ) -> AgentState:
+        """Build the empty state a workflow run starts from."""
+        return {
+            "ticker": ticker,
+            "messages": [],
+            "financial_data": None,
+            "sentiment_analysis": "",
+            "critic_feedback": "",
+            "report": "",
+            "iterations": 0,
+            "previous_analysis": "",
+            "material_changes": None,
+            "run_id": run_id,
+            "budget_truncated": "",
+            "market_context": market_context
+        }
+    
+    def _resolve_run_id(self, ticker: str, run_id: Optional[str]) -> Optional[str]:
+        """Run id to checkpoint under: the given one, or a fresh one when checkpointing."""
+        if run_id is None and self.checkpointer is not None:
+            from .checkpoint import new_run_id
+            return new_run_id(ticker)
+        return run_id
+    
+    def _run_config(self, run_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """LangGraph config addressing a run's checkpoints."""
+        if self.checkpointer is None or run_id is None:
+            return None
+        return {"configurable": {"thread_id": run_id}}
+    
+    def _require_checkpointer(self) -> None:
+        if self.checkpointer is None:
+            raise ValueError("Checkpointing is disabled; enable WorkflowConfig.checkpointing")
+    
+    def stream(self, ticker: str, run_id: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Execute the workflow once, yielding each node's update as it completes.
+        
+        Args:
+            ticker: Stock symbol to analyze
+            run_id: Checkpoint id of the run, generated when checkpointing and omitted
+            
+        Yields:
+            Tuples of (node name, partial state returned by that node)
+        """
+        run_id = self._resolve_run_id(ticker, run_id)
+        yield from self._stream(self._initial_state(ticker, run_id or ""), run_id)
+    
+    def _stream(self, graph_input: Optional[AgentState], run_id: Optional[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream node updates for a new run, or for a resumed one when ``graph_input`` is None."""
+        for event in self.app.stream(graph_input, self._run_config(run_id), stream_mode="updates"):
+            for node_name, output in event.items():
+                yield node_name, output or {}
+    
+    def _truncate(self, state: AgentState, reason: str, partial: str = "") -> AgentState:
+        """Mark a run ended by its budget, keeping its best draft (the cut-short text if there is none)."""
+        logger.warning("Run budget exceeded", extra={"ticker": state['ticker'], "reason": reason})
+        self.metrics.record("runs_budget_truncated", 1, reason=reason)
+        update: Dict[str, Any] = {
+            "budget_truncated": reason,
+            "messages": [f"Run for {state['ticker']} stopped early: {reason} budget exceeded."]
+        }
+        if not state.get('sentiment_analysis') and partial:
+            update["sentiment_analysis"] = partial
+        return apply_update(state, update)
+    
+    def _finish_within_budget(self, state: AgentState, budget: Optional[RunBudget]) -> AgentState:
+        """Mark a completed run whose refinement loop was ended by the budget rather than the critic."""
+        if budget is None or is_approved(state.get('critic_feedback', '')):
+            return state
+        if not 0 < state.get('iterations', 0) < self.max_iterations:
+            return state
+        reason = budget.exceeded()
+        return state if reason is None else self._truncate(state, reason)
+    
+    def _execute(
+        self,
+        state: AgentState,
+        events: Iterator[Tuple[str, Dict[str, Any]]],
+        verbose: bool,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]],
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None
+    ) -> AgentState:
+        """
+        Fold streamed node updates into ``state`` and finish the run.
+        
+        LLM output is streamed to ``token_stream``. Upstream calls are charged
+        to ``budget`` (by default a fresh one from the configured limits); once
+        it runs out, the run ends with its best draft so far, marked in
+        ``budget_truncated``.
+        """
+        ticker = state['ticker']
+        started = time.perf_counter()
+        budget = budget or RunBudget.from_config(self.config)
+        logger.info("Starting financial analysis", extra={"ticker": ticker, "run_id": state['run_id']})
+        
+        timings: Dict[str, float] = {}
+        step_started = started
+        with streaming_tokens(token_stream), spending(budget):
+            try:
+                for node_name, output in events:
+                    now = time.perf_counter()
+                    timings[node_name] = timings.get(node_name, 0.0) + now - step_started
+                    step_started = now
+                    state = apply_update(state, output)
+                    if on_event is not None:
+                        on_event(node_name, output)
+                    logger.info("Node completed", extra={"ticker": ticker, "node": node_name})
+            except BudgetExceeded as e:
+                state = self._truncate(state, e.reason, e.partial)
+            else:
+                state = self._finish_within_budget(state, budget)
+        
+        self._record_run(state, started, timings)
+        if verbose:
+            self._print_results(state)
+        
+        return state
+    
+    def run(
+        self,
+        ticker: str,
+        verbose: bool = True,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        run_id: Optional[str] = None,
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None,
+        market_context: Optional[MarketContext] = None,
+        sync_prices: bool = True
+    ) -> AgentState:
         """
         Execute the complete workflow for a given ticker.
         
+        The graph is executed a single time; the final state is assembled by
+        folding every streamed node update into the initial state. With
+        checkpointing enabled, the state is persisted after every node under
+        ``run_id`` so the run can be resumed or replayed later.
+        
         Args:
             ticker: Stock symbol to analyze
-            verbose: Whether to print step-by-step progress
+            verbose: Whether to print the final report
+            on_event: Optional callback invoked with (node name, update) for each step
+            run_id: Checkpoint id of the run, generated when checkpointing and omitted
+            token_stream: Receives the Analyst's and Critic's output as it is generated;
+                cancelling it aborts the generation in progress
+            budget: Deadline, token and cost limits of the run, defaults to the configured
+                ``run_deadline``/``run_max_tokens``/``run_max_cost``; a run that exceeds
+                them ends early with its best draft, marked in ``budget_truncated``
+            market_context: Market-wide data shared with the other runs of a batch
+            sync_prices: Whether to bring the ticker's stored price history up to
+                date first; batches sync all their tickers at once instead
             
         Returns:
             Final state containing all analysis results
+            
+        Raises:
+            GenerationCancelled: If ``token_stream`` is cancelled before the run completes
         """
-        initial_input = {
-            "ticker": ticker,
-            "messages": [],
-            "financial_data": "",
-            "sentiment_analysis": "",
-            "critic_feedback": "",
-            "report": "",
-            "iterations": 0
-        }
+        if sync_prices:
+            self.data_fetcher.sync_price_history([ticker])
+        run_id = self._resolve_run_id(ticker, run_id)
+        state = self._initial_state(ticker, run_id or "", market_context)
+        return self._execute(state, self._stream(state, run_id), verbose, on_event, token_stream, budget)
+    
+    def resume(
+        self,
+        run_id: str,
+        verbose: bool = False,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None
+    ) -> AgentState:
+        """
+        Continue a checkpointed run from its last completed node.
         
-        if verbose:
-            print(f"--- Starting Financial Analysis for {ticker} ---")
-            print("--- Streaming Agent Steps ---")
+        Nodes that already completed are not executed again; a run that had
+        already finished is returned as is.
+        
+        Args:
+            run_id: Checkpoint id of the run
+            verbose: Whether to print the final report
+            on_event: Optional callback invoked with (node name, update) for each resumed step
+            token_stream: Receives the Analyst's and Critic's output as it is generated
+            budget: Limits of the resumed part of the run, defaults to the configured ones
+            
+        Returns:
+            Final state containing all analysis results
             
-            for event in self.app.stream(initial_input):
-                for node_name, output in event.items():
-                    print(f"\n[Node Completed: {node_name}]")
+        Raises:
+            ValueError: If checkpointing is disabled
+            KeyError: If the run has no checkpoints
+        """
+        self._require_checkpointer()
+        snapshot = self.app.get_state(self._run_config(run_id))
+        if not snapshot.values:
+            raise KeyError(f"No checkpoints for run {run_id}")
+        state = {**self._initial_state(snapshot.values["ticker"], run_id), **snapshot.values}
+        if not snapshot.next:
+            if verbose:
+                self._print_results(state)
+            return state
+        return self._execute(state, self._stream(None, run_id), verbose, on_event, token_stream, budget)
+    
+    def has_checkpoint(self, run_id: str) -> bool:
+        """Whether a run has any persisted checkpoint."""
+        return self.checkpointer is not None and self.checkpointer.get_tuple(self._run_config(run_id)) is not None
+    
+    def run_or_resume(
+        self,
+        ticker: str,
+        run_id: str,
+        verbose: bool = False,
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None,
+        market_context: Optional[MarketContext] = None,
+        sync_prices: bool = True
+    ) -> AgentState:
+        """Resume ``run_id`` if it was checkpointed before, otherwise start it (with ``market_context``)."""
+        if self.has_checkpoint(run_id):
+            logger.info("Resuming run", extra={"ticker": ticker, "run_id": run_id})
+            return self.resume(run_id, verbose=verbose, token_stream=token_stream, budget=budget)
+        return self.run(
+            ticker, verbose=verbose, run_id=run_id, token_stream=token_stream, budget=budget,
+            market_context=market_context, sync_prices=sync_prices
+        )
+    
+    def replay(self, run_id: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Re-emit the node updates recorded for a run, in order, without executing anything.
         
-        # Execute the workflow
-        final_state = self.app.invoke(initial_input)
+        Args:
+            run_id: Checkpoint id of the run
+            
+        Yields:
+            Tuples of (node name, partial state returned by that node)
+        """
+        self._require_checkpointer()
+        history = list(self.app.get_state_history(self._run_config(run_id)))
+        for snapshot in reversed(history):
+            for task in snapshot.tasks:
+                if task.result is not None and not task.name.startswith("__"):
+                    yield task.name, task.result
+    
+    async def astream(self, ticker: str, run_id: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Asynchronous counterpart of :meth:`stream`.
         
+        Args:
+            ticker: Stock symbol to analyze
+            run_id: Checkpoint id of the run, generated when checkpointing and omitted
+            
+        Yields:
+            Tuples of (node name, partial state returned by that node)
+        """
+        run_id = self._resolve_run_id(ticker, run_id)
+        async for event in self._astream(self._initial_state(ticker, run_id or ""), run_id):
+            yield event
+    
+    async def _astream(self, graph_input: Optional[AgentState], run_id: Optional[str]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Asynchronous counterpart of :meth:`_stream`."""
+        async for event in self.app.astream(graph_input, self._run_config(run_id), stream_mode="updates"):
+            for node_name, output in event.items():
+                yield node_name, output or {}
+    
+    async def _aexecute(
+        self,
+        state: AgentState,
+        events: AsyncIterator[Tuple[str, Dict[str, Any]]],
+        verbose: bool,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]],
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None
+    ) -> AgentState:
+        """Asynchronous counterpart of :meth:`_execute`."""
+        ticker = state['ticker']
+        started = time.perf_counter()
+        budget = budget or RunBudget.from_config(self.config)
+        logger.info("Starting financial analysis", extra={"ticker": ticker, "run_id": state['run_id']})
+        
+        timings: Dict[str, float] = {}
+        step_started = started
+        with streaming_tokens(token_stream), spending(budget):
+            try:
+                async for node_name, output in events:
+                    now = time.perf_counter()
+                    timings[node_name] = timings.get(node_name, 0.0) + now - step_started
+                    step_started = now
+                    state = apply_update(state, output)
+                    if on_event is not None:
+                        on_event(node_name, output)
+                    logger.info("Node completed", extra={"ticker": ticker, "node": node_name})
+            except BudgetExceeded as e:
+                state = self._truncate(state, e.reason, e.partial)
+            else:
+                state = self._finish_within_budget(state, budget)
+        
+        self._record_run(state, started, timings)
         if verbose:
-            self._print_results(final_state)
+            self._print_results(state)
+        
+        return state
+    
+    async def arun(
+        self,
+        ticker: str,
+        verbose: bool = False,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        run_id: Optional[str] = None,
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None,
+        market_context: Optional[MarketContext] = None,
+        sync_prices: bool = True
+    ) -> AgentState:
+        """
+        Execute the complete workflow for a given ticker on the running event loop.
+        
+        Many calls can be awaited concurrently (e.g. with ``asyncio.gather``)
+        without dedicating a thread to each analysis.
+        
+        Args:
+            ticker: Stock symbol to analyze
+            verbose: Whether to print the final report
+            on_event: Optional callback invoked with (node name, update) for each step
+            run_id: Checkpoint id of the run, generated when checkpointing and omitted
+            token_stream: Receives the Analyst's and Critic's output as it is generated
+            budget: Deadline, token and cost limits of the run, defaults to the configured ones
+            market_context: Market-wide data shared with other concurrent runs
+            sync_prices: Whether to bring the ticker's stored price history up to
+                date first; pass False after syncing many tickers at once with
+                ``data_fetcher.sync_price_history``
+            
+        Returns:
+            Final state containing all analysis results
+        """
+        if sync_prices:
+            await self.data_fetcher.async_price_history([ticker])
+        run_id = self._resolve_run_id(ticker, run_id)
+        state = self._initial_state(ticker, run_id or "", market_context)
+        return await self._aexecute(state, self._astream(state, run_id), verbose, on_event, token_stream, budget)
+    
+    async def aresume(
+        self,
+        run_id: str,
+        verbose: bool = False,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        token_stream: Optional[TokenStream] = None,
+        budget: Optional[RunBudget] = None
+    ) -> AgentState:
+        """Asynchronous counterpart of :meth:`resume`."""
+        self._require_checkpointer()
+        snapshot = await self.app.aget_state(self._run_config(run_id))
+        if not snapshot.values:
+            raise KeyError(f"No checkpoints for run {run_id}")
+        state = {**self._initial_state(snapshot.values["ticker"], run_id), **snapshot.values}
+        if not snapshot.next:
+            if verbose:
+                self._print_results(state)
+            return state
+        return await self._aexecute(state, self._astream(None, run_id), verbose, on_event, token_stream, budget)
+    
+    def run_batch(
+        self,
+        tickers: Iterable[str],
+        max_concurrency: Optional[int] = None,
+        verbose: bool = False,
+        batch_id: Optional[str] = None,
+        market_context: Optional[MarketContext] = None,
+        sync_prices: bool = True
+    ) -> Iterator[BatchResult]:
+        """
+        Analyze many tickers concurrently, yielding results as each one finishes.
         
-        return final_state
+        All runs share this workflow's fetcher, analyst and critic. A failing
+        ticker is reported through its BatchResult and does not stop the batch.
+        Upstream calls are made at batch priority, so interactive runs sharing
+        the scheduler are served first.
+        
+        With ``workflow.shared_market_context`` the market-wide context (index
+        and sector performance, macro headlines) is fetched once, before the
+        first ticker, and shared by every run as a common prompt prefix. The
+        runs then skip their own market fields and news search, so the batch
+        makes fewer upstream calls and its per-ticker prompts get shorter.
+        
+        The stored price history of every ticker is synced once, in bulk,
+        before the runs start; the runs (and worker processes) only read it.
+        
+        With ``workflow.process_workers`` above 1 the tickers are instead
+        sharded across that many worker processes (see ProcessBatchRunner),
+        each with its own warm workflow, and results arrive shard by shard. The
+        worker pool is kept for later batches until :meth:`close`.
+        
+        With checkpointing enabled every ticker runs under ``<batch_id>:<ticker>``;
+        calling again with the same ``batch_id`` returns finished tickers from
+        their checkpoints and resumes interrupted ones instead of redoing them.
+        
+        Args:
+            tickers: Stock symbols to analyze
+            max_concurrency: Maximum number of in-flight runs (per worker process), defaults to config
+            verbose: Whether to print each report as it completes
+            batch_id: Checkpoint prefix of the batch, generated when checkpointing and omitted
+            market_context: Market context to share instead of fetching one
+            sync_prices: Whether to sync the tickers' price history first
+            
+        Yields:
+            BatchResult for every ticker, in completion order
+        """
+        if self.checkpointer is not None and batch_id is None:
+            batch_id = self._resolve_run_id("batch", None)
+        tickers = list(tickers)
+        with request_priority(Priority.BATCH):
+            if sync_prices:
+                self.data_fetcher.sync_price_history(tickers)
+            if market_context is None and self.config.workflow.shared_market_context:
+                market_context = self.data_fetcher.fetch_market_context()
+        
+        if self.config.workflow.process_workers > 1:
+            results = self._batch_runner().run(tickers, max_concurrency, batch_id, market_context)
+        else:
+            results = self._run_batch_threads(tickers, max_concurrency, batch_id, market_context)
+        
+        for result in results:
+            if verbose:
+                if result.ok:
+                    self._print_results(result.state)
+                else:
+                    logger.error("Analysis failed", extra={"ticker": result.ticker, "error": result.error})
+            yield result
+    
+    def _batch_runner(self) -> "ProcessBatchRunner":
+        """Process batch runner, created on first use; its worker pool is reused by later batches."""
+        with self._app_lock:
+            if self._process_runner is None:
+                # Imported only when needed: worker processes are rarely used interactively
+                from .parallel import ProcessBatchRunner
+                self._process_runner = ProcessBatchRunner.from_config(self.config, metrics=self.metrics)
+            return self._process_runner
+    
+    def _run_batch_threads(
+        self,
+        tickers: Iterable[str],
+        max_concurrency: Optional[int],
+        batch_id: Optional[str],
+        market_context: Optional[MarketContext] = None
+    ) -> Iterator[BatchResult]:
+        """Run a batch on a thread pool in this process, yielding results in completion order."""
+        workers = max_concurrency or self.config.workflow.max_concurrency
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trader-desk")
+        
+        def run_at_batch_priority(ticker: str) -> AgentState:
+            with request_priority(Priority.BATCH):
+                if batch_id is None:
+                    return self.run(ticker, False, market_context=market_context, sync_prices=False)
+                return self.run_or_resume(
+                    ticker, f"{batch_id}:{ticker}", market_context=market_context, sync_prices=False
+                )
+        
+        futures: Dict[Future, str] = {}
+        try:
+            futures = {pool.submit(run_at_batch_priority, ticker): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    yield BatchResult(ticker=ticker, state=future.result())
+                except Exception as e:
+                    yield BatchResult(ticker=ticker, error=str(e))
+        finally:
+            # A consumer that stops early skips the tickers not started yet
+            # (Executor.shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+    
+    def close(self) -> None:
+        """Release the worker pool, the fetcher's executor, the metrics sinks and the checkpoint and results databases."""
+        if self._process_runner is not None:
+            self._process_runner.close()
+        self.data_fetcher.close()
+        self.metrics.close()
+        if self.results is not None:
+            self.results.close()
+        if self.checkpointer is not None:
+            self.checkpointer.close()
     
     def _print_results(self, final_state: AgentState) -> None:
         """
@@ -145,4 +795,6 @@ class TradingWorkflow:
         print(f"Analysis:\n{final_state['sentiment_analysis']}")
         print("-" * 30)
         print(f"Critic's Final Verdict: {final_state['critic_feedback']}")
+        if final_state.get('budget_truncated'):
+            print(f"Stopped early: {final_state['budget_truncated']} budget exceeded")
         print("=" * 50)
\ No newline at end of file
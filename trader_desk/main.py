@@ -5,79 +5,397 @@ A production-grade financial analysis tool using AI agents to analyze stock data
 provide insights, and generate comprehensive reports with built-in quality assurance.
 """
 
+import argparse
+import datetime
+import importlib
+import logging
+import os
 import sys
+import time
+from typing import List, Optional
 from dotenv import load_dotenv
 
-from .core.workflow import TradingWorkflow
 from .core.config import AppConfig
+from .nodes.streaming import TokenStream
+from .utils.logs import configure_logging
 
+# The workflow, LLM and market data stacks are imported inside the entry
+# points that need them, so ``--help`` and ``--check`` start quickly.
 
-def main(ticker: str = "AAPL"):
+logger = logging.getLogger(__name__)
+
+
+def _setup(config: AppConfig) -> None:
+    """Configure logging from the application configuration."""
+    configure_logging(
+        verbose=config.workflow.enable_verbose_logging,
+        json_output=os.getenv("LOG_FORMAT", "text").lower() == "json"
+    )
+
+
+def _printing_stream() -> TokenStream:
+    """Token stream that prints generated text as it arrives, under a header per node turn."""
+    current = {"node": None}
+    
+    def on_token(node: str, text: str) -> None:
+        if node != current["node"]:
+            current["node"] = node
+            print(f"\n\n--- {node} ---", flush=True)
+        print(text, end="", flush=True)
+    
+    def on_restart(node: str) -> None:
+        current["node"] = node
+        print(f"\n\n--- {node} (retrying) ---", flush=True)
+    
+    return TokenStream(on_token=on_token, on_restart=on_restart)
+
+
+def main(ticker: str = "AAPL", run_id: Optional[str] = None, stream: bool = True):
     """
     Main application entry point.
     
     Args:
         ticker: Stock symbol to analyze
+        run_id: Checkpoint id; an interrupted run with this id is resumed
+        stream: Print the Analyst's and Critic's output as it is generated
     """
+    workflow = None
     try:
         # Load environment variables
         load_dotenv()
         
         # Initialize configuration from environment
         config = AppConfig.from_environment()
+        _setup(config)
+        
+        from .core.workflow import TradingWorkflow
         
         # Initialize the workflow with configuration
         workflow = TradingWorkflow(config)
         
-        # Run analysis
-        final_state = workflow.run(
-            ticker, 
-            verbose=config.workflow.enable_verbose_logging
-        )
+        # Streamed output replaces the final report printout
+        token_stream = _printing_stream() if stream else None
+        verbose = config.workflow.enable_verbose_logging and not stream
+        
+        # Run analysis, resuming a checkpointed run if asked to
+        if run_id is not None:
+            final_state = workflow.run_or_resume(
+                ticker,
+                run_id,
+                verbose=verbose,
+                token_stream=token_stream
+            )
+        else:
+            final_state = workflow.run(
+                ticker, 
+                verbose=verbose,
+                token_stream=token_stream
+            )
+        if stream:
+            print(f"\n\nFinished {ticker} after {final_state['iterations']} iteration(s)")
+            if final_state.get("budget_truncated"):
+                print(f"Stopped early: {final_state['budget_truncated']} budget exceeded")
+        if final_state["run_id"]:
+            print(f"Run id: {final_state['run_id']} (pass --run-id to resume or replay)")
         
-        # Optionally save results if enabled
-        if config.workflow.enable_result_saving:
-            save_results(final_state)
-            
         return final_state
         
     except Exception as e:
-        print(f"Error running financial analysis: {e}")
+        logger.error(f"Error running financial analysis: {e}")
         raise
+    finally:
+        # Flushes pending results (SAVE_RESULTS) and closes the databases
+        if workflow is not None:
+            workflow.close()
+
+
+def main_batch(
+    tickers: List[str],
+    concurrency: Optional[int] = None,
+    screen_top: Optional[int] = None,
+    batch_id: Optional[str] = None,
+    processes: Optional[int] = None
+):
+    """
+    Batch entry point analyzing several tickers concurrently.
+    
+    Args:
+        tickers: Stock symbols to analyze
+        concurrency: Maximum number of tickers analyzed at once (per worker process)
+        screen_top: If set, screen the tickers first and analyze only the top N
+        batch_id: Checkpoint id of the batch; rerun with the same id to resume it
+        processes: Number of worker processes, overriding BATCH_PROCESSES
+        
+    Returns:
+        List of BatchResult objects in completion order
+    """
+    from .core.workflow import TradingWorkflow
+    
+    load_dotenv()
+    config = AppConfig.from_environment()
+    if processes is not None:
+        config.workflow.process_workers = processes
+    _setup(config)
+    workflow = TradingWorkflow(config)
+    
+    if screen_top:
+        from .utils.screener import ScreenCriteria, WatchlistScreener
+        screener = WatchlistScreener(
+            ScreenCriteria(top_n=screen_top), cache=workflow.cache, fetcher=workflow.data_fetcher
+        )
+        tickers = screener.top_candidates(tickers)
+        print(f"Screened down to {len(tickers)} candidates: {', '.join(tickers)}")
+    
+    if workflow.checkpointer is not None and batch_id is None:
+        batch_id = f"batch-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    if batch_id is not None:
+        print(f"Batch id: {batch_id} (pass --run-id {batch_id} to resume)")
+    
+    results = []
+    try:
+        for result in workflow.run_batch(
+            tickers,
+            max_concurrency=concurrency,
+            verbose=config.workflow.enable_verbose_logging,
+            batch_id=batch_id
+        ):
+            results.append(result)
+    finally:
+        workflow.close()
+    
+    failed = [r.ticker for r in results if not r.ok]
+    print(f"\nBatch finished: {len(results) - len(failed)}/{len(results)} tickers succeeded")
+    if failed:
+        print(f"Failed tickers: {', '.join(failed)}")
+    
+    return results
+
+
+def history_main(
+    ticker: Optional[str] = None,
+    verdict: Optional[str] = None,
+    days: Optional[float] = None,
+    limit: int = 20
+):
+    """
+    Print stored analyses from the results database, newest first.
+    
+    Args:
+        ticker: Only runs for this stock symbol
+        verdict: Only runs with this verdict (APPROVE, REVISE or TRUNCATED)
+        days: Only runs from the last N days
+        limit: Maximum number of runs to print
+        
+    Returns:
+        List of matching RunRecord objects
+    """
+    from .core.results import ResultStore
+    
+    load_dotenv()
+    config = AppConfig.from_environment()
+    store = ResultStore(config.workflow.results_path)
+    since = time.time() - days * 24 * 60 * 60 if days is not None else None
+    try:
+        records = store.query(ticker=ticker, verdict=verdict, since=since, limit=limit)
+    finally:
+        store.close()
+    
+    for record in records:
+        finished = datetime.datetime.fromtimestamp(record.created_at).strftime("%Y-%m-%d %H:%M")
+        print(
+            f"{finished}  {record.ticker:<8} {record.verdict:<8} "
+            f"{record.iterations} round(s)  {record.duration_seconds:6.1f}s"
+        )
+    if not records:
+        print("No stored analyses match.")
+    return records
 
 
-def save_results(final_state):
+def prices_main(tickers: List[str], interval: str = "1d"):
     """
-    Save analysis results to file or database.
+    Backfill or refresh the local price history of many tickers.
     
     Args:
-        final_state: Final workflow state with results
+        tickers: Stock symbols to sync
+        interval: Bar size, e.g. "1d" or "1h"
+        
+    Returns:
+        Number of bars appended per ticker
+    """
+    from .utils.prices import PriceStore
+    from .utils.scheduler import UpstreamScheduler
+    
+    load_dotenv()
+    config = AppConfig.from_environment()
+    _setup(config)
+    # Explicit syncs work whether or not PRICE_HISTORY feeds the analyses
+    store = PriceStore(
+        config.prices.path,
+        backfill=config.prices.backfill,
+        chunk_size=config.prices.chunk_size,
+        scheduler=UpstreamScheduler.from_config(config.scheduler)
+    )
+    
+    started = time.perf_counter()
+    appended = store.sync(tickers, interval)
+    empty = sorted(ticker for ticker in tickers if store.last_timestamp(ticker, interval) is None)
+    print(
+        f"Synced {len(appended)} tickers ({interval}): {sum(appended.values())} new bars "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    if empty:
+        print(f"No price history for: {', '.join(empty)}")
+    return appended
+
+
+def check_startup() -> int:
+    """
+    Measure cold-start cost without fetching data or calling the LLM.
+    
+    Times each startup phase: importing the workflow stack, loading the
+    configuration, constructing the workflow and compiling its graph.
+    
+    Returns:
+        Process exit code, non-zero if any phase failed
     """
-    # Implementation for saving results
-    # Could save to JSON file, database, etc.
-    import json
-    import datetime
+    def timed(label, step):
+        start = time.perf_counter()
+        try:
+            result = step()
+        except Exception as e:
+            print(f"{label:<16} FAILED: {e}")
+            raise
+        print(f"{label:<16} {(time.perf_counter() - start) * 1000:8.1f} ms")
+        return result
     
-    filename = f"analysis_{final_state['ticker']}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    total = time.perf_counter()
+    try:
+        workflow_module = timed("import", lambda: importlib.import_module(".core.workflow", __package__))
+        config = timed("config", lambda: (load_dotenv(), AppConfig.from_environment())[1])
+        workflow = timed("workflow", lambda: workflow_module.TradingWorkflow(config))
+        timed("graph", lambda: workflow.app)
+    except Exception:
+        return 1
+    print(f"{'total':<16} {(time.perf_counter() - total) * 1000:8.1f} ms")
+    return 0
+
+
+def serve_main(host: Optional[str] = None, port: Optional[int] = None):
+    """
+    Server entry point: keep a warm workflow and serve analyses until interrupted.
     
-    results = {
-        "ticker": final_state["ticker"],
-        "analysis": final_state["sentiment_analysis"],
-        "critic_feedback": final_state["critic_feedback"],
-        "timestamp": datetime.datetime.now().isoformat(),
-        "iterations": final_state["iterations"]
-    }
+    Args:
+        host: Interface to bind, defaults to config
+        port: Port to listen on, defaults to config
+    """
+    from .core.workflow import TradingWorkflow
+    from .server import DeskServer
     
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2)
+    load_dotenv()
+    config = AppConfig.from_environment()
+    if host is not None:
+        config.server.host = host
+    if port is not None:
+        config.server.port = port
+    _setup(config)
     
-    print(f"Results saved to {filename}")
+    server = DeskServer(TradingWorkflow(config), config.server)
+    host, port = server.address
+    print(f"Trader desk serving on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
 
 
-def cli_main():
+def cli_main(argv: Optional[List[str]] = None):
     """CLI entry point that handles command line arguments."""
-    ticker = sys.argv[1] if len(sys.argv) > 1 else "AAPL"
-    main(ticker)
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        serve_parser = argparse.ArgumentParser(
+            prog="trader-desk serve",
+            description="Serve analyses over local HTTP from a warm workflow"
+        )
+        serve_parser.add_argument("--host", default=None, help="Interface to bind (default: SERVER_HOST)")
+        serve_parser.add_argument("--port", type=int, default=None, help="Port to listen on (default: SERVER_PORT)")
+        serve_args = serve_parser.parse_args(argv[1:])
+        serve_main(serve_args.host, serve_args.port)
+        return
+    if argv[:1] == ["prices"]:
+        prices_parser = argparse.ArgumentParser(
+            prog="trader-desk prices",
+            description="Backfill or incrementally refresh the local OHLCV history"
+        )
+        prices_parser.add_argument("tickers", nargs="*", help="Stock symbols to sync")
+        prices_parser.add_argument("--file", default=None,
+                                   help="Read symbols from this file (one per line or comma separated)")
+        prices_parser.add_argument("--interval", default="1d", help="Bar size, e.g. 1d, 1h, 5m (default: 1d)")
+        prices_args = prices_parser.parse_args(argv[1:])
+        tickers = list(prices_args.tickers)
+        if prices_args.file:
+            with open(prices_args.file, encoding="utf-8") as fh:
+                tickers += [t.strip().upper() for t in fh.read().replace(",", "\n").splitlines() if t.strip()]
+        if not tickers:
+            prices_parser.error("no tickers given")
+        prices_main(tickers, prices_args.interval)
+        return
+    if argv[:1] == ["history"]:
+        history_parser = argparse.ArgumentParser(
+            prog="trader-desk history",
+            description="List stored analyses (written when SAVE_RESULTS=true)"
+        )
+        history_parser.add_argument("ticker", nargs="?", default=None, help="Only runs for this stock symbol")
+        history_parser.add_argument("--verdict", choices=["APPROVE", "REVISE", "TRUNCATED"], type=str.upper, default=None,
+                                    help="Only runs with this critic verdict")
+        history_parser.add_argument("--days", type=float, default=None, help="Only runs from the last N days")
+        history_parser.add_argument("--limit", type=int, default=20, help="Maximum number of runs to list")
+        history_args = history_parser.parse_args(argv[1:])
+        history_main(history_args.ticker, history_args.verdict, history_args.days, history_args.limit)
+        return
+    
+    parser = argparse.ArgumentParser(
+        prog="trader-desk",
+        description=__doc__.strip().splitlines()[0],
+        epilog="Run 'trader-desk serve --help' for the long-running server mode, "
+               "'trader-desk history --help' to query stored analyses and "
+               "'trader-desk prices --help' to sync the local price history."
+    )
+    parser.add_argument("tickers", nargs="*", default=["AAPL"], help="Stock symbols to analyze")
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help="Maximum number of tickers analyzed at once (batch mode)"
+    )
+    parser.add_argument(
+        "--processes", type=int, default=None, metavar="N",
+        help="Shard the batch across N worker processes (default: BATCH_PROCESSES, 0 = this process)"
+    )
+    parser.add_argument(
+        "--screen", type=int, default=None, metavar="N",
+        help="Screen the tickers on bulk price data and analyze only the top N"
+    )
+    parser.add_argument(
+        "--run-id", default=None,
+        help="Checkpoint id of the run (batch id in batch mode); reuse it to resume (needs CHECKPOINTING=true)"
+    )
+    parser.add_argument(
+        "--no-stream", dest="stream", action="store_false",
+        help="Print the report once it is final instead of streaming it as it is generated (single ticker)"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Report startup/import timings and exit without running an analysis"
+    )
+    args = parser.parse_args(argv)
+    
+    if args.check:
+        raise SystemExit(check_startup())
+    
+    if len(args.tickers) == 1 and not args.screen:
+        main(args.tickers[0], args.run_id, args.stream)
+    else:
+        main_batch(args.tickers, args.concurrency, args.screen, args.run_id, args.processes)
 
 
 if __name__ == "__main__":
@@ -1,35 +1,501 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from typing import Dict, Any
+import asyncio
+import functools
+import logging
+import time
+from dataclasses import dataclass
 
-from ..core.types import AgentState
+from langchain_core.messages import AIMessageChunk
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Iterator, List, Optional
 
+from ..core.budget import BudgetExceeded, RunBudget, current_budget
+from ..core.types import AgentState, FinancialData
+from ..utils.llm_cache import LLMResponseCache
+from ..utils.metrics import MetricsRecorder
+from ..utils.scheduler import UpstreamScheduler
+from .precheck import check_report, format_feedback
+from .prompting import PromptAssembler, estimate_tokens, extract_feedback_items, is_approved
+from .streaming import GenerationCancelled, TokenStream, current_stream
 
-class FinancialAnalyst:
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_chat_model(model: str, temperature: float) -> "BaseChatModel":
+    """
+    Process-wide OpenAI chat client for a model/temperature pair.
+    
+    langchain_openai is imported on the first call, and nodes configured
+    alike share one client and its HTTP connection pool. The client does not
+    retry on its own; retries go through the UpstreamScheduler so they
+    respect the shared rate limits.
+    """
+    from langchain_openai import ChatOpenAI
+    # stream_usage: report token usage on streamed responses as well
+    return ChatOpenAI(model=model, temperature=temperature, max_retries=0, stream_usage=True)
+
+
+@dataclass
+class _LLMCall:
+    """State of one :meth:`LLMNode._invoke` call, shared by its attempts."""
+    prompt: ChatPromptTemplate
+    stream: Optional[TokenStream]
+    budget: Optional[RunBudget]
+    key: Optional[str]
+    cached: Optional[str] = None
+    estimate: int = 0
+    attempts: int = 0
+    
+    @property
+    def streaming(self) -> bool:
+        """Whether the model output is streamed: for a listener, or to stop at the budget."""
+        return self.stream is not None or self.budget is not None
+
+
+class LLMNode:
+    """
+    Base class for nodes backed by a single prompt and chat model.
+    
+    Subclasses set ``self.prompt``; calls go through :meth:`_invoke` and
+    :meth:`_ainvoke`, which serve repeated requests from the response cache,
+    stream the generation when a TokenStream is active, and charge the
+    current run's budget, streaming as well so a call can be cut short once
+    the budget runs out.
+    """
+    
+    # Graph node this LLM node runs as; labels its streamed tokens
+    node_name = "LLM"
+    
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo",
+        temperature: float = 0,
+        response_cache: Optional[LLMResponseCache] = None,
+        token_budget: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        llm: Optional["BaseChatModel"] = None,
+        scheduler: Optional[UpstreamScheduler] = None
+    ):
+        """
+        Initialize the node's chat model.
+        
+        Args:
+            model: LLM model to use
+            temperature: Temperature setting for response generation
+            response_cache: Optional cache of previous LLM responses
+            token_budget: Maximum estimated prompt tokens per call
+            metrics: Recorder for LLM latency and token usage
+            llm: Chat model to use, defaults to the shared client for model/temperature
+            scheduler: Rate limiter and retry scheduler for LLM calls
+        """
+        self.model = model
+        self.temperature = temperature
+        self._llm = llm
+        self.response_cache = response_cache
+        self.assembler = PromptAssembler(token_budget)
+        self.metrics = metrics or MetricsRecorder()
+        self.scheduler = scheduler
+    
+    @property
+    def llm(self) -> "BaseChatModel":
+        """Chat model backing this node, created on first use."""
+        if self._llm is None:
+            self._llm = shared_chat_model(self.model, self.temperature)
+        return self._llm
+    
+    @llm.setter
+    def llm(self, llm: "BaseChatModel") -> None:
+        self._llm = llm
+    
+    def _record_usage(self, response: Any) -> None:
+        """Record prompt/completion token counts reported by the provider."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        node = type(self).__name__
+        if "input_tokens" in usage:
+            self.metrics.record("llm_tokens", usage["input_tokens"], node=node, kind="prompt")
+        if "output_tokens" in usage:
+            self.metrics.record("llm_tokens", usage["output_tokens"], node=node, kind="completion")
+    
+    def _estimate_tokens(self, prompt: ChatPromptTemplate, inputs: Dict[str, Any]) -> int:
+        """Estimated prompt tokens of a call, charged against the provider's token budget."""
+        return self.assembler.static_tokens(prompt) + sum(
+            estimate_tokens(str(value)) for value in inputs.values()
+        )
+    
+    def _charge(self, budget: Optional[RunBudget], response: Any, estimate: int) -> None:
+        """Charge the run budget for a call, estimating usage the provider did not report."""
+        if budget is None:
+            return
+        usage = getattr(response, "usage_metadata", None) or {}
+        budget.charge(
+            usage.get("input_tokens", estimate),
+            usage.get("output_tokens", estimate_tokens(response.content if isinstance(response.content, str) else ""))
+        )
+    
+    def _settle(self, response: Any, estimate: int) -> None:
+        """Charge the token budget for actual usage beyond the admission estimate."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        if self.scheduler is not None and "total_tokens" in usage:
+            self.scheduler.settle("openai", usage["total_tokens"] - estimate)
+    
+    def _cache_key(self, prompt: ChatPromptTemplate, inputs: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache key for a call, or None when no response cache is configured.
+        
+        Sampling above temperature 0 is meant to vary between calls, so those
+        responses are never cached or served from the cache.
+        """
+        if self.response_cache is None or self.temperature != 0:
+            return None
+        return LLMResponseCache.make_key(self.model, self.temperature, prompt, inputs)
+    
+    def _check_cancelled(self, stream: Optional[TokenStream], response: Any = None) -> None:
+        """Raise GenerationCancelled, with the text generated so far, if the stream was cancelled."""
+        if stream is not None and stream.cancelled:
+            raise GenerationCancelled(self.node_name, getattr(response, "content", "") or "")
+    
+    def _check_budget(self, budget: Optional[RunBudget], estimate: int, response: Any = None) -> None:
+        """
+        Raise BudgetExceeded if the call in progress would overrun the run budget.
+        
+        A call cut short is charged for its prompt and the text generated so
+        far, which the exception carries.
+        """
+        if budget is None:
+            return
+        partial = getattr(response, "content", "") or ""
+        generated = estimate_tokens(partial) if response is not None else 0
+        reason = budget.exceeded(estimate, generated)
+        if reason is None:
+            return
+        if response is not None:
+            budget.charge(estimate, generated)
+        self.metrics.record("run_budget_exceeded", 1, node=type(self).__name__, reason=reason)
+        raise BudgetExceeded(reason, partial)
+    
+    def _on_chunk(
+        self,
+        response: Any,
+        chunk: Any,
+        stream: Optional[TokenStream],
+        started: float,
+        budget: Optional[RunBudget],
+        estimate: int
+    ) -> Any:
+        """Merge a streamed chunk into the response so far, forward it and check for an early stop."""
+        if response is None:
+            self.metrics.record("llm_first_token_seconds", time.perf_counter() - started, node=type(self).__name__)
+        response = chunk if response is None else response + chunk
+        if stream is not None:
+            stream.emit(self.node_name, chunk.content if isinstance(chunk.content, str) else "")
+        self._check_cancelled(stream, response)
+        self._check_budget(budget, estimate, response)
+        return response
+    
+    def _collect(
+        self,
+        chunks: Iterator[Any],
+        stream: Optional[TokenStream],
+        started: float,
+        budget: Optional[RunBudget] = None,
+        estimate: int = 0
+    ) -> Any:
+        """Forward streamed chunks to the token stream and merge them into one response."""
+        response = None
+        try:
+            for chunk in chunks:
+                response = self._on_chunk(response, chunk, stream, started, budget, estimate)
+        finally:
+            # Closing the generator closes the provider connection when we stop early
+            chunks.close()
+        return response if response is not None else AIMessageChunk(content="")
+    
+    async def _acollect(
+        self,
+        chunks: AsyncIterator[Any],
+        stream: Optional[TokenStream],
+        started: float,
+        budget: Optional[RunBudget] = None,
+        estimate: int = 0
+    ) -> Any:
+        """
+        Asynchronous counterpart of :meth:`_collect`.
+        
+        Under a run deadline, waiting for the next chunk is cancelled at the
+        deadline too, so a stalled generation does not outlive the run.
+        """
+        response = None
+        try:
+            while True:
+                try:
+                    chunk = await self._next_chunk(chunks, budget, estimate, response)
+                except StopAsyncIteration:
+                    break
+                response = self._on_chunk(response, chunk, stream, started, budget, estimate)
+        finally:
+            await chunks.aclose()
+        return response if response is not None else AIMessageChunk(content="")
+    
+    async def _next_chunk(
+        self,
+        chunks: AsyncIterator[Any],
+        budget: Optional[RunBudget],
+        estimate: int,
+        response: Any
+    ) -> Any:
+        """Next streamed chunk, raising BudgetExceeded if the run deadline passes first."""
+        remaining = None if budget is None else budget.remaining_seconds()
+        if remaining is None:
+            return await chunks.__anext__()
+        try:
+            return await asyncio.wait_for(chunks.__anext__(), remaining)
+        except asyncio.TimeoutError:
+            partial = getattr(response, "content", "") or ""
+            budget.charge(estimate, estimate_tokens(partial))
+            self.metrics.record("run_budget_exceeded", 1, node=type(self).__name__, reason="deadline")
+            raise BudgetExceeded("deadline", partial) from None
+    
+    def _prepare(self, inputs: Dict[str, Any], prompt: Optional[ChatPromptTemplate]) -> _LLMCall:
+        """
+        Set up a call: check for cancellation, look up the response cache and
+        admit the prompt against the run budget.
+        
+        A cached response is emitted to the token stream as one chunk and
+        returned in ``cached``; the call then needs no model request.
+        """
+        prompt = prompt or self.prompt
+        call = _LLMCall(prompt, current_stream(), current_budget(), self._cache_key(prompt, inputs))
+        self._check_cancelled(call.stream)
+        if call.key is not None:
+            call.cached = self.response_cache.get(call.key)
+            if call.cached is not None:
+                if call.stream is not None:
+                    call.stream.emit(self.node_name, call.cached)
+                return call
+        call.estimate = self._estimate_tokens(prompt, inputs)
+        self._check_budget(call.budget, call.estimate)
+        return call
+    
+    def _start_attempt(self, call: _LLMCall) -> float:
+        """
+        Begin a request for ``call``; returns its start time.
+        
+        A retry first tells the token stream to discard the text streamed by
+        the failed attempt, since the new one streams from the start.
+        """
+        if call.attempts and call.stream is not None:
+            call.stream.restart(self.node_name)
+        call.attempts += 1
+        return time.perf_counter()
+    
+    def _finish(self, call: _LLMCall, response: Any) -> str:
+        """Account for a completed call's usage and cache its content."""
+        self._record_usage(response)
+        self._settle(response, call.estimate)
+        self._charge(call.budget, response, call.estimate)
+        content = response.content
+        if call.key is not None:
+            self.response_cache.set(call.key, content)
+        return content
+    
+    def _invoke(self, inputs: Dict[str, Any], prompt: Optional[ChatPromptTemplate] = None) -> str:
+        """
+        Run a prompt through the chat model, using the response cache if available.
+        
+        With an active TokenStream the response is streamed to it chunk by
+        chunk (a cached response arrives as one chunk); a retried call
+        restarts the stream (see :meth:`TokenStream.restart`) and streams
+        again from the start. Under a run budget the call is refused when its
+        prompt alone would overrun the budget, and cut short between chunks
+        once the budget runs out. Cached responses cost nothing.
+        
+        Args:
+            inputs: Prompt variables
+            prompt: Prompt to use instead of ``self.prompt``
+            
+        Returns:
+            Content of the model response
+            
+        Raises:
+            GenerationCancelled: If the token stream is cancelled before or during generation
+            BudgetExceeded: If the run budget runs out before or during generation
+        """
+        call = self._prepare(inputs, prompt)
+        if call.cached is not None:
+            return call.cached
+        chain = call.prompt | self.llm
+        
+        def attempt() -> Any:
+            started = self._start_attempt(call)
+            with self.metrics.timer("upstream_latency_seconds", provider="openai", source=type(self).__name__):
+                if not call.streaming:
+                    return chain.invoke(inputs)
+                return self._collect(chain.stream(inputs), call.stream, started, call.budget, call.estimate)
+        
+        if self.scheduler is None:
+            response = attempt()
+        else:
+            response = self.scheduler.call("openai", attempt, tokens=call.estimate)
+        return self._finish(call, response)
+    
+    async def _ainvoke(self, inputs: Dict[str, Any], prompt: Optional[ChatPromptTemplate] = None) -> str:
+        """Asynchronous counterpart of :meth:`_invoke`."""
+        call = self._prepare(inputs, prompt)
+        if call.cached is not None:
+            return call.cached
+        chain = call.prompt | self.llm
+        
+        async def attempt() -> Any:
+            started = self._start_attempt(call)
+            with self.metrics.timer("upstream_latency_seconds", provider="openai", source=type(self).__name__):
+                if not call.streaming:
+                    return await chain.ainvoke(inputs)
+                return await self._acollect(chain.astream(inputs), call.stream, started, call.budget, call.estimate)
+        
+        if self.scheduler is None:
+            response = await attempt()
+        else:
+            response = await self.scheduler.acall("openai", attempt, tokens=call.estimate)
+        return self._finish(call, response)
+
+
+class FinancialAnalyst(LLMNode):
     """
     Handles financial analysis using LLM-based reasoning.
     """
     
-    def __init__(self, model: str = "gpt-4-turbo", temperature: float = 0):
+    node_name = "Analyst"
+    
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo",
+        temperature: float = 0,
+        response_cache: Optional[LLMResponseCache] = None,
+        token_budget: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        llm: Optional["BaseChatModel"] = None,
+        scheduler: Optional[UpstreamScheduler] = None
+    ):
         """
         Initialize the financial analyst with specified LLM configuration.
         
         Args:
             model: LLM model to use for analysis
             temperature: Temperature setting for response generation
+            response_cache: Optional cache of previous LLM responses
+            token_budget: Maximum estimated prompt tokens per call
+            metrics: Recorder for LLM latency and token usage
+            llm: Chat model to use, defaults to the shared client for model/temperature
+            scheduler: Rate limiter and retry scheduler for LLM calls
         """
-        self.llm = ChatOpenAI(model=model, temperature=temperature)
+        super().__init__(model, temperature, response_cache, token_budget, metrics, llm, scheduler)
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a Senior Financial Analyst. Your task is to analyze raw financial data and provide high-level insights.
 
     You must follow these reasoning steps (Chain of Thought):
     1. **Data Overview**: Summarize the key data points provided.
-    2. **Trend Identification**: Is there an upward, downward, or stable trend? Explain why.
+    2. **Trend Identification**: Is there an upward, downward, or stable trend? Explain why, using the price history and technical indicators (moving averages, RSI, MACD, volatility, drawdown) when they are provided, and compare it with the market and sector context when it is provided.
     3. **Risk Assessment**: What are the potential risks or red flags identified in this data?
 
     Write your analysis in a professional, objective, and structured manner."""),
+            # Batch runs share one market context; placed before the ticker's
+            # data, it extends the prefix every call in the batch has in common
+            MessagesPlaceholder("market_context", optional=True),
             ("user", "Here is the data for {ticker}: {financial_data}")
         ])
+        # Follow-up prompts share the system, market and data messages with
+        # the main prompt, so the provider can reuse that cached prefix
+        system_message, market_message, data_message = self.prompt.messages
+        
+        # Incremental mode: update a previous report instead of starting over
+        self.delta_prompt = ChatPromptTemplate.from_messages([
+            system_message,
+            market_message,
+            data_message,
+            ("user", """YOUR PREVIOUS ANALYSIS:
+{previous_analysis}
+
+MATERIAL CHANGES SINCE THEN:
+{material_changes}
+
+Update your previous analysis to reflect these changes. Keep the parts that are still accurate.""")
+        ])
+        
+        # Refinement loop: revise the last draft using the critic's feedback
+        self.refine_prompt = ChatPromptTemplate.from_messages([
+            system_message,
+            market_message,
+            data_message,
+            ("user", """YOUR PREVIOUS DRAFT:
+{previous_draft}
+
+EDITOR FEEDBACK TO ADDRESS:
+{feedback}
+
+Revise the draft so that every feedback item is addressed.""")
+        ])
+        
+    def _is_delta(self, state: AgentState) -> bool:
+        """Whether this call should update a previous report (first pass of an incremental run)."""
+        return (
+            state.get('iterations', 0) == 0
+            and bool(state.get('previous_analysis'))
+            and bool(state.get('material_changes'))
+        )
+    
+    def _feedback_items(self, state: AgentState) -> List[str]:
+        """Critic feedback items to address on a refinement pass."""
+        feedback = state.get('critic_feedback', '')
+        if state.get('iterations', 0) == 0 or not state.get('sentiment_analysis') or not feedback:
+            return []
+        items = extract_feedback_items(feedback)
+        if not items and not is_approved(feedback):
+            items = [feedback.strip()]
+        return items
+    
+    def _prompt_for(self, state: AgentState) -> ChatPromptTemplate:
+        """Select the full, delta or refinement prompt for an analysis call."""
+        if self._is_delta(state):
+            return self.delta_prompt
+        if self._feedback_items(state):
+            return self.refine_prompt
+        return self.prompt
+    
+    def _chain_inputs(self, state: AgentState, current_iter: int) -> Dict[str, Any]:
+        """Build the prompt variables for an analysis call, within the token budget."""
+        prompt = self._prompt_for(state)
+        inputs = {
+            "ticker": state["ticker"],
+            "iterations": current_iter,
+        }
+        if prompt is self.delta_prompt:
+            inputs["previous_analysis"] = state["previous_analysis"]
+            inputs["material_changes"] = "\n".join(f"- {change}" for change in state["material_changes"])
+        elif prompt is self.refine_prompt:
+            inputs["previous_draft"] = state["sentiment_analysis"]
+            inputs["feedback"] = "\n".join(f"- {item}" for item in self._feedback_items(state))
+        
+        other_inputs = [v for v in inputs.values() if isinstance(v, str)]
+        market_context = state.get("market_context")
+        if market_context is not None:
+            market_text = f"Market context shared by every stock you analyze today:\n{market_context.prompt_text}"
+            inputs["market_context"] = [("user", market_text)]
+            other_inputs.append(market_text)
+        
+        inputs["financial_data"] = self.assembler.fit_financial_data(state["financial_data"], prompt, *other_inputs)
+        return inputs
+    
+    def _build_update(self, state: AgentState, content: str, current_iter: int) -> Dict[str, Any]:
+        """Build the state update returned by the analyst node."""
+        return {
+            "sentiment_analysis": content,
+            "financial_data": state["financial_data"],
+            "messages": [f"Analysis completed for {state['ticker']}."],
+            "iterations": current_iter
+        }
         
     def analyze(self, state: AgentState) -> Dict[str, Any]:
         """
@@ -41,39 +507,64 @@ class FinancialAnalyst:
         Returns:
             Dictionary with sentiment analysis results and updated messages
         """
-        print(f"--- Analyst is processing data for {state['ticker']} ---")
+        logger.info("Analyst is processing data", extra={"ticker": state['ticker']})
         current_iter = state.get('iterations', 0) + 1
 
-        chain = self.prompt | self.llm
+        content = self._invoke(self._chain_inputs(state, current_iter), self._prompt_for(state))
 
-        response = chain.invoke({
-            "ticker": state["ticker"],
-            "financial_data": state["financial_data"],
-            "iterations": current_iter,
-        })
+        return self._build_update(state, content, current_iter)
 
-        return {
-            "sentiment_analysis": response.content,
-            "financial_data": state["financial_data"],
-            "messages": [f"Analysis completed for {state['ticker']}."],
-            "iterations": current_iter
-        }
+    async def aanalyze(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of :meth:`analyze`.
+        
+        Args:
+            state: Current agent state with financial data
+            
+        Returns:
+            Dictionary with sentiment analysis results and updated messages
+        """
+        logger.info("Analyst is processing data", extra={"ticker": state['ticker']})
+        current_iter = state.get('iterations', 0) + 1
+
+        content = await self._ainvoke(self._chain_inputs(state, current_iter), self._prompt_for(state))
 
+        return self._build_update(state, content, current_iter)
 
-class ReportCritic:
+
+class ReportCritic(LLMNode):
     """
     Handles quality assurance and feedback for financial analysis reports.
     """
     
-    def __init__(self, model: str = "gpt-4-turbo", temperature: float = 0):
+    node_name = "Critic"
+    
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo",
+        temperature: float = 0,
+        response_cache: Optional[LLMResponseCache] = None,
+        token_budget: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        llm: Optional["BaseChatModel"] = None,
+        scheduler: Optional[UpstreamScheduler] = None,
+        precheck: bool = True
+    ):
         """
         Initialize the report critic with specified LLM configuration.
         
         Args:
             model: LLM model to use for criticism
             temperature: Temperature setting for response generation
+            response_cache: Optional cache of previous LLM responses
+            token_budget: Maximum estimated prompt tokens per call
+            metrics: Recorder for LLM latency and token usage
+            llm: Chat model to use, defaults to the shared client for model/temperature
+            scheduler: Rate limiter and retry scheduler for LLM calls
+            precheck: Check the data rubric items locally before calling the LLM
         """
-        self.llm = ChatOpenAI(model=model, temperature=temperature)
+        super().__init__(model, temperature, response_cache, token_budget, metrics, llm, scheduler)
+        self.precheck = precheck
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a Senior Investment Editor. Your goal is to ensure that the Financial Analyst's report is data-driven, logical, and complete.
 
@@ -97,24 +588,106 @@ ANALYST'S REPORT TO REVIEW:
 """)
         ])
         
+        # Used once the precheck has verified the data items (rubric 1-2 and
+        # the figures of 3), so the model only judges the reasoning
+        self.subjective_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a Senior Investment Editor. Your goal is to ensure that the Financial Analyst's report is logical and professional.
+
+An automated check has already verified that the report quotes the Current Price, P/E Ratio, Market Cap, 52-Week Change versus the S&P 500, Analyst Price Targets, Risk Score and Debt to Equity correctly. Do not re-check those figures.
+
+### EVALUATION RUBRIC:
+1. **Reasoning**: Do the trend and risk conclusions follow from the data?
+2. **Risk/Reward Balance**: Does the report actually weigh the 'Analyst Price Targets' (Reward) against the 'Risk Score' and 'Debt to Equity' (Risk), rather than just listing them?
+3. **Professionalism**: Is the summary concise and free of generic fluff?
+
+### OUTPUT INSTRUCTIONS:
+- If ALL rubric items are met, respond with ONLY the word: **APPROVE**.
+- If the logic is flawed, respond with: **FEEDBACK: [List specific logical errors]**.
+
+**Note**: Be firm but fair. If the report is 90% there, APPROVE it. Do not be pedantic about style, only focus on substance."""),
+            self.prompt.messages[1]
+        ])
+        
+    def _precheck(self, state: AgentState) -> Optional[List[str]]:
+        """
+        Check the data rubric items locally.
+        
+        Returns:
+            Feedback items (empty when every item passed), or None when the
+            precheck is disabled or there is no structured data to check against
+        """
+        data = state.get("financial_data")
+        if not self.precheck or not isinstance(data, FinancialData):
+            return None
+        items = check_report(state["sentiment_analysis"], data)
+        self.metrics.record("critic_precheck", 1, outcome="rejected" if items else "passed")
+        return items
+    
+    def _local_verdict(self, items: List[str]) -> str:
+        """Feedback verdict for precheck failures, streamed like a generated one."""
+        content = format_feedback(items)
+        stream = current_stream()
+        if stream is not None:
+            stream.emit(self.node_name, content)
+        return content
+    
+    def _prompt_for(self, items: Optional[List[str]]) -> ChatPromptTemplate:
+        """Full rubric prompt, or the subjective-only prompt once the precheck has passed."""
+        return self.prompt if items is None else self.subjective_prompt
+    
+    def _chain_inputs(self, state: AgentState, prompt: Optional[ChatPromptTemplate] = None) -> Dict[str, Any]:
+        """Build the prompt variables for a review call, within the token budget."""
+        return {
+            "sentiment_analysis": state["sentiment_analysis"], 
+            "financial_data": self.assembler.fit_financial_data(
+                state["financial_data"], prompt or self.prompt, state["sentiment_analysis"]
+            )
+        }
+    
+    def _build_update(self, content: str) -> Dict[str, Any]:
+        """Build the state update returned by the critic node."""
+        return {
+            "critic_feedback": content,
+            "messages": ["Reviewing Done"]
+        }
+        
     def review(self, state: AgentState) -> Dict[str, Any]:
         """
         Review and provide feedback on the financial analysis report.
         
+        Reports that miss or misquote a data rubric item are sent back with
+        the precheck's feedback without an LLM call.
+        
         Args:
             state: Current agent state with analysis to review
             
         Returns:
             Dictionary with critic feedback and updated messages
         """
-        print("--- Reviewing Report ---")
-        chain = self.prompt | self.llm
-        response = chain.invoke({
-            "sentiment_analysis": state["sentiment_analysis"], 
-            "financial_data": state["financial_data"]
-        })
+        logger.info("Reviewing report", extra={"ticker": state['ticker']})
+        items = self._precheck(state)
+        if items:
+            return self._build_update(self._local_verdict(items))
+        prompt = self._prompt_for(items)
+        content = self._invoke(self._chain_inputs(state, prompt), prompt)
 
-        return {
-            "critic_feedback": response.content,
-            "messages": ["Reviewing Done"]
-        }
\ No newline at end of file
+        return self._build_update(content)
+
+    async def areview(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of :meth:`review`.
+        
+        Args:
+            state: Current agent state with analysis to review
+            
+        Returns:
+            Dictionary with critic feedback and updated messages
+        """
+        logger.info("Reviewing report", extra={"ticker": state['ticker']})
+        items = self._precheck(state)
+        if items:
+            return self._build_update(self._local_verdict(items))
+        prompt = self._prompt_for(items)
+        content = await self._ainvoke(self._chain_inputs(state, prompt), prompt)
+
+        return self._build_update(content)
@@ -0,0 +1,163 @@
+"""
+Deterministic pre-critic: checks the mechanical rubric items of a report against the structured data.
+
+The LLM critic's rubric asks whether the report cites specific figures.
+Those checks need no model: the figures are in FinancialData, and the
+report either quotes them (within rounding) or it does not. Reports that
+fail are sent back with specific feedback and never reach the LLM critic,
+which then only has to judge the subjective items.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from ..core.types import FinancialData
+
+_MULTIPLIERS = {
+    "trillion": 1e12, "tn": 1e12, "t": 1e12,
+    "billion": 1e9, "bn": 1e9, "b": 1e9,
+    "million": 1e6, "mn": 1e6, "m": 1e6,
+}
+
+_NUMBER = re.compile(
+    r"(?<![\w.])[-+−]?\$?\s?(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?"
+    r"\s*(%|percent\b|trillion\b|billion\b|million\b|tn\b|bn\b|mn\b|[tbm]\b)?",
+    flags=re.IGNORECASE
+)
+
+
+def extract_numbers(text: str) -> Tuple[List[float], List[float]]:
+    """
+    Find the numbers quoted in a report.
+
+    Signs are ignored, since reports write declines as "down 12%" as often
+    as "-12%". Magnitude words and suffixes (billion, bn, B, ...) are applied.
+
+    Args:
+        text: Report text
+
+    Returns:
+        Tuple of (plain numbers, percentages)
+    """
+    plain, percents = [], []
+    for match in _NUMBER.finditer(text):
+        value = float(match.group(1).replace(",", "") + (match.group(2) or ""))
+        suffix = (match.group(3) or "").lower()
+        if suffix in ("%", "percent"):
+            percents.append(value)
+        else:
+            plain.append(value * _MULTIPLIERS.get(suffix, 1.0))
+    return plain, percents
+
+
+def _close(candidates: Sequence[float], target: float, rel_tol: float, abs_tol: float) -> bool:
+    target = abs(target)
+    return any(abs(value - target) <= max(rel_tol * target, abs_tol) for value in candidates)
+
+
+@dataclass(frozen=True)
+class RubricCheck:
+    """
+    One mechanical rubric item.
+
+    Attributes:
+        label: How the item is named in feedback
+        keywords: Pattern the report must contain to mention the item
+        value: Extracts the expected figure(s) from the data; None or an empty
+            tuple skips the check, since the report cannot cite missing data
+        percent: Whether the figures are quoted as percentages
+        rel_tol: Relative tolerance for rounding in the report
+        abs_tol: Absolute tolerance for rounding in the report
+        display: Format of the expected figure quoted in feedback
+        figure_mentions: Whether quoting the expected figure counts as mentioning
+            the item even without its keywords
+    """
+    label: str
+    keywords: str
+    value: Callable[[FinancialData], Optional[Tuple[float, ...]]]
+    percent: bool = False
+    rel_tol: float = 0.01
+    abs_tol: float = 0.0
+    display: str = "{:,.2f}"
+    figure_mentions: bool = False
+
+    def expected(self, data: FinancialData) -> Tuple[float, ...]:
+        return tuple(v for v in (self.value(data) or ()) if v is not None)
+
+    def feedback(self, report: str, plain: List[float], percents: List[float], data: FinancialData) -> Optional[str]:
+        """Feedback item when the report misses or misquotes this item, else None."""
+        expected = self.expected(data)
+        if not expected:
+            return None
+        shown = " or ".join(self.display.format(v) for v in expected)
+        candidates = percents if self.percent else plain
+        quoted = any(_close(candidates, v, self.rel_tol, self.abs_tol) for v in expected)
+        if quoted and self.figure_mentions:
+            return None
+        if not re.search(self.keywords, report, flags=re.IGNORECASE):
+            return f"Mention the {self.label} ({shown})"
+        if not quoted:
+            return f"The {self.label} does not match the data: it should be {shown}"
+        return None
+
+
+def _pct(value: Optional[float]) -> Optional[float]:
+    return None if value is None else value * 100
+
+
+RUBRIC: Tuple[RubricCheck, ...] = (
+    # Data integrity
+    # "price" alone also matches "price target", so only the figure or an explicit phrase counts
+    RubricCheck("current price",
+                r"(?:current(?:ly)?|share|stock|last)\s+(?:share\s+|stock\s+)?price\b(?!\s*targets?)"
+                r"|trad(?:ing|es|ed)\s+(?:at|near|around)",
+                lambda d: (d.current_price,),
+                rel_tol=0.005, abs_tol=0.01, display="${:,.2f}", figure_mentions=True),
+    RubricCheck("forward P/E ratio", r"P\s*/\s*E\b|price[- ]to[- ]earnings|\bPE\b", lambda d: (d.pe_ratio,),
+                rel_tol=0.02, abs_tol=0.1),
+    RubricCheck("market cap", r"market\s*cap", lambda d: (d.market_cap,),
+                rel_tol=0.05, display="${:,.0f}"),
+    # Performance context
+    RubricCheck("52-week change", r"52[- ]week|one[- ]year|1[- ]year|12[- ]month",
+                lambda d: (_pct(d.change_52_weeks), _pct(d.relative_performance)),
+                percent=True, abs_tol=0.6, display="{:.2f}%"),
+    RubricCheck("S&P 500 comparison", r"S\s*&\s*P|S and P|SPX|\bindex\b|market (?:change|return)|broader market",
+                lambda d: (_pct(d.market_change_52_weeks), _pct(d.relative_performance)),
+                percent=True, abs_tol=0.6, display="{:.2f}%"),
+    # Risk/reward inputs
+    RubricCheck("analyst price targets", r"target",
+                lambda d: tuple(d.analyst_price_target.values()),
+                rel_tol=0.01, abs_tol=0.01, display="${:,.2f}"),
+    RubricCheck("risk score", r"risk\s*(?:score|rating)|overall risk",
+                lambda d: (None if d.risk_score is None else float(d.risk_score),),
+                abs_tol=0.01, display="{:.0f}/10"),
+    RubricCheck("debt-to-equity ratio", r"debt[- ]to[- ]equity|\bD\s*/\s*E\b",
+                lambda d: (d.debt_to_equity,), rel_tol=0.02, abs_tol=0.1),
+)
+
+
+def check_report(report: str, data: FinancialData, rubric: Sequence[RubricCheck] = RUBRIC) -> List[str]:
+    """
+    Check that a report cites every available rubric figure correctly.
+
+    Args:
+        report: Analyst report
+        data: Structured data the report was written from
+        rubric: Checks to apply
+
+    Returns:
+        Feedback items, empty when every mechanical item is satisfied
+    """
+    plain, percents = extract_numbers(report)
+    items = []
+    for check in rubric:
+        item = check.feedback(report, plain, percents, data)
+        if item is not None:
+            items.append(item)
+    return items
+
+
+def format_feedback(items: Sequence[str]) -> str:
+    """Render feedback items in the critic's ``FEEDBACK:`` format."""
+    return "FEEDBACK:\n" + "\n".join(f"{i}. {item}" for i, item in enumerate(items, start=1))
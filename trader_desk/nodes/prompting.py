@@ -0,0 +1,193 @@
+"""
+Prompt assembly for the Analyst and Critic: token budgets, news compaction and critic feedback.
+"""
+
+import re
+from dataclasses import replace
+from typing import Any, List, Optional, Sequence, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from ..core.types import FinancialData, NewsItem
+
+# Rough characters-per-token ratio for English prose with GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of tokens in a piece of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def dedupe_news(news: Sequence[NewsItem], max_items: int, snippet_chars: int) -> Tuple[NewsItem, ...]:
+    """
+    Drop duplicate headlines and trim snippets.
+
+    Args:
+        news: Headlines in relevance order
+        max_items: Maximum number of headlines to keep
+        snippet_chars: Maximum snippet length
+
+    Returns:
+        Unique, trimmed headlines
+    """
+    seen = set()
+    unique = []
+    for item in news:
+        key = _normalize(item.title) or _normalize(item.snippet)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(replace(item, snippet=item.snippet[:snippet_chars]))
+        if len(unique) >= max_items:
+            break
+    return tuple(unique)
+
+
+def extract_feedback_items(critic_feedback: str) -> List[str]:
+    """
+    Parse the items listed after ``FEEDBACK:`` in a critic verdict.
+
+    Args:
+        critic_feedback: Raw critic response
+
+    Returns:
+        Individual feedback items, empty if the verdict has no feedback
+    """
+    match = re.search(r"FEEDBACK\**\s*:\**", critic_feedback, flags=re.IGNORECASE)
+    if match is None:
+        return []
+
+    body = critic_feedback[match.end():].strip().strip("*[]").strip()
+    lines = [line.strip() for line in body.splitlines() if line.strip()]
+    if len(lines) == 1:
+        # Single-line feedback: split on list separators
+        lines = re.split(r";\s*|\s+(?=\d+[.)]\s)", lines[0])
+
+    items = []
+    for line in lines:
+        item = re.sub(r"^(?:[-*•]|\d+[.)])\s*", "", line).strip().strip("*[]").strip()
+        if item:
+            items.append(item)
+    return items
+
+
+_APPROVE = re.compile(r"\bAPPROVED?\b", flags=re.IGNORECASE)
+_NEGATED_APPROVE = re.compile(
+    r"\b(?:NOT|CANNOT|CAN'T|DON'T|WON'T|WOULD NOT|UNABLE TO)\s+(?:BE\s+)?APPROVED?\b", flags=re.IGNORECASE
+)
+
+
+def is_approved(critic_feedback: str) -> bool:
+    """
+    Whether a critic verdict approves the report.
+
+    A verdict approves when it says APPROVE (markdown allowed) without a
+    ``FEEDBACK:`` section or a negation such as "cannot approve"; a plain
+    substring check would also accept those.
+
+    Args:
+        critic_feedback: Raw critic response
+
+    Returns:
+        True if the report was approved
+    """
+    text = critic_feedback or ""
+    if re.search(r"FEEDBACK\**\s*:", text, flags=re.IGNORECASE):
+        return False
+    return bool(_APPROVE.search(text)) and not _NEGATED_APPROVE.search(text)
+
+
+class PromptAssembler:
+    """
+    Fits prompt inputs into a per-call token budget.
+
+    The static system prompt always comes first and the financial data
+    block is rendered identically on every iteration for a ticker, so the
+    provider's automatic prompt caching can reuse that prefix; per-iteration
+    content (drafts, feedback) is placed after it.
+    """
+
+    # Progressively more aggressive compaction steps for the data block:
+    # (business summary chars, max news items, news snippet chars)
+    COMPACTION_STEPS = (
+        (500, 5, 300),
+        (300, 4, 200),
+        (150, 3, 0),
+        (0, 3, 0),
+        (0, 0, 0),
+    )
+
+    def __init__(self, token_budget: Optional[int] = None):
+        """
+        Initialize the assembler.
+
+        Args:
+            token_budget: Maximum estimated prompt tokens per call, None for no limit
+        """
+        self.token_budget = token_budget
+        self._static_tokens = {}
+
+    def static_tokens(self, prompt: ChatPromptTemplate) -> int:
+        """Estimated tokens of a prompt's template text, memoized per prompt."""
+        key = id(prompt)
+        if key not in self._static_tokens:
+            self._static_tokens[key] = sum(
+                estimate_tokens(getattr(getattr(message, "prompt", None), "template", ""))
+                for message in prompt.messages
+            )
+        return self._static_tokens[key]
+
+    def fit_financial_data(
+        self,
+        financial_data: Any,
+        prompt: ChatPromptTemplate,
+        *other_inputs: str
+    ) -> str:
+        """
+        Render the financial data so the whole prompt stays within budget.
+
+        Args:
+            financial_data: FinancialData record (or pre-rendered text)
+            prompt: Prompt the data will be rendered into
+            other_inputs: Other variable text sent in the same prompt
+
+        Returns:
+            Data text for the prompt
+        """
+        if isinstance(financial_data, FinancialData):
+            # News dedupe/trim applies regardless of budget
+            summary_chars, max_news, snippet_chars = self.COMPACTION_STEPS[0]
+            data = replace(
+                financial_data,
+                business_summary=financial_data.business_summary[:summary_chars],
+                news=dedupe_news(financial_data.news, max_news, snippet_chars)
+            )
+        else:
+            data = financial_data
+        text = str(data)
+
+        if self.token_budget is None:
+            return text
+
+        available = self.token_budget - self.static_tokens(prompt) - sum(
+            estimate_tokens(other) for other in other_inputs
+        )
+        if estimate_tokens(text) <= available:
+            return text
+
+        if isinstance(data, FinancialData):
+            for summary_chars, max_news, snippet_chars in self.COMPACTION_STEPS[1:]:
+                text = str(replace(
+                    data,
+                    business_summary=data.business_summary[:summary_chars],
+                    news=dedupe_news(data.news, max_news, snippet_chars)
+                ))
+                if estimate_tokens(text) <= available:
+                    return text
+
+        return text[:max(available, 0) * CHARS_PER_TOKEN]
@@ -0,0 +1,100 @@
+"""
+Token streaming for the LLM nodes: live output to a listener, and early abort.
+
+A run opts in by activating a :class:`TokenStream` around its execution
+(:func:`streaming_tokens`); every LLM node called from that context then
+streams its generation chunk by chunk instead of waiting for the complete
+response. Like the upstream request priority, the stream travels in a
+context variable, so node signatures do not change.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+# Called with (graph node name, generated text chunk)
+TokenListener = Callable[[str, str], None]
+# Called with the graph node name when the node's generation starts over
+RestartListener = Callable[[str], None]
+
+
+class GenerationCancelled(Exception):
+    """Raised inside an LLM node when its token stream was cancelled mid-generation."""
+
+    def __init__(self, node: str, partial: str):
+        super().__init__(f"{node} generation cancelled after {len(partial)} characters")
+        self.node = node
+        self.partial = partial
+
+
+class TokenStream:
+    """
+    Receives LLM output as it is generated, and can cut the generation short.
+
+    Cancellation is checked after every chunk: calling :meth:`cancel` (from
+    any thread) or passing ``deadline`` stops the generation in progress,
+    closes the provider connection and raises GenerationCancelled in the node.
+
+    When a failed LLM call is retried, the new attempt streams its text from
+    the start; listeners are told first (:meth:`restart`) so they can drop
+    what the failed attempt had streamed.
+    """
+
+    def __init__(
+        self,
+        on_token: Optional[TokenListener] = None,
+        deadline: Optional[float] = None,
+        on_restart: Optional[RestartListener] = None
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            on_token: Called with (node name, text chunk) for every generated chunk
+            deadline: ``time.monotonic()`` after which generation is cancelled
+            on_restart: Called with the node name when the node's current
+                generation is discarded and retried
+        """
+        self.on_token = on_token
+        self.deadline = deadline
+        self.on_restart = on_restart
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop the current generation and any later one at its first chunk."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the stream was cancelled or its deadline has passed."""
+        return self._cancelled.is_set() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def emit(self, node: str, text: str) -> None:
+        """Pass a chunk of generated text to the listener."""
+        if self.on_token is not None and text:
+            self.on_token(node, text)
+
+    def restart(self, node: str) -> None:
+        """Tell the listener that the text ``node`` streamed so far is void; a retry follows."""
+        if self.on_restart is not None:
+            self.on_restart(node)
+
+
+_stream: "ContextVar[Optional[TokenStream]]" = ContextVar("trader_desk_token_stream", default=None)
+
+
+@contextmanager
+def streaming_tokens(stream: Optional[TokenStream]) -> Iterator[None]:
+    """Stream the output of LLM calls made in the enclosed block to ``stream`` (None: don't stream)."""
+    token = _stream.set(stream)
+    try:
+        yield
+    finally:
+        _stream.reset(token)
+
+
+def current_stream() -> Optional[TokenStream]:
+    """Token stream of LLM calls made from the current context, if any."""
+    return _stream.get()
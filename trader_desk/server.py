@@ -0,0 +1,450 @@
+"""
+Long-running desk server: keeps one warm TradingWorkflow and serves analyses over local HTTP.
+
+Concurrent requests for the same ticker are coalesced into a single
+in-flight run, new runs wait in a bounded queue, and clients can follow a
+run's node events and generated tokens as newline-delimited JSON.
+
+Every analysis request is a subscriber of its run, identified by the
+``X-Subscriber-Id`` response header. Cancelling detaches that subscriber
+only; the run itself is cancelled once no subscriber is left.
+
+Endpoints:
+    GET /analyze/<TICKER>                    Final result as JSON
+    GET /analyze/<TICKER>?stream=1           Token and node events, then the result, as NDJSON
+    DELETE /analyze/<TICKER>?subscriber=<ID> Detach a request, cancelling the run if it was the last
+    GET /health                              Queue depth and in-flight tickers
+"""
+
+import json
+import logging
+import queue
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+from .core.config import ServerConfig
+from .core.types import AgentState
+from .nodes.streaming import TokenStream
+
+if TYPE_CHECKING:
+    from .core.workflow import TradingWorkflow
+
+logger = logging.getLogger(__name__)
+
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.^=\-]{1,15}$")
+
+
+class QueueFullError(Exception):
+    """Raised when a new run cannot be queued because the server is saturated."""
+
+
+class InFlightRun:
+    """
+    A single workflow run shared by every request for its ticker.
+
+    Events are (node name, payload) pairs, where the payload is either the
+    node's state update, a ``str`` chunk of text the node generated, or
+    None when the node's generation was retried and the text it streamed
+    since its last update is void. They are kept for the lifetime of the
+    run so that late joiners replay everything published before they
+    subscribed.
+    """
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.events: List[Tuple[str, Union[Dict[str, Any], str, None]]] = []
+        self.state: Optional[AgentState] = None
+        self.error: Optional[str] = None
+        self.done = False
+        self.token_stream = TokenStream(on_token=self.publish, on_restart=self.publish)
+        self._subscribers: Set[str] = set()
+        self._condition = threading.Condition()
+
+    def subscribe(self, subscriber: str) -> None:
+        """Attach a request to the run."""
+        with self._condition:
+            self._subscribers.add(subscriber)
+
+    def detach(self, subscriber: str) -> bool:
+        """Detach a request, waking it up if it is waiting; False if it was not attached."""
+        with self._condition:
+            if subscriber not in self._subscribers:
+                return False
+            self._subscribers.remove(subscriber)
+            self._condition.notify_all()
+            return True
+
+    def attached(self, subscriber: Optional[str]) -> bool:
+        """Whether a request is still attached (always True for an anonymous follower)."""
+        with self._condition:
+            return not self._detached(subscriber)
+
+    def _detached(self, subscriber: Optional[str]) -> bool:
+        # Callers hold self._condition
+        return subscriber is not None and subscriber not in self._subscribers
+
+    @property
+    def subscribers(self) -> int:
+        """Number of requests attached to the run."""
+        with self._condition:
+            return len(self._subscribers)
+
+    def publish(self, node_name: str, payload: Union[Dict[str, Any], str, None] = None) -> None:
+        """Record a node update, generated text chunk or generation restart and wake up followers."""
+        with self._condition:
+            self.events.append((node_name, payload))
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """Abort the run's current generation; the run then finishes with an error."""
+        self.token_stream.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the run was cancelled."""
+        return self.token_stream.cancelled
+
+    def finish(self, state: Optional[AgentState] = None, error: Optional[str] = None) -> None:
+        """Mark the run as completed, successfully or not."""
+        with self._condition:
+            self.state = state
+            self.error = error
+            self.done = True
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None, subscriber: Optional[str] = None) -> bool:
+        """Block until the run finishes or ``subscriber`` is detached; False if the timeout expired first."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.done or self._detached(subscriber), timeout)
+
+    def follow(
+        self,
+        timeout: Optional[float] = None,
+        subscriber: Optional[str] = None
+    ) -> Iterator[Tuple[str, Union[Dict[str, Any], str, None]]]:
+        """
+        Yield every event of the run, blocking for new ones until it finishes.
+
+        Args:
+            timeout: Maximum seconds to wait for each new event
+            subscriber: Request following the run; it stops early once detached
+
+        Raises:
+            TimeoutError: If no event or completion arrives within the timeout
+        """
+        index = 0
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(
+                    lambda: index < len(self.events) or self.done or self._detached(subscriber), timeout
+                ):
+                    raise TimeoutError(f"No progress on {self.ticker} within {timeout}s")
+                pending = self.events[index:]
+                finished = self.done or self._detached(subscriber)
+            yield from pending
+            index += len(pending)
+            if finished and index >= len(self.events):
+                return
+
+
+class RunCoordinator:
+    """
+    Schedules workflow runs on a fixed pool of worker threads.
+
+    Requests for a ticker that is already queued or running join that run
+    instead of starting another one. At most ``max_queue`` distinct runs
+    may wait for a worker; beyond that, submissions are rejected.
+    """
+
+    def __init__(self, workflow: "TradingWorkflow", workers: int, max_queue: int):
+        """
+        Initialize the coordinator and start its workers.
+
+        Args:
+            workflow: Warm workflow shared by every run
+            workers: Number of runs executed concurrently
+            max_queue: Maximum number of runs waiting for a worker
+        """
+        self.workflow = workflow
+        self.metrics = workflow.metrics
+        self._queue: "queue.Queue[Optional[InFlightRun]]" = queue.Queue(maxsize=max_queue)
+        self._inflight: Dict[str, InFlightRun] = {}
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"trader-desk-run-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, ticker: str, subscriber: Optional[str] = None) -> Tuple[InFlightRun, bool]:
+        """
+        Join the in-flight run for a ticker, or queue a new one.
+
+        Args:
+            ticker: Stock symbol to analyze
+            subscriber: Id of the request, attached to the run so it can later be detached
+
+        Returns:
+            Tuple of (run, whether an existing run was joined)
+
+        Raises:
+            QueueFullError: If a new run is needed and the queue is full
+        """
+        with self._lock:
+            run = self._inflight.get(ticker)
+            if run is not None:
+                if subscriber is not None:
+                    run.subscribe(subscriber)
+                self.metrics.record("server_requests", 1, outcome="coalesced")
+                return run, True
+
+            run = InFlightRun(ticker)
+            try:
+                self._queue.put_nowait(run)
+            except queue.Full:
+                self.metrics.record("server_requests", 1, outcome="rejected")
+                raise QueueFullError(f"Run queue is full ({self._queue.maxsize} waiting)")
+            if subscriber is not None:
+                run.subscribe(subscriber)
+            self._inflight[ticker] = run
+            self.metrics.record("server_requests", 1, outcome="started")
+            return run, False
+
+    def cancel(self, ticker: str, subscriber: str) -> bool:
+        """
+        Detach a request from the run of a ticker.
+
+        The run itself is cancelled, whether queued or running, once its last
+        subscriber is detached; a later request for the ticker starts afresh.
+        Other requests sharing the run are unaffected.
+
+        Args:
+            ticker: Stock symbol of the run
+            subscriber: Id of the request to detach
+
+        Returns:
+            False if the ticker had no run in flight with that subscriber
+        """
+        with self._lock:
+            run = self._inflight.get(ticker)
+            if run is None or not run.detach(subscriber):
+                return False
+            last = run.subscribers == 0
+            if last:
+                del self._inflight[ticker]
+        if last:
+            run.cancel()
+        self.metrics.record("server_requests", 1, outcome="cancelled" if last else "detached")
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and in-flight tickers."""
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "workers": len(self._workers),
+                "in_flight": sorted(self._inflight),
+            }
+
+    def _work(self) -> None:
+        while True:
+            run = self._queue.get()
+            if run is None:
+                return
+            if run.cancelled:
+                # Cancelled while queued: don't start fetching for nobody
+                run.finish(error=f"Analysis of {run.ticker} cancelled")
+                continue
+            try:
+                state = self.workflow.run(
+                    run.ticker, verbose=False, on_event=run.publish, token_stream=run.token_stream
+                )
+                run.finish(state=state)
+            except Exception as e:
+                logger.exception("Analysis failed", extra={"ticker": run.ticker})
+                run.finish(error=str(e))
+            finally:
+                with self._lock:
+                    if self._inflight.get(run.ticker) is run:
+                        del self._inflight[run.ticker]
+
+    def close(self) -> None:
+        """Stop the workers once the runs already queued have finished."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "as_dict"):
+        return value.as_dict()
+    return str(value)
+
+
+def _to_json(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, default=_json_default).encode("utf-8")
+
+
+def result_payload(run: InFlightRun) -> Dict[str, Any]:
+    """JSON-ready outcome of a finished run."""
+    if run.error is not None:
+        return {"event": "error", "ticker": run.ticker, "error": run.error}
+    state = run.state
+    return {
+        "event": "result",
+        "ticker": run.ticker,
+        "sentiment_analysis": state["sentiment_analysis"],
+        "critic_feedback": state["critic_feedback"],
+        "iterations": state["iterations"],
+        "budget_truncated": state.get("budget_truncated", ""),
+        "material_changes": state.get("material_changes"),
+        "financial_data": state.get("financial_data"),
+    }
+
+
+class DeskServer:
+    """
+    HTTP front end for a RunCoordinator.
+    """
+
+    def __init__(self, workflow: "TradingWorkflow", config: Optional[ServerConfig] = None):
+        """
+        Initialize the server and warm up the workflow.
+
+        Args:
+            workflow: Workflow shared by every request
+            config: Server configuration, defaults to ServerConfig()
+        """
+        self.config = config or ServerConfig()
+        self.workflow = workflow
+        # Compile the graph up front so the first request does not pay for it
+        workflow.app
+        self.coordinator = RunCoordinator(
+            workflow,
+            workers=self.config.workers or workflow.config.workflow.max_concurrency,
+            max_queue=self.config.max_queue
+        )
+        self.httpd = ThreadingHTTPServer((self.config.host, self.config.port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Host and port the server is bound to."""
+        return self.httpd.server_address[:2]
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                parts = [part for part in url.path.split("/") if part]
+                if parts == ["health"]:
+                    self._send_json(200, server.coordinator.status())
+                elif len(parts) == 2 and parts[0] == "analyze":
+                    stream = parse_qs(url.query).get("stream", ["0"])[0] not in ("0", "false", "")
+                    self._analyze(parts[1].upper(), stream)
+                else:
+                    self._send_json(404, {"error": f"Unknown path: {url.path}"})
+
+            def do_DELETE(self):
+                url = urlparse(self.path)
+                parts = [part for part in url.path.split("/") if part]
+                if len(parts) != 2 or parts[0] != "analyze":
+                    self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                    return
+                subscriber = parse_qs(url.query).get("subscriber", [""])[0]
+                ticker = parts[1].upper()
+                if not subscriber:
+                    self._send_json(400, {"error": "Missing subscriber (the X-Subscriber-Id of the request to cancel)"})
+                elif server.coordinator.cancel(ticker, subscriber):
+                    self._send_json(202, {"ticker": ticker, "subscriber": subscriber, "cancelled": True})
+                else:
+                    self._send_json(404, {"error": f"No analysis of {ticker} in flight for {subscriber}"})
+
+            def _analyze(self, ticker: str, stream: bool) -> None:
+                if not TICKER_PATTERN.match(ticker):
+                    self._send_json(400, {"error": f"Invalid ticker: {ticker}"})
+                    return
+                subscriber = uuid.uuid4().hex
+                try:
+                    run, coalesced = server.coordinator.submit(ticker, subscriber)
+                except QueueFullError as e:
+                    self._send_json(503, {"error": str(e)}, {"Retry-After": "5"})
+                    return
+                try:
+                    self._respond(run, ticker, stream, subscriber, coalesced)
+                finally:
+                    run.detach(subscriber)
+
+            def _respond(self, run: InFlightRun, ticker: str, stream: bool, subscriber: str, coalesced: bool) -> None:
+                headers = {"X-Coalesced": str(coalesced).lower(), "X-Subscriber-Id": subscriber}
+                cancelled = {"event": "error", "ticker": ticker, "error": f"Analysis of {ticker} cancelled"}
+                timeout = server.config.request_timeout
+                if not stream:
+                    if not run.wait(timeout, subscriber):
+                        self._send_json(504, {"error": f"Analysis of {ticker} timed out"}, headers)
+                    elif not run.attached(subscriber):
+                        self._send_json(409, cancelled, headers)
+                    else:
+                        self._send_json(500 if run.error else 200, result_payload(run), headers)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    for node_name, payload in run.follow(timeout, subscriber):
+                        if payload is None:
+                            self._write_line({"event": "restart", "node": node_name})
+                        elif isinstance(payload, str):
+                            self._write_line({"event": "token", "node": node_name, "text": payload})
+                        else:
+                            self._write_line({"event": "node", "node": node_name, "update": payload})
+                    self._write_line(result_payload(run) if run.attached(subscriber) else cancelled)
+                except TimeoutError as e:
+                    self._write_line({"event": "error", "ticker": ticker, "error": str(e)})
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client went away; the shared run carries on for the others
+                    pass
+
+            def _write_line(self, payload: Dict[str, Any]) -> None:
+                self.wfile.write(_to_json(payload) + b"\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                body = _to_json(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("desk server: " + format, *args)
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        """Handle requests until :meth:`shutdown` is called."""
+        host, port = self.address
+        logger.info("Desk server listening", extra={"host": host, "port": port})
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop accepting requests, finish queued runs and release resources."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.coordinator.close()
+        self.workflow.close()
@@ -0,0 +1,310 @@
+"""
+TTL caching for upstream market data with pluggable storage backends.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..core.config import CacheConfig
+from .metrics import MetricsRecorder
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Counters plus hit rate as a plain dictionary."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cache entries with least-recently-used eviction.
+
+    Entries are stored as (value, expires_at) pairs, where expires_at is a
+    ``time.time()`` timestamp.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return the (value, expires_at) pair for key and mark it as recently used."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expires_at: float) -> int:
+        """Store an entry, returning the number of entries evicted to make room."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU backend."""
+
+    def __init__(self, max_entries: int = 10_000):
+        super().__init__(max_entries)
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float) -> int:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    On-disk LRU backend stored in a SQLite database.
+
+    Values are pickled, so the database must only be shared between trusted
+    processes. Several processes may use the same file concurrently.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        super().__init__(max_entries)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache (
+                       key TEXT PRIMARY KEY,
+                       value BLOB NOT NULL,
+                       expires_at REAL NOT NULL,
+                       accessed_at REAL NOT NULL
+                   )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float) -> int:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, expires_at, time.time())
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if overflow <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            return overflow
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class TTLCache:
+    """
+    Cache keyed by (data kind, key) with a separate time-to-live per kind.
+    """
+
+    # Default time-to-live per data kind, in seconds
+    DEFAULT_TTLS = {
+        "fundamentals": 6 * 60 * 60,
+        "price_targets": 6 * 60 * 60,
+        "price": 15,
+        "news": 10 * 60,
+        "history": 60 * 60,
+        "market_performance": 60 * 60,
+        "market_news": 10 * 60,
+    }
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+        name: str = "market",
+        metrics: Optional[MetricsRecorder] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend, defaults to an in-memory LRU
+            ttls: Overrides for DEFAULT_TTLS
+            default_ttl: Time-to-live for kinds without an explicit TTL
+            name: Cache name used as a metrics label
+            metrics: Recorder for per-lookup hit/miss events
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.name = name
+        self.metrics = metrics or MetricsRecorder()
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: CacheConfig,
+        metrics: Optional[MetricsRecorder] = None
+    ) -> Optional["TTLCache"]:
+        """
+        Build a cache from configuration.
+
+        Args:
+            config: Cache configuration
+            metrics: Recorder for per-lookup hit/miss events
+
+        Returns:
+            Configured cache, or None when caching is disabled
+        """
+        if config.backend == "none":
+            return None
+        if config.backend == "sqlite":
+            backend = SQLiteBackend(config.path, max_entries=config.max_entries)
+        elif config.backend == "memory":
+            backend = MemoryBackend(max_entries=config.max_entries)
+        else:
+            raise ValueError(f"Unknown cache backend: {config.backend}")
+        return cls(backend=backend, ttls=config.ttls, metrics=metrics)
+
+    @staticmethod
+    def _key(kind: str, key: str) -> str:
+        return f"{kind}:{key}"
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, amount in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """
+        Look up a fresh entry.
+
+        Args:
+            kind: Data kind, selects the TTL
+            key: Entry key within the kind (usually the ticker)
+
+        Returns:
+            Cached value, or None on a miss or an expired entry
+        """
+        cache_key = self._key(kind, key)
+        entry = self.backend.get(cache_key)
+        if entry is None:
+            self._count(misses=1)
+            self.metrics.record("cache_lookups", 1, cache=self.name, kind=kind, result="miss")
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self.backend.delete(cache_key)
+            self._count(misses=1, expirations=1)
+            self.metrics.record("cache_lookups", 1, cache=self.name, kind=kind, result="expired")
+            return None
+
+        self._count(hits=1)
+        self.metrics.record("cache_lookups", 1, cache=self.name, kind=kind, result="hit")
+        return value
+
+    def set(self, kind: str, key: str, value: Any) -> None:
+        """Store a value with the TTL of its kind."""
+        ttl = self.ttls.get(kind, self.default_ttl)
+        evicted = self.backend.set(self._key(kind, key), value, time.time() + ttl)
+        if evicted:
+            self._count(evictions=evicted)
+
+    def get_or_fetch(self, kind: str, key: str, fetch: Callable[[str], Any]) -> Any:
+        """
+        Return a cached value, calling ``fetch(key)`` and caching its result on a miss.
+
+        Empty results are returned but not cached, so transient upstream
+        failures are retried on the next lookup.
+        """
+        value = self.get(kind, key)
+        if value is not None:
+            return value
+
+        value = fetch(key)
+        if value is not None and not (hasattr(value, "__len__") and len(value) == 0):
+            self.set(kind, key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self.backend.clear()
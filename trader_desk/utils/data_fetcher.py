@@ -1,114 +1,609 @@
-from http.client import HTTPException
-from dotenv import load_dotenv
-import yfinance as yf
-from typing import Dict, Any
-from ..core.types import AgentState
-from tavily import TavilyClient
+import asyncio
+import contextvars
+import functools
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Optional, Callable, Tuple
+from ..core.budget import current_budget
+from ..core.types import AgentState, FinancialData, MarketContext, NewsItem
+from .cache import TTLCache
+from .metrics import MetricsRecorder
+from .scheduler import UpstreamScheduler
+
+if TYPE_CHECKING:
+    from .prices import PriceStore
+
+logger = logging.getLogger(__name__)
+
+
+class DataUnavailableError(RuntimeError):
+    """Raised when too few sources succeeded to produce a meaningful analysis."""
 
-load_dotenv()
 
 class FinancialDataFetcher:
     """
     Handles fetching of real-time financial data using Yahoo Finance.
+    
+    yfinance and the Tavily client are imported and constructed on first
+    use, so building a fetcher is cheap and makes no network calls.
     """
-    CLIENT = TavilyClient()
 
-    def get_financial_news(self, ticker: str, results: int = 3):
+    # Per-source timeouts in seconds; a slow source never holds up the others
+    DEFAULT_SOURCE_TIMEOUTS = {
+        "fundamentals": 10.0,
+        "price": 5.0,
+        "price_targets": 10.0,
+        "news": 8.0,
+        "history": 15.0,
+        "market_performance": 20.0,
+        "market_news": 8.0,
+    }
+
+    # Benchmark index and the SPDR ETF tracking each sector, for the market context
+    MARKET_INDEX = "^GSPC"
+    SECTOR_ETFS = {
+        "Communication Services": "XLC",
+        "Consumer Discretionary": "XLY",
+        "Consumer Staples": "XLP",
+        "Energy": "XLE",
+        "Financials": "XLF",
+        "Health Care": "XLV",
+        "Industrials": "XLI",
+        "Materials": "XLB",
+        "Real Estate": "XLRE",
+        "Technology": "XLK",
+        "Utilities": "XLU",
+    }
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_workers: int = 32,
+        source_timeouts: Optional[Dict[str, float]] = None,
+        cache: Optional[TTLCache] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        news_client: Optional[Any] = None,
+        scheduler: Optional[UpstreamScheduler] = None,
+        price_store: Optional["PriceStore"] = None
+    ):
+        """
+        Initialize the fetcher.
+        
+        Args:
+            executor: Executor used to run the blocking yfinance/Tavily calls
+            max_workers: Size of the default executor when none is given
+            source_timeouts: Overrides for DEFAULT_SOURCE_TIMEOUTS
+            cache: Optional TTL cache shared across runs, keyed by source and ticker
+            metrics: Recorder for upstream call latency
+            news_client: Tavily-compatible search client, created lazily when omitted
+            scheduler: Rate limiter and retry scheduler shared with other components
+            price_store: Local OHLCV history; when given, price-history features are
+                read from it and added to every fetch
+        """
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="trader-desk-io"
+        )
+        self.source_timeouts = {**self.DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self.cache = cache
+        self.metrics = metrics or MetricsRecorder()
+        self.scheduler = scheduler
+        self.price_store = price_store
+        self._news_client = news_client
+        self._news_client_lock = threading.Lock()
+
+    @property
+    def news_client(self) -> Any:
+        """Tavily client, constructed on first use."""
+        if self._news_client is None:
+            with self._news_client_lock:
+                if self._news_client is None:
+                    from tavily import TavilyClient
+                    self._news_client = TavilyClient()
+        return self._news_client
+
+    def close(self) -> None:
+        """Shut down the executor if it was created by this fetcher."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    def get_financial_news(self, ticker: str, results: int = 3) -> Tuple[NewsItem, ...]:
         """
         Grab some new about given symbol
         :param ticker:
         :param results: How many headlines to fetch
-        :return:
+        :return: Headlines as NewsItem records
+        """
+        search_result = self.news_client.search(
+            query=f"latest market news and financial sentiment for {ticker} today",
+            max_results=results
+        )
+        return _news_items(search_result)
+
+    def get_market_news(self, results: int = 3) -> Tuple[NewsItem, ...]:
+        """Fetch macro and market-wide headlines, not tied to any ticker."""
+        search_result = self.news_client.search(
+            query="latest stock market and macroeconomic news today",
+            max_results=results
+        )
+        return _news_items(search_result)
+
+    def get_info(self, ticker: str) -> Dict[str, Any]:
+        """Fetch the Yahoo Finance info snapshot for a ticker."""
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        """Fetch the latest traded price for a ticker."""
+        import yfinance as yf
+        return yf.Ticker(ticker).fast_info["lastPrice"]
+
+    def get_price_targets(self, ticker: str) -> Dict[str, Any]:
+        """Fetch the analyst price targets for a ticker."""
+        import yfinance as yf
+        return yf.Ticker(ticker).analyst_price_targets
+
+    def sync_price_history(self, tickers: Iterable[str]) -> None:
+        """
+        Bring the stored daily bars of many tickers up to date in bulk downloads.
+        
+        The history source only reads the price store, so callers sync first:
+        a batch all of its tickers at once, a single run its own ticker. A
+        failed sync is logged, and fetches read the bars already stored.
+        
+        Args:
+            tickers: Stock symbols to sync
         """
+        if self.price_store is None:
+            return
+        tickers = list(tickers)
         try:
-            search_result = self.CLIENT.search(
-                query=f"latest market news and financial sentiment for {ticker} today",
-                max_results=results
+            self.price_store.sync(tickers, "1d", deadline=time.monotonic() + self.source_timeouts["history"])
+        except Exception as e:
+            logger.warning("Price history sync failed", extra={"tickers": len(tickers), "error": str(e)})
+
+    async def async_price_history(self, tickers: Iterable[str]) -> None:
+        """Asynchronous counterpart of :meth:`sync_price_history`, run on the fetcher's executor."""
+        if self.price_store is None:
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(contextvars.copy_context().run, self.sync_price_history, list(tickers))
+        )
+
+    def get_price_history(self, ticker: str) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize a ticker's stored daily bars, synced by :meth:`sync_price_history`.
+        
+        Returns:
+            Dictionary with "price_history" features and "technicals" indicators
+            
+        Raises:
+            LookupError: If no bars are stored for the ticker
+        """
+        if self.price_store.last_timestamp(ticker) is None:
+            raise LookupError(f"No stored price history for {ticker}")
+        technicals = self.price_store.technicals([ticker]).loc[ticker]
+        return {
+            "price_history": self.price_store.features(ticker),
+            "technicals": {
+                name: float(value) for name, value in technicals.items() if math.isfinite(value)
+            },
+        }
+
+    def get_market_performance(self) -> Dict[str, float]:
+        """
+        Fetch the 52-week change of the benchmark index and every sector ETF.
+        
+        All symbols come from a single bulk download.
+        
+        Returns:
+            52-week change as a fraction, by symbol
+        """
+        import yfinance as yf
+        symbols = [self.MARKET_INDEX, *self.SECTOR_ETFS.values()]
+        closes = yf.download(symbols, period="1y", interval="1d", auto_adjust=True, progress=False)["Close"]
+        changes = closes.ffill().iloc[-1] / closes.bfill().iloc[0] - 1
+        return {symbol: float(change) for symbol, change in changes.items() if math.isfinite(change)}
+
+    # Upstream provider behind each source, used as a metrics label
+    SOURCE_PROVIDERS = {
+        "fundamentals": "yfinance",
+        "price": "yfinance",
+        "price_targets": "yfinance",
+        "news": "tavily",
+        "history": "yfinance",
+        "market_performance": "yfinance",
+        "market_news": "tavily",
+    }
+
+    def _timed(self, name: str, source: Callable[[str], Any]) -> Callable[[str], Any]:
+        """Wrap a source so every upstream call records its latency."""
+        @functools.wraps(source)
+        def timed_source(ticker: str) -> Any:
+            with self.metrics.timer(
+                "upstream_latency_seconds",
+                provider=self.SOURCE_PROVIDERS[name],
+                source=name,
+                ticker=ticker
+            ):
+                return source(ticker)
+        return timed_source
+
+    def _scheduled(self, name: str, source: Callable[[str], Any]) -> Callable[[str], Any]:
+        """Route a source through the shared scheduler, retrying within its timeout."""
+        if self.scheduler is None:
+            return source
+
+        @functools.wraps(source)
+        def scheduled_source(ticker: str) -> Any:
+            return self.scheduler.call(
+                self.SOURCE_PROVIDERS[name],
+                source,
+                ticker,
+                deadline=time.monotonic() + self.source_timeouts[name]
+            )
+        return scheduled_source
+
+    def _sources(self, market_context: Optional[MarketContext] = None) -> Dict[str, Callable[[str], Any]]:
+        """
+        Independent data sources fetched concurrently for every ticker.
+        
+        Source names double as cache kinds, so each source is cached with its
+        own TTL (fundamentals for hours, price for seconds, news for minutes).
+        Cache hits never reach the scheduler, so they cost no rate-limit budget.
+        
+        Args:
+            market_context: Batch market context; its headlines replace the
+                per-ticker news search, which is left out
+        """
+        sources = {
+            name: self._scheduled(name, self._timed(name, source)) for name, source in (
+                ("fundamentals", self.get_info),
+                ("price", self.get_price),
+                ("price_targets", self.get_price_targets),
+                ("news", self.get_financial_news),
+            )
+            if not (name == "news" and market_context is not None)
+        }
+        if self.price_store is not None:
+            # The store schedules its own bulk downloads
+            sources["history"] = self._timed("history", self.get_price_history)
+        return self._cached(sources)
+
+    def _market_sources(self) -> Dict[str, Callable[[str], Any]]:
+        """
+        Market-wide sources, called with the key ``market`` instead of a ticker.
+        
+        They are scheduled and cached like the per-ticker sources, so batches
+        started within a source's TTL share one fetch as well.
+        """
+        return self._cached({
+            name: self._scheduled(name, self._timed(name, source)) for name, source in (
+                ("market_performance", lambda _: self.get_market_performance()),
+                ("market_news", lambda _: self.get_market_news()),
             )
-            formatted_news = ""
-            for res in search_result['results']:
-                formatted_news += f"Title: {res['title']}\n"
-                formatted_news += f"Snippet: {res['content']}\n\n"
+        })
 
-            return formatted_news
+    def _cached(self, sources: Dict[str, Callable[[str], Any]]) -> Dict[str, Callable[[str], Any]]:
+        """Serve sources from the cache, each cached under its own name as the data kind."""
+        if self.cache is None:
+            return sources
+        return {
+            name: functools.partial(self.cache.get_or_fetch, name, fetch=source)
+            for name, source in sources.items()
+        }
 
-        except HTTPException as e:
-            return ''
+    def _timeouts(self) -> Dict[str, float]:
+        """Per-source timeouts, cut short by the deadline of the current run's budget."""
+        budget = current_budget()
+        remaining = None if budget is None else budget.remaining_seconds()
+        if remaining is None:
+            return self.source_timeouts
+        return {name: min(timeout, remaining) for name, timeout in self.source_timeouts.items()}
 
-    
+    def _gather_sources(
+        self,
+        ticker: str,
+        sources: Optional[Dict[str, Callable[[str], Any]]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Fetch all sources concurrently on the executor, each with its own timeout.
+        
+        A source's timeout starts when a worker picks it up, so sources queued
+        behind other runs on the shared executor are not timed out before they
+        begin; only the deadline of the run's budget bounds the queueing.
+        
+        Args:
+            ticker: Key every source is called with
+            sources: Sources to fetch, defaults to the per-ticker sources
+        
+        Returns:
+            Tuple of (results by source name, error message by failed source name)
+        """
+        sources = sources or self._sources()
+        budget = current_budget()
+        timeouts = self._timeouts()
+        started: Dict[str, float] = {}
+        began = {name: threading.Event() for name in sources}
+
+        def run_source(name: str, source: Callable[[str], Any]) -> Any:
+            started[name] = time.monotonic()
+            began[name].set()
+            return source(ticker)
+
+        # Each source runs in a copy of the caller's context so its request priority
+        # and run budget carry over
+        futures = {}
+        for name, source in sources.items():
+            futures[name] = self.executor.submit(contextvars.copy_context().run, run_source, name, source)
+            # Also wakes the wait below when the source fails or is cancelled before it starts
+            futures[name].add_done_callback(lambda _, event=began[name]: event.set())
+
+        results, errors = {}, {}
+        for name, future in futures.items():
+            if not began[name].wait(None if budget is None else budget.remaining_seconds()):
+                future.cancel()
+                errors[name] = "not started before the run deadline"
+                continue
+            remaining = timeouts[name] - (time.monotonic() - started.get(name, time.monotonic()))
+            try:
+                results[name] = future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                errors[name] = f"timed out after {timeouts[name]:g}s"
+            except Exception as e:
+                errors[name] = str(e)
+        return results, errors
+
+    async def _agather_sources(
+        self,
+        ticker: str,
+        sources: Optional[Dict[str, Callable[[str], Any]]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Asynchronous counterpart of :meth:`_gather_sources`."""
+        loop = asyncio.get_running_loop()
+        budget = current_budget()
+        timeouts = self._timeouts()
+
+        async def run_source(name: str, source: Callable[[str], Any]) -> Any:
+            started = []
+            began = asyncio.Event()
+
+            def run() -> Any:
+                started.append(time.monotonic())
+                loop.call_soon_threadsafe(began.set)
+                return source(ticker)
+
+            future = loop.run_in_executor(
+                self.executor, functools.partial(contextvars.copy_context().run, run)
+            )
+            waiter = asyncio.ensure_future(began.wait())
+            done, _ = await asyncio.wait(
+                {future, waiter},
+                timeout=None if budget is None else budget.remaining_seconds(),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            waiter.cancel()
+            if not done:
+                future.cancel()
+                raise RuntimeError("not started before the run deadline")
+            remaining = timeouts[name] - (time.monotonic() - (started or [time.monotonic()])[0])
+            return await asyncio.wait_for(future, timeout=max(remaining, 0))
+
+        sources = sources or self._sources()
+        outcomes = await asyncio.gather(
+            *(run_source(name, source) for name, source in sources.items()),
+            return_exceptions=True
+        )
+
+        results, errors = {}, {}
+        for name, outcome in zip(sources, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                errors[name] = f"timed out after {timeouts[name]:g}s"
+            elif isinstance(outcome, Exception):
+                errors[name] = str(outcome)
+            else:
+                results[name] = outcome
+        return results, errors
+
+    def fetch_market_context(self) -> Optional[MarketContext]:
+        """
+        Fetch the market-wide context shared by every ticker of a batch.
+        
+        Index and sector performance come from one bulk download and the
+        macro headlines from one search, so a batch pays two upstream calls
+        for its market context however many tickers it has.
+        
+        Returns:
+            The market context, or None when every market source failed
+        """
+        logger.info("Fetching market context")
+        results, errors = self._gather_sources("market", self._market_sources())
+        for name, error in errors.items():
+            logger.warning("Market source unavailable", extra={"source": name, "error": error})
+        if not results:
+            return None
+
+        performance = results.get("market_performance") or {}
+        return MarketContext(
+            index_change_52_weeks=performance.get(self.MARKET_INDEX),
+            sector_changes={
+                sector: performance[etf] for sector, etf in self.SECTOR_ETFS.items() if etf in performance
+            },
+            headlines=tuple(results.get("market_news") or ()),
+            missing_sources=tuple(errors)
+        )
+
+    def fetch_fundamentals(self, tickers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the fundamentals snapshots of many tickers concurrently, e.g. for screening.
+        
+        They go through the same cache as a full fetch's, so a batch analyzing
+        the same tickers afterwards reuses them.
+        
+        Args:
+            tickers: Stock symbols to fetch
+            
+        Returns:
+            Yahoo Finance info snapshot by ticker; tickers whose fetch failed are left out
+        """
+        source = self._sources()["fundamentals"]
+        futures = {
+            ticker: self.executor.submit(contextvars.copy_context().run, source, ticker)
+            for ticker in tickers
+        }
+        infos = {}
+        for ticker, future in futures.items():
+            try:
+                infos[ticker] = future.result()
+            except Exception as e:
+                logger.warning("Data source unavailable", extra={"ticker": ticker, "source": "fundamentals", "error": str(e)})
+        return infos
 
     def fetch_financial_data(self, state: AgentState) -> Dict[str, Any]:
         """
         Fetch comprehensive financial data for a given ticker.
         
+        The fundamentals snapshot, latest price, analyst price targets and
+        news are fetched concurrently; sources that fail or time out are left
+        out of the assembled data instead of failing the whole fetch. Only
+        when neither fundamentals nor a price are available does the fetch
+        fail, so the analyst never runs on empty data.
+        
+        When the state carries a batch market context, the news search is
+        skipped and the S&P 500 change is taken from the context, whose
+        prompt prefix already holds the market figures and headlines.
+        
         Args:
             state: Current agent state containing the ticker symbol
             
         Returns:
             Dictionary with updated financial_data and messages
+            
+        Raises:
+            DataUnavailableError: If neither fundamentals nor a price could be fetched
         """
         ticker = state['ticker']
-        print(f"--- Fetching real-time data for {ticker} ---")
+        logger.info("Fetching real-time data", extra={"ticker": ticker})
 
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            analyst_price_target = stock.analyst_price_targets
-            news = self.get_financial_news(ticker)
-
-            current_price = info.get('currentPrice')
-            market_cap = info.get('marketCap')
-            pe_ratio = info.get('forwardPE')
-            summary = info.get('longBusinessSummary', 'No summary available.')
-            change52weeks = info.get('52WeekChange', 'No data for a change over 52 weeks')
-            market_change = info.get('SandP52WeekChange', 'No data for a market change over 52 weeks')
-            overall_risk_score = info.get('overallRisk', 'No Risk data')
-            volatility_score = info.get('beta', 'No beta score')
-            debt_to_equity = info.get('debtToEquity', 'No data about debt to equity')
-
-            # Handle percentage calculations safely
-            if isinstance(change52weeks, (int, float)):
-                change52weeks_pct = change52weeks * 100
-            else:
-                change52weeks_pct = 'No data'
-                
-            if isinstance(market_change, (int, float)):
-                market_change_pct = market_change * 100
-            else:
-                market_change_pct = 'No data'
-                
-            # Calculate relative performance
-            if (isinstance(change52weeks, (int, float)) and 
-                isinstance(market_change, (int, float))):
-                relative_performance = (change52weeks - market_change) * 100
-            else:
-                relative_performance = 'No data'
-
-            real_data = f"""
-               Stock: {ticker}
-               Current Price: ${current_price}
-               Market Cap: ${market_cap:,}
-               Forward P/E Ratio: {pe_ratio}
-               Business Summary: {summary[:500]}
-               Analysts price target: {analyst_price_target}
-               52 Weeks change: {change52weeks_pct}
-               52 weeks Market change: {market_change_pct}
-               Relative performance: {relative_performance}
-               Risk data:
-                    Risk score: {overall_risk_score}/10
-                    Volatility score: {volatility_score}
-                    Debt to Equity: {debt_to_equity}
-               Latest news:
-                    {news}
-                """
-
-            return {
-                "financial_data": real_data,
-                "messages": [f"Fetched live data for {ticker}"]
-            }
+        market_context = state.get('market_context')
+        results, errors = self._gather_sources(ticker, self._sources(market_context))
+        return self._build_financial_data(ticker, results, errors, market_context)
+
+    async def afetch_financial_data(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of :meth:`fetch_financial_data`.
+        
+        The blocking yfinance and Tavily clients run on the fetcher's executor,
+        so the event loop stays free while data is being fetched.
+        
+        Args:
+            state: Current agent state containing the ticker symbol
             
-        except Exception as e:
-            return {
-                "financial_data": f"Error fetching data: {str(e)}",
-                "messages": [f"Failed to fetch data for {ticker}: {str(e)}"]
-            }
\ No newline at end of file
+        Returns:
+            Dictionary with updated financial_data and messages
+        """
+        ticker = state['ticker']
+        logger.info("Fetching real-time data", extra={"ticker": ticker})
+
+        market_context = state.get('market_context')
+        results, errors = await self._agather_sources(ticker, self._sources(market_context))
+        return self._build_financial_data(ticker, results, errors, market_context)
+
+    def _build_financial_data(
+        self,
+        ticker: str,
+        results: Dict[str, Any],
+        errors: Dict[str, str],
+        market_context: Optional[MarketContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Assemble the fetched sources into a structured FinancialData record.
+        
+        Args:
+            ticker: Stock symbol the data belongs to
+            results: Successfully fetched sources by name
+            errors: Error messages for sources that failed or timed out
+            market_context: Batch market context; supplies the S&P 500 change
+                instead of the fundamentals, and the market headlines
+            
+        Returns:
+            Dictionary with updated financial_data and messages
+            
+        Raises:
+            DataUnavailableError: If neither fundamentals nor a price could be fetched
+        """
+        if 'fundamentals' in errors and 'price' in errors:
+            missing = "; ".join(f"{name}: {error}" for name, error in errors.items())
+            raise DataUnavailableError(f"No usable market data for {ticker} ({missing})")
+
+        info = results.get('fundamentals') or {}
+        if market_context is not None:
+            market_change = market_context.index_change_52_weeks
+        else:
+            market_change = _as_number(info.get('SandP52WeekChange'))
+        price_targets = results.get('price_targets') or {}
+        risk_score = _as_number(info.get('overallRisk'))
+
+        data = FinancialData(
+            ticker=ticker,
+            current_price=_as_number(results.get('price')) or _as_number(info.get('currentPrice')),
+            market_cap=_as_int(info.get('marketCap')),
+            pe_ratio=_as_number(info.get('forwardPE')),
+            business_summary=info.get('longBusinessSummary') or "",
+            analyst_price_target={
+                name: value for name, value in
+                ((name, _as_number(value)) for name, value in dict(price_targets).items())
+                if value is not None
+            },
+            change_52_weeks=_as_number(info.get('52WeekChange')),
+            market_change_52_weeks=market_change,
+            risk_score=None if risk_score is None else int(risk_score),
+            volatility_score=_as_number(info.get('beta')),
+            debt_to_equity=_as_number(info.get('debtToEquity')),
+            news=tuple(results.get('news') or ()),
+            missing_sources=tuple(errors),
+            price_history=dict((results.get('history') or {}).get('price_history') or {}),
+            technicals=dict((results.get('history') or {}).get('technicals') or {}),
+            market_in_context=market_context is not None
+        )
+
+        message = f"Fetched live data for {ticker}"
+        for name, error in errors.items():
+            logger.warning("Data source unavailable", extra={"ticker": ticker, "source": name, "error": error})
+        if errors:
+            missing = ", ".join(f"{name} ({error})" for name, error in errors.items())
+            message += f"; missing sources: {missing}"
+
+        return {
+            "financial_data": data,
+            "messages": [message]
+        }
+
+
+def _news_items(search_result: Dict[str, Any]) -> Tuple[NewsItem, ...]:
+    """Convert Tavily search results to NewsItem records."""
+    return tuple(
+        NewsItem(title=res['title'], snippet=res['content'], url=res.get('url', ''))
+        for res in search_result['results']
+    )
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """Coerce an upstream value to float, mapping missing/invalid/NaN values to None."""
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) or math.isinf(number) else number
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """Coerce an upstream value to int, mapping missing/invalid values to None."""
+    number = _as_number(value)
+    return None if number is None else int(number)
@@ -0,0 +1,191 @@
+"""
+Vectorized technical indicators over price panels.
+
+Every function takes DataFrames indexed by bar time with one column per
+ticker and computes the indicator for all columns at once; there are no
+per-ticker or per-row Python loops. The full-series helpers use pandas'
+compiled rolling/``ewm`` kernels; :func:`summarize`, which only needs the
+latest values, evaluates them as NumPy matrix expressions instead.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bars of history needed for every indicator in summarize() to be defined
+LOOKBACK = 300
+
+PERIODS_PER_YEAR = 252
+
+
+def sma(close: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Simple moving average over ``window`` bars."""
+    return close.rolling(window, min_periods=window).mean()
+
+
+def ema(close: pd.DataFrame, span: int) -> pd.DataFrame:
+    """Exponential moving average with the usual ``2 / (span + 1)`` smoothing."""
+    return close.ewm(span=span, adjust=False, min_periods=span).mean()
+
+
+def _wilder(values: pd.DataFrame, period: int) -> pd.DataFrame:
+    """Wilder's smoothing, as used by RSI and ATR."""
+    return values.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+
+
+def rsi(close: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """Relative strength index (0-100)."""
+    delta = close.diff()
+    gain = _wilder(delta.clip(lower=0.0), period)
+    loss = _wilder(-delta.clip(upper=0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses at all: maximally overbought rather than undefined
+    return values.mask((loss == 0) & (gain > 0), 100.0)
+
+
+def macd(
+    close: pd.DataFrame,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Moving average convergence/divergence.
+
+    Returns:
+        Tuple of (MACD line, signal line, histogram)
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return line, signal_line, line - signal_line
+
+
+def true_range(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    """Largest of the bar's range and its gaps from the previous close."""
+    previous = close.shift(1).to_numpy()
+    h, l = high.to_numpy(), low.to_numpy()
+    ranges = np.fmax(h - l, np.fmax(np.abs(h - previous), np.abs(l - previous)))
+    return pd.DataFrame(ranges, index=close.index, columns=close.columns)
+
+
+def atr(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """Average true range, in price units."""
+    return _wilder(true_range(high, low, close), period)
+
+
+def realized_volatility(close: pd.DataFrame, window: int = 20) -> pd.DataFrame:
+    """Annualized standard deviation of daily log returns over ``window`` bars."""
+    log_returns = np.log(close).diff()
+    return log_returns.rolling(window, min_periods=window).std() * np.sqrt(PERIODS_PER_YEAR)
+
+
+def drawdown(close: pd.DataFrame) -> pd.DataFrame:
+    """Decline from the running peak, as a (non-positive) fraction."""
+    values = close.to_numpy(dtype=float)
+    peaks = np.fmax.accumulate(values, axis=0)
+    return pd.DataFrame(values / peaks - 1.0, index=close.index, columns=close.columns)
+
+
+def _ewm_weights(rows: np.ndarray, n: int, alpha: float) -> np.ndarray:
+    """Rows of the lower-triangular matrix W[t, k] = alpha * (1 - alpha) ** (t - k) for k <= t."""
+    lags = rows[:, None] - np.arange(n)[None, :]
+    return np.where(lags >= 0, alpha * (1.0 - alpha) ** np.clip(lags, 0, None), 0.0)
+
+
+def _ewm(values: np.ndarray, alpha: float, min_periods: int, last_only: bool = False) -> np.ndarray:
+    """
+    Exponentially weighted mean (``adjust=False``) of every column as a matrix product.
+
+    Matches pandas' ``ewm`` for columns whose only missing values are a
+    leading gap: the recursion starts at each column's first valid value s,
+    which gives y[t] = sum(W[t, s:t+1] * x[s:t+1]) + (1 - alpha) ** (t - s + 1) * x[s].
+    """
+    n, m = values.shape
+    valid = ~np.isnan(values)
+    start = valid.argmax(axis=0)
+    filled = np.where(valid, values, 0.0)
+    first = filled[start, np.arange(m)]
+    rows = np.arange(n - 1, n) if last_only else np.arange(n)
+    since = rows[:, None] - start[None, :]
+    result = _ewm_weights(rows, n, alpha) @ filled
+    result += (1.0 - alpha) ** np.clip(since + 1, 0, None) * first
+    result[(since + 1 < min_periods) | ~valid.any(axis=0)] = np.nan
+    return result[-1] if last_only else result
+
+
+def _window(values: np.ndarray, length: int) -> np.ndarray:
+    """Last ``length`` rows, or an all-NaN block when the history is shorter."""
+    if len(values) < length:
+        return np.full((length, values.shape[1]), np.nan)
+    return values[-length:]
+
+
+def summarize(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    """
+    Latest value of every indicator for every ticker of a daily price panel.
+
+    Only the last value of each indicator is needed, so instead of the
+    full-series helpers above this evaluates closed forms over whole
+    matrices: windowed means for averages and volatility, EMA weight
+    vectors for RSI/ATR, and one matrix product per EMA of the MACD.
+    Results equal the full-series helpers; interior gaps are forward-filled.
+
+    Args:
+        high: Daily highs, one column per ticker
+        low: Daily lows, same shape as ``close``
+        close: Daily closes, oldest bar first (ideally LOOKBACK bars)
+
+    Returns:
+        DataFrame indexed by ticker. Moving-average distances, ATR
+        percentage, volatilities and drawdowns are fractions; indicators
+        without enough history are NaN.
+    """
+    c = close.ffill().to_numpy(dtype=float)
+    h = high.ffill().to_numpy(dtype=float)
+    l = low.ffill().to_numpy(dtype=float)
+    last = c[-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sma_50 = _window(c, 50).mean(axis=0)
+        sma_200 = _window(c, 200).mean(axis=0)
+
+        delta = np.diff(c, axis=0)
+        gain = _ewm(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), 1 / 14, 14, True)
+        loss = _ewm(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), 1 / 14, 14, True)
+        rsi_14 = np.where((loss == 0) & (gain > 0), 100.0, 100.0 - 100.0 / (1.0 + gain / loss))
+
+        macd_line = _ewm(c, 2 / 13, 12) - _ewm(c, 2 / 27, 26)
+        macd_signal = _ewm(macd_line, 2 / 10, 9, True)
+
+        previous = np.vstack([np.full((1, c.shape[1]), np.nan), c[:-1]])
+        ranges = np.fmax(h - l, np.fmax(np.abs(h - previous), np.abs(l - previous)))
+        atr_14 = _ewm(ranges, 1 / 14, 14, True)
+
+        log_returns = np.diff(np.log(c), axis=0)
+        year = c[-PERIODS_PER_YEAR:]
+        volatility_20d = _window(log_returns, 20).std(axis=0, ddof=1) * np.sqrt(PERIODS_PER_YEAR)
+        volatility_1y = _window(log_returns, max(len(year) - 1, 2)).std(axis=0, ddof=1) * np.sqrt(PERIODS_PER_YEAR)
+
+        year_drawdown = year / np.fmax.accumulate(year, axis=0) - 1.0
+
+    return pd.DataFrame(
+        {
+            "sma_50": sma_50,
+            "sma_200": sma_200,
+            "price_vs_sma_50": last / sma_50 - 1.0,
+            "price_vs_sma_200": last / sma_200 - 1.0,
+            "rsi_14": rsi_14,
+            "macd": macd_line[-1],
+            "macd_signal": macd_signal,
+            "macd_histogram": macd_line[-1] - macd_signal,
+            "atr_14": atr_14,
+            "atr_pct": atr_14 / last,
+            "volatility_20d": volatility_20d,
+            "volatility_1y": volatility_1y,
+            "drawdown": year_drawdown[-1],
+            "max_drawdown_1y": np.nanmin(np.where(np.isnan(year_drawdown), np.inf, year_drawdown), axis=0),
+        },
+        index=close.columns
+    ).replace([np.inf, -np.inf], np.nan)
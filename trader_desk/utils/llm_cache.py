@@ -0,0 +1,118 @@
+"""
+Exact-match response cache for LLM calls made by the analysis nodes.
+"""
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..core.config import LLMConfig
+from .cache import CacheStats, SQLiteBackend, TTLCache
+from .metrics import MetricsRecorder
+
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of LLM responses.
+
+    Entries are keyed on the model, the temperature, a hash of the prompt
+    template and the fully rendered prompt messages, so any change to the
+    template or its inputs results in a fresh LLM call. The analysis nodes
+    only use it at temperature 0; sampled responses are not reused.
+    """
+
+    KIND = "llm"
+
+    def __init__(self, cache: TTLCache):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache: Underlying TTL cache used to store responses
+        """
+        self.cache = cache
+
+    @classmethod
+    def from_config(
+        cls,
+        config: LLMConfig,
+        metrics: Optional[MetricsRecorder] = None
+    ) -> Optional["LLMResponseCache"]:
+        """
+        Build a response cache from configuration.
+
+        Args:
+            config: LLM configuration
+            metrics: Recorder for per-lookup hit/miss events
+
+        Returns:
+            Configured response cache, or None when it is bypassed
+        """
+        if config.bypass_response_cache:
+            return None
+        backend = SQLiteBackend(
+            config.response_cache_path,
+            max_entries=config.response_cache_max_entries
+        )
+        return cls(TTLCache(
+            backend=backend,
+            ttls={cls.KIND: config.response_cache_ttl},
+            name=cls.KIND,
+            metrics=metrics
+        ))
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit/miss/eviction counters of the underlying cache."""
+        return self.cache.stats
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float,
+        prompt: "ChatPromptTemplate",
+        inputs: Dict[str, Any]
+    ) -> str:
+        """
+        Compute the cache key for a prompt invocation.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            prompt: Prompt template being invoked
+            inputs: Variables the template is rendered with
+
+        Returns:
+            Hex digest identifying the request
+        """
+        template = json.dumps(
+            [
+                [type(message).__name__, getattr(getattr(message, "prompt", None), "template", "")]
+                for message in prompt.messages
+            ]
+        )
+        template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+        rendered = [[message.type, message.content] for message in prompt.format_messages(**inputs)]
+
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "template": template_hash,
+                "messages": rendered,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response content for a key, if any."""
+        return self.cache.get(self.KIND, key)
+
+    def set(self, key: str, content: str) -> None:
+        """Store the response content for a key."""
+        self.cache.set(self.KIND, key, content)
@@ -0,0 +1,59 @@
+"""
+Structured logging setup for The Lonely Trader Desk.
+"""
+
+import json
+import logging
+import sys
+
+# Attributes present on every LogRecord; anything else came from ``extra``
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS}
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Human-readable lines with ``extra`` fields appended as key=value pairs."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = " ".join(f"{k}={v}" for k, v in _extra_fields(record).items())
+        return f"{line} {fields}" if fields else line
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_extra_fields(record),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(verbose: bool = True, json_output: bool = False) -> None:
+    """
+    Configure the ``trader_desk`` loggers.
+
+    Args:
+        verbose: Log progress at INFO level instead of WARNING
+        json_output: Emit JSON lines instead of key=value text
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    if json_output:
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(KeyValueFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger("trader_desk")
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO if verbose else logging.WARNING)
+    root.propagate = False
@@ -0,0 +1,279 @@
+"""
+Latency, token and cache metrics for the workflow, exported through pluggable sinks.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..core.config import MetricsConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MetricEvent:
+    """
+    A single measurement.
+
+    Attributes:
+        name: Metric name, e.g. ``node_duration_seconds``
+        value: Measured value
+        labels: Dimensions of the measurement (node, ticker, provider, ...)
+        timestamp: ``time.time()`` when the measurement was taken
+    """
+    name: str
+    value: float
+    labels: Dict[str, str] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class MetricsSink(ABC):
+    """Destination for metric events."""
+
+    @abstractmethod
+    def emit(self, event: MetricEvent) -> None:
+        """Handle one event. Must be thread-safe."""
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+
+
+class InMemorySink(MetricsSink):
+    """Keeps every event in memory, mainly for tests and interactive inspection."""
+
+    def __init__(self):
+        self.events: List[MetricEvent] = []
+        self._lock = threading.Lock()
+
+    def emit(self, event: MetricEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def values(self, name: str, **labels: str) -> List[float]:
+        """Values of all events with the given name whose labels include ``labels``."""
+        return [
+            event.value for event in self.events
+            if event.name == name and all(event.labels.get(k) == v for k, v in labels.items())
+        ]
+
+    def drain(self) -> List[MetricEvent]:
+        """Remove and return every event recorded so far."""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, sum and max per metric name."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            stats = totals.setdefault(event.name, {"count": 0, "sum": 0.0, "max": float("-inf")})
+            stats["count"] += 1
+            stats["sum"] += event.value
+            stats["max"] = max(stats["max"], event.value)
+        return totals
+
+
+class JSONLSink(MetricsSink):
+    """Appends one JSON object per event to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, event: MetricEvent) -> None:
+        line = json.dumps(asdict(event), sort_keys=True)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Aggregates events into Prometheus summaries (``_count``/``_sum``) and
+    renders them in the text exposition format.
+
+    High-cardinality labels (ticker, iteration) are dropped by default.
+    """
+
+    def __init__(self, exclude_labels: Sequence[str] = ("ticker", "iteration")):
+        self.exclude_labels = set(exclude_labels)
+        self._series: Dict[str, Dict[Tuple[Tuple[str, str], ...], List[float]]] = defaultdict(dict)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def emit(self, event: MetricEvent) -> None:
+        key = tuple(sorted(
+            (name, value) for name, value in event.labels.items() if name not in self.exclude_labels
+        ))
+        with self._lock:
+            series = self._series[event.name].setdefault(key, [0, 0.0])
+            series[0] += 1
+            series[1] += event.value
+
+    def render(self) -> str:
+        """Current aggregates in Prometheus text format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._series):
+                metric = f"trader_desk_{name}"
+                lines.append(f"# TYPE {metric} summary")
+                for key, (count, total) in sorted(self._series[name].items()):
+                    labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+                    suffix = f"{{{labels}}}" if labels else ""
+                    lines.append(f"{metric}_count{suffix} {count}")
+                    lines.append(f"{metric}_sum{suffix} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Expose ``/metrics`` over HTTP from a background thread.
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            host: Interface to bind
+
+        Returns:
+            The running server
+        """
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("metrics endpoint: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRecorder:
+    """
+    Fans metric events out to the configured sinks.
+
+    A recorder without sinks is a cheap no-op, so components can always
+    record unconditionally.
+    """
+
+    def __init__(self, sinks: Optional[Sequence[MetricsSink]] = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            sinks: Destinations for recorded events
+        """
+        self.sinks = list(sinks or [])
+
+    @classmethod
+    def from_config(cls, config: MetricsConfig) -> "MetricsRecorder":
+        """
+        Build a recorder from configuration.
+
+        Args:
+            config: Metrics configuration
+
+        Returns:
+            Recorder with the configured sinks
+        """
+        sinks: List[MetricsSink] = []
+        for name in config.sinks:
+            if name == "memory":
+                sinks.append(InMemorySink())
+            elif name == "jsonl":
+                sinks.append(JSONLSink(config.jsonl_path))
+            elif name == "prometheus":
+                sink = PrometheusSink()
+                if config.prometheus_port is not None:
+                    sink.serve(config.prometheus_port)
+                sinks.append(sink)
+            else:
+                raise ValueError(f"Unknown metrics sink: {name}")
+        return cls(sinks)
+
+    def sink(self, sink_type: type) -> Optional[MetricsSink]:
+        """First configured sink of the given type, if any."""
+        return next((s for s in self.sinks if isinstance(s, sink_type)), None)
+
+    def record(self, name: str, value: float, **labels: object) -> None:
+        """
+        Record a measurement.
+
+        Args:
+            name: Metric name
+            value: Measured value
+            labels: Dimensions of the measurement
+        """
+        if not self.sinks:
+            return
+        self.emit(MetricEvent(name, float(value), {k: str(v) for k, v in labels.items()}))
+
+    def emit(self, event: MetricEvent) -> None:
+        """
+        Forward an already built event, e.g. one recorded by a worker process.
+
+        Args:
+            event: Event to pass to every sink unchanged
+        """
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception:
+                logger.exception("Metrics sink %s failed", type(sink).__name__)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        """
+        Record the wall time of a block, labelled with ``status`` ok/error.
+
+        Args:
+            name: Metric name
+            labels: Dimensions of the measurement
+        """
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, status=status, **labels)
+
+    def close(self) -> None:
+        """Close every sink."""
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,450 @@
+"""
+Local OHLCV history: append-only binary bar files with incremental sync and memory-mapped reads.
+
+Every (interval, ticker) pair is stored as a flat file of fixed-width
+records (see BAR_DTYPE) ordered by timestamp. Syncing only downloads bars
+at or after the last stored one; the last stored bar is replaced, since it
+may have been an incomplete session. Reads map the file into memory, so
+slicing a long history neither copies nor parses it. A file is only ever
+grown in place; replacing its last bar swaps in a rewritten copy, so
+readers never see a mapped file shrink under them.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import PriceHistoryConfig
+
+if TYPE_CHECKING:
+    from .scheduler import UpstreamScheduler
+
+logger = logging.getLogger(__name__)
+
+# One bar per record; ts is the bar's start in seconds since the epoch (UTC)
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+# How much history a first sync downloads, by interval (yfinance period strings)
+DEFAULT_BACKFILL = {
+    "1d": "10y",
+    "1h": "730d",
+    "30m": "60d",
+    "15m": "60d",
+    "5m": "60d",
+    "1m": "7d",
+}
+
+# Trading days per lookback window used by price_features
+TRADING_DAYS = {"1m": 21, "3m": 63, "6m": 126, "1y": 252}
+
+Downloader = Callable[[List[str], str, Optional[str], Optional[str]], pd.DataFrame]
+TimeLike = Union[int, float, str, datetime.date, datetime.datetime, pd.Timestamp]
+
+
+def yfinance_download(
+    tickers: List[str],
+    interval: str,
+    start: Optional[str] = None,
+    period: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Download OHLCV bars for many tickers in one bulk request.
+
+    Args:
+        tickers: Stock symbols to download
+        interval: Bar size understood by yfinance ("1d", "1h", "5m", ...)
+        start: First date to download (YYYY-MM-DD), for incremental syncs
+        period: History length, for backfills when start is None
+
+    Returns:
+        DataFrame indexed by bar time with (ticker, field) columns
+    """
+    import yfinance as yf
+    return yf.download(
+        tickers,
+        start=start,
+        period=None if start else period,
+        interval=interval,
+        auto_adjust=True,
+        progress=False,
+        threads=True,
+        group_by="ticker"
+    )
+
+
+def _to_epoch_seconds(value: TimeLike) -> int:
+    """Convert a timestamp-like value to seconds since the epoch (naive values are UTC)."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return int(stamp.timestamp())
+
+
+def frame_to_bars(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Convert one ticker's OHLCV DataFrame into a sorted array of BAR_DTYPE records.
+
+    Rows without a close (e.g. days a ticker did not trade in a bulk
+    download) are dropped.
+
+    Args:
+        frame: DataFrame indexed by bar time with Open/High/Low/Close/Volume columns
+
+    Returns:
+        Array of bars ordered by timestamp, without duplicates
+    """
+    frame = frame.dropna(subset=["Close"])
+    if frame.empty:
+        return np.empty(0, dtype=BAR_DTYPE)
+    index = pd.DatetimeIndex(frame.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    bars["ts"] = (index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    for field, column in (("open", "Open"), ("high", "High"), ("low", "Low"),
+                          ("close", "Close"), ("volume", "Volume")):
+        bars[field] = frame[column].to_numpy(dtype=float) if column in frame else np.nan
+    bars = bars[np.argsort(bars["ts"], kind="stable")]
+    # Keep the last bar for any repeated timestamp
+    keep = np.append(bars["ts"][1:] != bars["ts"][:-1], True)
+    return bars[keep]
+
+
+def split_download(frame: pd.DataFrame, tickers: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Split a bulk download into bars per ticker.
+
+    Args:
+        frame: Output of a downloader, with (ticker, field) columns or plain
+            field columns when a single ticker was requested
+        tickers: Symbols that were requested
+
+    Returns:
+        Bars by ticker, for tickers that returned any data
+    """
+    if frame is None or frame.empty:
+        return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return {tickers[0]: frame_to_bars(frame)} if len(tickers) == 1 else {}
+    available = set(frame.columns.get_level_values(0))
+    result = {}
+    for ticker in tickers:
+        if ticker in available:
+            bars = frame_to_bars(frame[ticker])
+            if len(bars):
+                result[ticker] = bars
+    return result
+
+
+def price_features(bars: np.ndarray) -> Dict[str, float]:
+    """
+    Summarize daily bars into the price-history features shown to the analyst.
+
+    Features whose window is longer than the available history are omitted.
+
+    Args:
+        bars: Daily bars, oldest first
+
+    Returns:
+        Trailing returns (fractions), 52-week high/low, distance from the
+        52-week high (fraction) and 3-month average volume
+    """
+    if len(bars) < 2:
+        return {}
+    close = np.asarray(bars["close"], dtype=float)
+    last = close[-1]
+    features = {}
+    for label, days in TRADING_DAYS.items():
+        if len(close) > days:
+            features[f"return_{label}"] = float(last / close[-days - 1] - 1.0)
+    year = bars[-TRADING_DAYS["1y"]:]
+    high, low = float(np.nanmax(year["high"])), float(np.nanmin(year["low"]))
+    features["high_52w"] = high
+    features["low_52w"] = low
+    features["off_high_52w"] = float(last / high - 1.0) if high else float("nan")
+    features["avg_volume_3m"] = float(np.nanmean(bars["volume"][-TRADING_DAYS["3m"]:]))
+    return {name: value for name, value in features.items() if np.isfinite(value)}
+
+
+class PriceStore:
+    """
+    On-disk OHLCV history per ticker and interval.
+
+    A single process should sync a given store at a time; any number of
+    processes may read it concurrently.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        backfill: Optional[Dict[str, str]] = None,
+        chunk_size: int = 200,
+        downloader: Optional[Downloader] = None,
+        scheduler: Optional["UpstreamScheduler"] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding one subdirectory of bar files per interval
+            backfill: Overrides for DEFAULT_BACKFILL
+            chunk_size: Number of symbols per bulk download
+            downloader: Bulk OHLCV download function, defaults to yfinance_download
+            scheduler: Rate limiter and retry scheduler for the downloads
+        """
+        self.root = root
+        self.backfill = {**DEFAULT_BACKFILL, **(backfill or {})}
+        self.chunk_size = max(1, chunk_size)
+        self.downloader = downloader or yfinance_download
+        self.scheduler = scheduler
+        self._maps: Dict[str, Tuple[Tuple[int, int, int], np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: PriceHistoryConfig,
+        scheduler: Optional["UpstreamScheduler"] = None
+    ) -> Optional["PriceStore"]:
+        """
+        Build a price store from configuration.
+
+        Args:
+            config: Price history configuration
+            scheduler: Rate limiter and retry scheduler for the downloads
+
+        Returns:
+            Configured store, or None when price history is disabled
+        """
+        if not config.enabled:
+            return None
+        return cls(config.path, backfill=config.backfill, chunk_size=config.chunk_size, scheduler=scheduler)
+
+    def _path(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.root, interval, ticker.replace(os.sep, "_") + ".bars")
+
+    def bars(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None
+    ) -> np.ndarray:
+        """
+        Stored bars of a ticker, optionally restricted to ``start <= ts < end``.
+
+        The result is a read-only view of the memory-mapped file; copy it if
+        it must outlive the next sync.
+
+        Args:
+            ticker: Stock symbol
+            interval: Bar size
+            start: First bar time to include (epoch seconds, date string or datetime)
+            end: Bar time to stop before
+
+        Returns:
+            Array of BAR_DTYPE records, oldest first (empty when nothing is stored)
+        """
+        bars = self._map(self._path(ticker, interval))
+        if start is None and end is None:
+            return bars
+        ts = bars["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_epoch_seconds(start), side="left"))
+        hi = len(bars) if end is None else int(np.searchsorted(ts, _to_epoch_seconds(end), side="left"))
+        return bars[lo:hi]
+
+    def tail(self, ticker: str, count: int, interval: str = "1d") -> np.ndarray:
+        """The last ``count`` stored bars of a ticker."""
+        return self.bars(ticker, interval)[-count:]
+
+    def last_timestamp(self, ticker: str, interval: str = "1d") -> Optional[int]:
+        """Time of the newest stored bar, in epoch seconds, or None when nothing is stored."""
+        bars = self.bars(ticker, interval)
+        return int(bars["ts"][-1]) if len(bars) else None
+
+    def _map(self, path: str) -> np.ndarray:
+        """Memory-map a bar file, reusing the mapping while the file is unchanged."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=BAR_DTYPE)
+        count = stat.st_size // BAR_DTYPE.itemsize
+        # A rewritten file keeps its bar count but not its inode or mtime
+        version = (stat.st_ino, stat.st_mtime_ns, count)
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            bars = np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,)) if count else np.empty(0, dtype=BAR_DTYPE)
+            self._maps[path] = (version, bars)
+            return bars
+
+    def write(self, ticker: str, bars: np.ndarray, interval: str = "1d") -> int:
+        """
+        Merge freshly downloaded bars into a ticker's file.
+
+        Bars older than the newest stored bar are ignored; a bar with the same
+        timestamp replaces the stored one, and newer bars are appended.
+
+        Args:
+            ticker: Stock symbol
+            bars: Downloaded bars, oldest first
+            interval: Bar size
+
+        Returns:
+            Number of bars appended
+        """
+        with self._write_lock:
+            return self._write(ticker, bars, interval)
+
+    def _write(self, ticker: str, bars: np.ndarray, interval: str) -> int:
+        path = self._path(ticker, interval)
+        stored = self.bars(ticker, interval)
+        last = int(stored["ts"][-1]) if len(stored) else None
+        if last is not None:
+            bars = bars[bars["ts"] >= last]
+        if not len(bars):
+            return 0
+        replaces_last = last is not None and int(bars["ts"][0]) == last
+        kept = len(stored) - (1 if replaces_last else 0)
+        records = np.ascontiguousarray(bars, dtype=BAR_DTYPE).tobytes()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            self._maps.pop(path, None)
+            if not replaces_last and self._size(path) == kept * BAR_DTYPE.itemsize:
+                # Appending leaves every page a reader has mapped valid
+                with open(path, "ab") as fh:
+                    fh.write(records)
+            else:
+                # Truncating a mapped file would fault its readers (SIGBUS), so the
+                # replaced bar, or a torn record from an interrupted write, is
+                # dropped in a copy that atomically takes the file's place
+                staging = f"{path}.{os.getpid()}.tmp"
+                with open(staging, "wb") as fh:
+                    fh.write(np.ascontiguousarray(stored[:kept]).tobytes())
+                    fh.write(records)
+                os.replace(staging, path)
+        return len(bars) - (1 if replaces_last else 0)
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _download(self, tickers: List[str], interval: str, start: Optional[str], deadline: Optional[float]) -> pd.DataFrame:
+        period = None if start else self.backfill.get(interval, "max")
+        if self.scheduler is None:
+            return self.downloader(tickers, interval, start, period)
+        return self.scheduler.call("yfinance", self.downloader, tickers, interval, start, period, deadline=deadline)
+
+    def sync(
+        self,
+        tickers: Iterable[str],
+        interval: str = "1d",
+        deadline: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        Bring the stored history of many tickers up to date.
+
+        Tickers are grouped by the day of their newest stored bar, so a
+        universe that was synced together is refreshed with one bulk download
+        per ``chunk_size`` symbols; tickers with no history are backfilled.
+
+        Args:
+            tickers: Stock symbols to sync
+            interval: Bar size
+            deadline: ``time.monotonic()`` instant after which retries stop
+
+        Returns:
+            Number of bars appended per ticker
+        """
+        groups: Dict[Optional[str], List[str]] = {}
+        for ticker in dict.fromkeys(tickers):
+            last = self.last_timestamp(ticker, interval)
+            day = None if last is None else datetime.datetime.fromtimestamp(last, datetime.timezone.utc).strftime("%Y-%m-%d")
+            groups.setdefault(day, []).append(ticker)
+
+        appended = {}
+        started = time.monotonic()
+        for day, members in groups.items():
+            for offset in range(0, len(members), self.chunk_size):
+                chunk = members[offset:offset + self.chunk_size]
+                downloaded = split_download(self._download(chunk, interval, day, deadline), chunk)
+                for ticker in chunk:
+                    bars = downloaded.get(ticker)
+                    appended[ticker] = 0 if bars is None else self.write(ticker, bars, interval)
+        logger.info(
+            "Price history synced",
+            extra={"tickers": len(appended), "interval": interval, "bars": sum(appended.values()),
+                   "seconds": round(time.monotonic() - started, 2)}
+        )
+        return appended
+
+    def panel(
+        self,
+        tickers: Iterable[str],
+        fields: Iterable[str] = ("high", "low", "close"),
+        interval: str = "1d",
+        lookback: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Stored bars of many tickers as aligned price matrices.
+
+        Args:
+            tickers: Stock symbols, one column each
+            fields: Bar fields to return, e.g. "close"
+            interval: Bar size
+            lookback: Number of most recent bars to keep per ticker, None for all
+
+        Returns:
+            One DataFrame per field, indexed by bar time (UTC) with one column
+            per ticker; NaN where a ticker has no bar
+        """
+        tickers = list(dict.fromkeys(tickers))
+        fields = list(fields)
+        series: Dict[str, Dict[str, pd.Series]] = {field: {} for field in fields}
+        for ticker in tickers:
+            bars = self.bars(ticker, interval)
+            if lookback is not None:
+                bars = bars[-lookback:]
+            index = pd.to_datetime(np.asarray(bars["ts"]), unit="s", utc=True)
+            for field in fields:
+                series[field][ticker] = pd.Series(np.asarray(bars[field]), index=index)
+        return {
+            field: pd.DataFrame(columns, columns=tickers).sort_index() if columns else pd.DataFrame(columns=tickers)
+            for field, columns in series.items()
+        }
+
+    def features(self, ticker: str) -> Dict[str, float]:
+        """Price-history features of a ticker from its stored daily bars (see price_features)."""
+        return price_features(self.tail(ticker, TRADING_DAYS["1y"] + 1, "1d"))
+
+    def technicals(self, tickers: Iterable[str]) -> pd.DataFrame:
+        """
+        Latest technical indicators of many tickers from their stored daily bars.
+
+        Args:
+            tickers: Stock symbols
+
+        Returns:
+            DataFrame indexed by ticker (see indicators.summarize)
+        """
+        from .indicators import LOOKBACK, summarize
+        return summarize(**self.panel(tickers, ("high", "low", "close"), "1d", LOOKBACK))
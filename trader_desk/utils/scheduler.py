@@ -0,0 +1,595 @@
+"""
+Shared admission control for upstream providers: rate limits, retries with backoff and circuit breaking.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from http.client import HTTPException
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..core.budget import BudgetExceeded, current_budget
+from ..core.config import ProviderLimit, SchedulerConfig
+from .metrics import MetricsRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling priority of upstream calls; lower values are served first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: "ContextVar[Priority]" = ContextVar("trader_desk_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed upstream calls with the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority of upstream calls made from the current context."""
+    return _priority.get()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+# HTTP statuses worth retrying: timeouts, throttling and server-side failures
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Whether an exception signals provider throttling (HTTP 429 or equivalent)."""
+    name = type(exc).__name__.lower()
+    return (
+        _status_code(exc) == 429
+        or "ratelimit" in name
+        or "too many requests" in str(exc).lower()
+    )
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Whether a failed upstream call may succeed if retried.
+
+    Provider SDKs are matched by status code and exception name rather than
+    by type, so none of them needs to be imported here.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if is_rate_limited(exc) or _status_code(exc) in RETRYABLE_STATUS:
+        return True
+    if isinstance(exc, (TimeoutError, ConnectionError, HTTPException)):
+        return True
+    name = type(exc).__name__.lower()
+    return "timeout" in name or "connection" in name
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Delay requested by the provider through a ``Retry-After`` header, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Classic token bucket. Not thread-safe; callers hold their own lock.
+
+    Consuming more than is available leaves the bucket in debt, which later
+    callers pay off by waiting.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens held
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` tokens (capped at capacity) are available."""
+        self._refill(now)
+        deficit = min(amount, self.capacity) - self._tokens
+        return max(deficit, 0.0) / self.rate
+
+    def consume(self, amount: float, now: Optional[float] = None) -> None:
+        """Take tokens from the bucket, going into debt if needed."""
+        self._refill(time.monotonic() if now is None else now)
+        self._tokens -= amount
+
+
+class ProviderLimiter:
+    """
+    Admission control for one provider, shared by every caller in the process.
+
+    Waiting callers are admitted strictly in (priority, arrival) order, so
+    interactive requests overtake queued batch work.
+    """
+
+    # Upper bound between re-checks while waiting, in seconds
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, limit: ProviderLimit):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Request and token rates for the provider
+        """
+        self.requests = TokenBucket(limit.requests_per_second, limit.burst or max(1.0, limit.requests_per_second))
+        self.tokens = (
+            TokenBucket(limit.tokens_per_minute / 60.0, limit.tokens_per_minute)
+            if limit.tokens_per_minute else None
+        )
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._paused_until = 0.0
+
+    def _try_admit(self, ticket: Tuple[int, int], tokens: float) -> float:
+        """Admit the ticket if it is first in line and capacity allows; else return a wait."""
+        if self._waiters[0] != ticket:
+            return self.POLL_INTERVAL
+        now = time.monotonic()
+        wait = max(self._paused_until - now, self.requests.wait_time(1, now))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        self.requests.consume(1, now)
+        if self.tokens is not None and tokens:
+            self.tokens.consume(tokens, now)
+        heapq.heappop(self._waiters)
+        self._condition.notify_all()
+        return 0.0
+
+    def _enqueue(self, priority: Priority) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._sequence))
+        heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _abandon(self, ticket: Tuple[int, int]) -> None:
+        if ticket in self._waiters:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            self._condition.notify_all()
+
+    @staticmethod
+    def _until(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left before ``deadline``, raising once it has passed."""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Deadline passed while waiting for the rate limit")
+        return remaining
+
+    def acquire(
+        self,
+        tokens: float = 0,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None
+    ) -> float:
+        """
+        Block until a request (and ``tokens`` LLM tokens) may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+            priority: Scheduling priority, defaults to the current context's
+            deadline: ``time.monotonic()`` after which to stop waiting
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            TimeoutError: If the deadline passes before the request is admitted
+        """
+        start = time.monotonic()
+        with self._condition:
+            ticket = self._enqueue(current_priority() if priority is None else priority)
+            try:
+                while (wait := self._try_admit(ticket, tokens)) > 0:
+                    remaining = self._until(deadline)
+                    self._condition.wait(min(wait, self.POLL_INTERVAL * 10, remaining or math.inf))
+            except BaseException:
+                self._abandon(ticket)
+                raise
+        return time.monotonic() - start
+
+    async def aacquire(
+        self,
+        tokens: float = 0,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None
+    ) -> float:
+        """Asynchronous counterpart of :meth:`acquire`; waits without blocking the loop."""
+        start = time.monotonic()
+        with self._condition:
+            ticket = self._enqueue(current_priority() if priority is None else priority)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_admit(ticket, tokens)
+                if wait <= 0:
+                    break
+                remaining = self._until(deadline)
+                await asyncio.sleep(min(wait, self.POLL_INTERVAL, remaining or math.inf))
+        except BaseException:
+            with self._condition:
+                self._abandon(ticket)
+            raise
+        return time.monotonic() - start
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for a while, e.g. after the provider returned 429."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def consume_tokens(self, tokens: float) -> None:
+        """Charge tokens used beyond the estimate given at admission."""
+        if self.tokens is None or tokens <= 0:
+            return
+        with self._condition:
+            self.tokens.consume(tokens)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream failures.
+
+    After ``failure_threshold`` consecutive retryable failures the circuit
+    opens; once ``reset_timeout`` has passed a single trial call is let
+    through, and its outcome closes or re-opens the circuit. A trial that
+    ends without an outcome (cancelled, or aborted before reaching the
+    provider) is released so the next call can take its place.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial: Optional[object] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def before_call(self, provider: str) -> Optional[object]:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            A token identifying the call as the half-open trial (pass it to
+            :meth:`release`), or None for a call through a closed circuit
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial in flight
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return None
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial is not None:
+                raise CircuitOpenError(f"Circuit open for {provider} after {self._failures} failures")
+            self._trial = object()
+            return self._trial
+
+    def release(self, trial: Optional[object]) -> None:
+        """Give up a trial whose outcome was never recorded; the circuit stays half-open."""
+        with self._lock:
+            if trial is not None and self._trial is trial:
+                self._trial = None
+
+    @contextmanager
+    def admit(self, provider: str) -> Iterator[None]:
+        """
+        Let one attempt through (see :meth:`before_call`), releasing its trial
+        however the attempt ends if no outcome was recorded for it.
+        """
+        trial = self.before_call(provider)
+        try:
+            yield
+        finally:
+            self.release(trial)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = None
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if it opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            reopened = self._trial is not None
+            self._trial = None
+            if reopened or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Attributes:
+        max_attempts: Total attempts per call, including the first
+        base_delay: Backoff ceiling of the first retry, in seconds
+        max_delay: Upper bound on any single backoff, in seconds
+    """
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+    def backoff(self, attempt: int) -> float:
+        """Randomized delay before retry number ``attempt + 1``."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class UpstreamScheduler:
+    """
+    Process-wide gate in front of every upstream provider.
+
+    Each provider gets a token-bucket limiter (requests per second and,
+    optionally, LLM tokens per minute), a circuit breaker and the shared
+    retry policy. Providers without a configured limit are still retried
+    and circuit-broken, just not throttled.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ProviderLimit]] = None,
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        metrics: Optional[MetricsRecorder] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            limits: Rate limits by provider name
+            retry: Retry policy for failed calls
+            failure_threshold: Consecutive failures that open a provider's circuit
+            reset_timeout: Seconds before an open circuit lets a trial call through
+            metrics: Recorder for waits, retries and circuit events
+        """
+        self.limiters = {name: ProviderLimiter(limit) for name, limit in (limits or {}).items()}
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = metrics or MetricsRecorder()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: SchedulerConfig, metrics: Optional[MetricsRecorder] = None) -> "UpstreamScheduler":
+        """
+        Build a scheduler from configuration.
+
+        Args:
+            config: Scheduler configuration
+            metrics: Recorder for waits, retries and circuit events
+
+        Returns:
+            Configured scheduler
+        """
+        return cls(
+            limits=config.limits,
+            retry=RetryPolicy(config.max_attempts, config.base_delay, config.max_delay),
+            failure_threshold=config.failure_threshold,
+            reset_timeout=config.reset_timeout,
+            metrics=metrics
+        )
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """Circuit breaker of a provider, created on first use."""
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[provider]
+
+    def settle(self, provider: str, extra_tokens: float) -> None:
+        """Charge a provider's token budget for usage beyond the admission estimate."""
+        limiter = self.limiters.get(provider)
+        if limiter is not None:
+            limiter.consume_tokens(extra_tokens)
+
+    def _on_failure(
+        self,
+        provider: str,
+        exc: Exception,
+        attempt: int,
+        deadline: Optional[float]
+    ) -> Optional[float]:
+        """
+        Account for a failed attempt and decide whether to retry.
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if not is_retryable(exc):
+            if _status_code(exc) is not None:
+                # The provider answered; the request itself was at fault
+                self.breaker(provider).record_success()
+            # Local aborts (budget, cancellation) say nothing about the provider
+            return None
+        if self.breaker(provider).record_failure():
+            logger.warning("Circuit opened", extra={"provider": provider, "error": str(exc)})
+            self.metrics.record("circuit_opened", 1, provider=provider)
+
+        delay = self.retry.backoff(attempt)
+        limited = is_rate_limited(exc)
+        if limited:
+            delay = max(delay, retry_after(exc) or 0.0)
+            # Throttle every caller, not just this one, to avoid a retry storm
+            limiter = self.limiters.get(provider)
+            if limiter is not None:
+                limiter.pause(delay)
+
+        if attempt + 1 >= self.retry.max_attempts:
+            return None
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return None
+        self.metrics.record(
+            "upstream_retries", 1,
+            provider=provider,
+            reason="rate_limited" if limited else type(exc).__name__
+        )
+        return delay
+
+    @staticmethod
+    def _deadline(deadline: Optional[float]) -> Optional[float]:
+        """The earlier of a call's own deadline and the deadline of the current run's budget."""
+        budget = current_budget()
+        if budget is None or budget.deadline is None:
+            return deadline
+        return budget.deadline if deadline is None else min(deadline, budget.deadline)
+
+    @staticmethod
+    def _check_budget() -> None:
+        """Refuse to start an attempt once the current run is past its deadline."""
+        budget = current_budget()
+        if budget is not None and budget.remaining_seconds() == 0:
+            raise BudgetExceeded("deadline")
+
+    def call(
+        self,
+        provider: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        tokens: float = 0,
+        deadline: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Call a provider through its limiter, retrying transient failures.
+
+        Args:
+            provider: Provider name, e.g. ``yfinance`` or ``openai``
+            fn: Function performing the upstream call
+            args: Positional arguments for ``fn``
+            tokens: Estimated LLM tokens the call consumes
+            deadline: ``time.monotonic()`` after which no rate-limit wait or
+                retry is started; the current run's budget deadline applies as well
+            kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Result of ``fn``
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            BudgetExceeded: If the current run's deadline passes before an attempt starts
+            TimeoutError: If the deadline passes while waiting for the rate limit
+            Exception: The last error once retries are exhausted or not applicable
+        """
+        limiter = self.limiters.get(provider)
+        breaker = self.breaker(provider)
+        deadline = self._deadline(deadline)
+        for attempt in itertools.count():
+            # Waits and budget checks happen inside the admitted attempt, so
+            # a half-open trial they abort is released rather than counted
+            with breaker.admit(provider):
+                if limiter is not None:
+                    try:
+                        waited = limiter.acquire(tokens, deadline=deadline)
+                    except TimeoutError:
+                        # Past the run's own deadline, report it as such
+                        self._check_budget()
+                        raise
+                    if waited > 0:
+                        self.metrics.record("rate_limit_wait_seconds", waited, provider=provider)
+                self._check_budget()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    delay = self._on_failure(provider, e, attempt, deadline)
+                    if delay is None:
+                        raise
+                else:
+                    breaker.record_success()
+                    return result
+            time.sleep(delay)
+
+    async def acall(
+        self,
+        provider: str,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        tokens: float = 0,
+        deadline: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """Asynchronous counterpart of :meth:`call` for coroutine functions."""
+        limiter = self.limiters.get(provider)
+        breaker = self.breaker(provider)
+        deadline = self._deadline(deadline)
+        for attempt in itertools.count():
+            with breaker.admit(provider):
+                if limiter is not None:
+                    try:
+                        waited = await limiter.aacquire(tokens, deadline=deadline)
+                    except TimeoutError:
+                        self._check_budget()
+                        raise
+                    if waited > 0:
+                        self.metrics.record("rate_limit_wait_seconds", waited, provider=provider)
+                self._check_budget()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    delay = self._on_failure(provider, e, attempt, deadline)
+                    if delay is None:
+                        raise
+                else:
+                    breaker.record_success()
+                    return result
+            await asyncio.sleep(delay)
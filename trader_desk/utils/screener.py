@@ -0,0 +1,297 @@
+"""
+Vectorized watchlist screening over bulk price downloads.
+
+The screener narrows a large universe down to a handful of candidates
+before the (expensive) Fetcher -> Analyst -> Critic workflow runs.
+"""
+
+import logging
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache import TTLCache
+
+if TYPE_CHECKING:
+    from .data_fetcher import FinancialDataFetcher
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK = "^GSPC"
+
+# Criteria thresholds that rely on cached fundamentals, and the metric each filters
+_FUNDAMENTAL_FILTERS = (("max_pe_ratio", "pe_ratio"), ("max_debt_to_equity", "debt_to_equity"))
+
+
+@dataclass
+class ScreenCriteria:
+    """
+    Filters and ranking applied to the screening metrics.
+
+    Thresholds set to None are not applied. Tickers with no data for a
+    filtered metric are kept, since the screen cannot judge them.
+    """
+
+    min_relative_performance: Optional[float] = None
+    max_beta: Optional[float] = None
+    max_pe_ratio: Optional[float] = None
+    max_debt_to_equity: Optional[float] = None
+    rank_by: str = "relative_performance"
+    ascending: bool = False
+    top_n: int = 20
+
+
+def download_prices(
+    tickers: Iterable[str],
+    period: str = "1y",
+    benchmark: str = BENCHMARK,
+    chunk_size: int = 500
+) -> pd.DataFrame:
+    """
+    Download daily closing prices for many tickers in bulk requests.
+
+    Args:
+        tickers: Stock symbols to download
+        period: History length understood by yfinance
+        benchmark: Index symbol downloaded alongside the tickers
+        chunk_size: Number of symbols per bulk request
+
+    Returns:
+        DataFrame of closing prices indexed by date, one column per symbol
+    """
+    import yfinance as yf
+
+    symbols = list(dict.fromkeys([*tickers, benchmark]))
+    frames = []
+    for start in range(0, len(symbols), chunk_size):
+        chunk = symbols[start:start + chunk_size]
+        data = yf.download(
+            chunk, period=period, auto_adjust=True, progress=False, threads=True
+        )
+        closes = data["Close"]
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=chunk[0])
+        frames.append(closes)
+    return pd.concat(frames, axis=1).sort_index()
+
+
+def fundamentals_frame(infos: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Extract P/E and debt-to-equity from Yahoo Finance info snapshots.
+
+    Args:
+        infos: Info snapshot by ticker
+
+    Returns:
+        DataFrame indexed by ticker with pe_ratio and debt_to_equity columns
+    """
+    rows = {
+        ticker: {"pe_ratio": info.get("forwardPE"), "debt_to_equity": info.get("debtToEquity")}
+        for ticker, info in infos.items() if info
+    }
+    frame = pd.DataFrame.from_dict(rows, orient="index", columns=["pe_ratio", "debt_to_equity"])
+    return frame.astype(float)
+
+
+def fundamentals_from_cache(cache: TTLCache, tickers: Iterable[str]) -> pd.DataFrame:
+    """
+    Collect P/E and debt-to-equity from cached fundamentals, without network access.
+
+    Args:
+        cache: Market data cache populated by FinancialDataFetcher
+        tickers: Stock symbols to look up
+
+    Returns:
+        DataFrame indexed by ticker with pe_ratio and debt_to_equity columns
+    """
+    return fundamentals_frame({ticker: cache.get("fundamentals", ticker) for ticker in tickers})
+
+
+def compute_metrics(
+    prices: pd.DataFrame,
+    benchmark: str = BENCHMARK,
+    fundamentals: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Compute screening metrics for every column of a price matrix at once.
+
+    Args:
+        prices: Closing prices indexed by date, one column per symbol (including benchmark)
+        benchmark: Column holding the index prices
+        fundamentals: Optional per-ticker pe_ratio/debt_to_equity columns
+
+    Returns:
+        DataFrame indexed by ticker with change_52_weeks, market_change_52_weeks,
+        relative_performance, beta, pe_ratio and debt_to_equity columns
+
+    Raises:
+        ValueError: If the price matrix has no column for the benchmark
+    """
+    if benchmark not in prices.columns:
+        raise ValueError(
+            f"Price matrix has no {benchmark} column; relative performance and beta need the benchmark prices"
+        )
+    values = prices.to_numpy(dtype=float)
+    columns = prices.columns
+    bench_idx = columns.get_loc(benchmark)
+
+    # First and last valid price per column, without per-ticker loops
+    valid = ~np.isnan(values)
+    has_data = valid.any(axis=0)
+    first_idx = valid.argmax(axis=0)
+    last_idx = len(values) - 1 - valid[::-1].argmax(axis=0)
+    cols = np.arange(values.shape[1])
+    first = values[first_idx, cols]
+    last = values[last_idx, cols]
+    change = np.where(has_data, last / first - 1.0, np.nan)
+
+    # Beta from daily returns over the dates both series traded
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = values[1:] / values[:-1] - 1.0
+        market = returns[:, bench_idx][:, None]
+        mask = ~np.isnan(returns) & ~np.isnan(market)
+        n = mask.sum(axis=0)
+        r = np.where(mask, returns, 0.0)
+        m = np.where(mask, market, 0.0)
+        mean_r = r.sum(axis=0) / n
+        mean_m = m.sum(axis=0) / n
+        cov = (r * m).sum(axis=0) / n - mean_r * mean_m
+        var = (m * m).sum(axis=0) / n - mean_m * mean_m
+        beta = np.where(n > 1, cov / var, np.nan)
+
+    metrics = pd.DataFrame(
+        {
+            "change_52_weeks": change,
+            "market_change_52_weeks": change[bench_idx],
+            "relative_performance": change - change[bench_idx],
+            "beta": beta,
+        },
+        index=columns
+    ).drop(index=benchmark)
+
+    fundamentals = fundamentals if fundamentals is not None else pd.DataFrame(
+        columns=["pe_ratio", "debt_to_equity"], dtype=float
+    )
+    return metrics.join(fundamentals[["pe_ratio", "debt_to_equity"]], how="left")
+
+
+def screen(metrics: pd.DataFrame, criteria: ScreenCriteria) -> pd.DataFrame:
+    """
+    Filter and rank screening metrics.
+
+    Args:
+        metrics: Output of :func:`compute_metrics`
+        criteria: Filters and ranking to apply
+
+    Returns:
+        The top ``criteria.top_n`` rows, best first
+    """
+    keep = pd.Series(True, index=metrics.index)
+    if criteria.min_relative_performance is not None:
+        keep &= ~(metrics["relative_performance"] < criteria.min_relative_performance)
+    if criteria.max_beta is not None:
+        keep &= ~(metrics["beta"] > criteria.max_beta)
+    if criteria.max_pe_ratio is not None:
+        keep &= ~(metrics["pe_ratio"] > criteria.max_pe_ratio)
+    if criteria.max_debt_to_equity is not None:
+        keep &= ~(metrics["debt_to_equity"] > criteria.max_debt_to_equity)
+
+    ranked = metrics[keep].sort_values(
+        criteria.rank_by, ascending=criteria.ascending, na_position="last"
+    )
+    return ranked.head(criteria.top_n)
+
+
+class WatchlistScreener:
+    """
+    Screens a universe of tickers and selects candidates for full analysis.
+    """
+
+    def __init__(
+        self,
+        criteria: Optional[ScreenCriteria] = None,
+        benchmark: str = BENCHMARK,
+        cache: Optional[TTLCache] = None,
+        fetcher: Optional["FinancialDataFetcher"] = None
+    ):
+        """
+        Initialize the screener.
+
+        Args:
+            criteria: Filters and ranking, defaults to ScreenCriteria()
+            benchmark: Index used for relative performance and beta
+            cache: Optional market data cache providing fundamentals
+            fetcher: Optional fetcher for the candidates' fundamentals missing
+                from the cache
+        """
+        self.criteria = criteria or ScreenCriteria()
+        self.benchmark = benchmark
+        self.cache = cache
+        self.fetcher = fetcher
+
+    def run(self, tickers: Iterable[str], prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Screen a universe of tickers.
+
+        Args:
+            tickers: Stock symbols to screen
+            prices: Pre-downloaded closing prices, downloaded in bulk when omitted
+
+        Returns:
+            Ranked metrics of the selected tickers
+        """
+        tickers = list(tickers)
+        if prices is None:
+            prices = download_prices(tickers, benchmark=self.benchmark)
+        fundamentals = (
+            fundamentals_from_cache(self.cache, tickers) if self.cache is not None else None
+        )
+        metrics = compute_metrics(prices, self.benchmark, fundamentals)
+        if self.fetcher is not None:
+            metrics = self._fetch_fundamentals(metrics)
+        self._warn_unfiltered(metrics)
+        return screen(metrics, self.criteria)
+
+    def _fetch_fundamentals(self, metrics: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill in the fundamentals of the candidates that passed the price-based criteria.
+
+        With fundamentals filters every such ticker is a candidate; without,
+        only the top ``top_n`` are, whose fundamentals the batch analyzing
+        them then reads back from the fetcher's cache.
+        """
+        filtered = any(getattr(self.criteria, threshold) is not None for threshold, _ in _FUNDAMENTAL_FILTERS)
+        price_criteria = replace(
+            self.criteria,
+            **{threshold: None for threshold, _ in _FUNDAMENTAL_FILTERS},
+            top_n=len(metrics) if filtered else self.criteria.top_n
+        )
+        candidates = screen(metrics, price_criteria).index
+        missing = [
+            ticker for ticker in candidates
+            if metrics.loc[ticker, ["pe_ratio", "debt_to_equity"]].isna().all()
+        ]
+        if not missing:
+            return metrics
+        fetched = fundamentals_frame(self.fetcher.fetch_fundamentals(missing))
+        metrics = metrics.copy()
+        metrics.update(fetched)
+        return metrics
+
+    def _warn_unfiltered(self, metrics: pd.DataFrame) -> None:
+        """Warn when a fundamentals filter cannot judge some tickers (no fundamentals for them)."""
+        for threshold, column in _FUNDAMENTAL_FILTERS:
+            if getattr(self.criteria, threshold) is None:
+                continue
+            missing = int(metrics[column].isna().sum())
+            if missing:
+                logger.warning(
+                    "Screen filter skipped for tickers without fundamentals",
+                    extra={"filter": threshold, "missing": missing, "tickers": len(metrics)}
+                )
+
+    def top_candidates(self, tickers: Iterable[str], prices: Optional[pd.DataFrame] = None) -> List[str]:
+        """Symbols of the screen's top candidates, best first."""
+        return list(self.run(tickers, prices).index)